@@ -1,4 +1,4 @@
 """Package initialization for API layer."""
-from app.api import auth, requests, health
+from app.api import auth, requests, health, analytics, scheduler
 
-__all__ = ["auth", "requests", "health"]
+__all__ = ["auth", "requests", "health", "analytics", "scheduler"]
@@ -0,0 +1,102 @@
+"""Analytics API endpoints."""
+from datetime import date
+from typing import Any, Dict, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.api.requests import get_current_user, require_admin
+from app.models.user import User
+from app.services.request_service import RequestService, get_request_service
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+
+@router.get("/turnaround")
+async def get_turnaround(
+    group_by: Optional[Literal["priority", "purpose", "agent_type", "executor"]] = None,
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
+) -> Dict[str, Any]:
+    """
+    Get wait and execution time percentiles.
+    
+    Wait is submitted -> started, execution is started -> completed, both in
+    seconds. Served from streaming sketches updated on each status transition.
+    
+    Args:
+        group_by: Optional dimension to slice by (priority, purpose, agent_type, executor).
+    """
+    return await service.analytics.get_turnaround(group_by)
+
+
+@router.get("/counts")
+async def get_counts(
+    group_by: List[Literal["status", "priority", "purpose", "agent_type", "agent"]] = Query(default=[]),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    priority: Optional[str] = None,
+    purpose: Optional[str] = None,
+    agent_type: Optional[str] = None,
+    agent: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
+) -> Dict[str, Any]:
+    """
+    Count requests grouped by any combination of dimensions.
+    
+    Served from materialized counters maintained on every mutation. Repeat
+    ``group_by`` to group by several dimensions; the remaining parameters
+    filter to a single value. Grouping or filtering by ``agent`` counts a
+    request once per selected agent.
+    """
+    filters = {
+        dimension: value
+        for dimension, value in {
+            "status": status_filter,
+            "priority": priority,
+            "purpose": purpose,
+            "agent_type": agent_type,
+            "agent": agent
+        }.items()
+        if value is not None
+    }
+    return await service.analytics.get_counts(group_by, filters)
+
+
+@router.get("/timeseries")
+async def get_timeseries(
+    metric: Literal["created", "started", "completed"],
+    bucket: Literal["day", "week"] = "day",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    agent_type: Optional[str] = None,
+    purpose: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
+) -> Dict[str, Any]:
+    """
+    Get counts of created, started or completed requests per day or week.
+    
+    Served from per-day rollups (one file per month), so long ranges never
+    touch individual request files. Defaults to the last 90 days.
+    """
+    try:
+        return await service.analytics.get_timeseries(
+            metric, bucket, start, end, agent_type=agent_type, purpose=purpose
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        ) from e
+
+
+@router.post("/rebuild")
+async def rebuild_analytics(
+    admin_user: User = Depends(require_admin),
+    service: RequestService = Depends(get_request_service)
+) -> Dict[str, str]:
+    """Recompute all analytics from stored requests (admin only)."""
+    await service.analytics.rebuild()
+    logger.info(f"Admin {admin_user.name} rebuilt analytics")
+    return {"message": "Analytics rebuilt"}
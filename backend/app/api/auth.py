@@ -2,7 +2,7 @@
 import secrets
 from fastapi import APIRouter, Response, Request, HTTPException, status
 from fastapi.responses import RedirectResponse
-from app.services.auth_service import auth_service
+from app.services.auth_service import get_auth_service
 from app.models.user import User
 from app.utils.logger import get_logger
 
@@ -17,7 +17,7 @@ async def login(request: Request, response: Response):
     session_id = secrets.token_urlsafe(32)
     
     # Get authorization URL from MSAL
-    auth_url = await auth_service.get_auth_url(session_id)
+    auth_url = await get_auth_service().get_auth_url(session_id)
     
     # Set session cookie
     response = RedirectResponse(auth_url)
@@ -49,10 +49,10 @@ async def callback(code: str, state: str, request: Request):
     
     try:
         # Exchange authorization code for access token and get user info
-        user = await auth_service.handle_callback(code, state)
+        user = await get_auth_service().handle_callback(code, state)
         
         # Create session
-        await auth_service.create_session(session_id, user)
+        await get_auth_service().create_session(session_id, user)
         
         # Redirect to frontend
         logger.info(f"User {user.name} logged in successfully")
@@ -70,7 +70,7 @@ async def callback(code: str, state: str, request: Request):
 async def get_current_user(request: Request):
     """Get current authenticated user."""
     session_id = request.cookies.get("session_id")
-    user = await auth_service.get_current_user(session_id)
+    user = await get_auth_service().get_current_user(session_id)
     
     if not user:
         raise HTTPException(
@@ -87,7 +87,7 @@ async def logout(request: Request, response: Response):
     session_id = request.cookies.get("session_id")
     
     if session_id:
-        await auth_service.delete_session(session_id)
+        await get_auth_service().delete_session(session_id)
     
     # Clear session cookie
     response.delete_cookie("session_id")
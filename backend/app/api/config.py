@@ -1,97 +1,83 @@
 """Configuration API endpoints."""
-from fastapi import APIRouter
-from typing import Dict, List, Any
+import json
+from typing import Optional
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+from app.services.config_service import DEFAULT_CONFIG, PortalConfig, get_config_service
 
 router = APIRouter(prefix="/api/config", tags=["config"])
 
+# Built-in defaults, served until data/config.json exists (kept for existing imports)
+CONFIG_DATA = DEFAULT_CONFIG
 
-# Configuration data (moved from frontend)
-CONFIG_DATA = {
-    "purposes": [
-        "RAI check",
-        "Flight review",
-        "GPT-5 migration",
-        "Ad-hoc"
-    ],
-    "agent_types": [
-        {"value": "DA", "label": "Declarative Agent"},
-        {"value": "FCC", "label": "Federated Copilot Connector"},
-        {"value": "OAI Apps SDK", "label": "OAI Apps SDK"}
-    ],
-    "agent_hierarchy": {
-        "DA": {
-            "Message Extensions": ["Mock MEs", "Jira Cloud"],
-            "OpenAPI": ["GitHub Mock", "KYC Mock", "GitHub", "IDEAS", "KYC"],
-            "Remote MCP": ["Monday.com", "Connect", "Sales UAT"],
-            "Instructions++": ["Hugo", "Vantage Rewards", "Sales Genie", "IT Helpdesk", "Adobe Express"]
-        },
-        "FCC": ["Notion", "Canva", "HubSpot", "Linear", "Google Calendar", "Google Contacts", "Intercom"],
-        "OAI Apps SDK": ["Others"]
-    },
-    "query_sets": [
-        "Default",
-        "Others"
-    ],
-    "configs": {
-        "control": [
-            "Current Prod",
-            "Others"
-        ],
-        "treatment": [
-            "Current Prod",
-            "Others"
-        ]
-    },
-    "priority_levels": [
-        {"value": "Low", "label": "Low"},
-        {"value": "Medium", "label": "Medium"},
-        {"value": "High", "label": "High"}
-    ]
-}
+# Browsers may cache, but must revalidate; unchanged config answers 304
+CACHE_CONTROL = "no-cache"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def config_response(request: Request, config: PortalConfig, section: Optional[str] = None) -> Response:
+    """Serve the config (or one section of it) with an ETag, honouring If-None-Match."""
+    if section is None:
+        etag, body = config.etag, config.body
+    else:
+        etag = f'{config.etag[:-1]}-{section}"'
+        body = None
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if body is None:
+        body = json.dumps(config.data[section], separators=(",", ":")).encode()
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("")
-async def get_config() -> Dict[str, Any]:
+async def get_config(request: Request) -> Response:
     """
     Get all configuration data for the portal.
     
     Returns:
         Configuration including purposes, agent types, agents, query sets, and configs.
     """
-    return CONFIG_DATA
+    return config_response(request, get_config_service().get())
 
 
 @router.get("/purposes")
-async def get_purposes() -> List[str]:
+async def get_purposes(request: Request) -> Response:
     """Get available evaluation purposes."""
-    return CONFIG_DATA["purposes"]
+    return config_response(request, get_config_service().get(), "purposes")
 
 
 @router.get("/agent-types")
-async def get_agent_types() -> List[Dict[str, str]]:
+async def get_agent_types(request: Request) -> Response:
     """Get available agent types."""
-    return CONFIG_DATA["agent_types"]
+    return config_response(request, get_config_service().get(), "agent_types")
 
 
 @router.get("/agents")
-async def get_agents() -> Dict[str, Any]:
+async def get_agents(request: Request) -> Response:
     """Get agent hierarchy."""
-    return CONFIG_DATA["agent_hierarchy"]
+    return config_response(request, get_config_service().get(), "agent_hierarchy")
 
 
 @router.get("/query-sets")
-async def get_query_sets() -> List[str]:
+async def get_query_sets(request: Request) -> Response:
     """Get available query sets."""
-    return CONFIG_DATA["query_sets"]
+    return config_response(request, get_config_service().get(), "query_sets")
 
 
 @router.get("/configs")
-async def get_configs() -> Dict[str, List[str]]:
+async def get_configs(request: Request) -> Response:
     """Get available control and treatment configurations."""
-    return CONFIG_DATA["configs"]
+    return config_response(request, get_config_service().get(), "configs")
 
 
 @router.get("/priority-levels")
-async def get_priority_levels() -> List[Dict[str, str]]:
+async def get_priority_levels(request: Request) -> Response:
     """Get available priority levels."""
-    return CONFIG_DATA["priority_levels"]
+    return config_response(request, get_config_service().get(), "priority_levels")
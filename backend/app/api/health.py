@@ -1,7 +1,10 @@
 """Health check and metrics endpoints."""
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
 from datetime import datetime, timezone
 from app.config import settings
+from app.middleware.admission import get_admission_controller
+from app.services.request_service import get_request_service
+from app.services.warmup_service import get_warmup_service
 
 router = APIRouter(tags=["health"])
 
@@ -17,6 +20,20 @@ async def health_check():
     }
 
 
+@router.get("/ready")
+async def readiness_check(response: Response):
+    """
+    Readiness check: 200 once startup warm-up has finished, 503 until then.
+    
+    Unlike /health (process is up), this tells the platform when the instance
+    will serve at normal latency, so probes can hold traffic during warm-up.
+    """
+    warmup = get_warmup_service()
+    if not warmup.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return warmup.status()
+
+
 @router.get("/metrics")
 async def metrics():
     """Basic metrics endpoint (placeholder for Prometheus)."""
@@ -27,5 +44,13 @@ async def metrics():
     return {
         "uptime": "TODO",
         "requests_total": "TODO",
-        "active_sessions": "TODO"
+        "active_sessions": "TODO",
+        "admission": get_admission_controller().metrics(),
+        "single_flight": get_request_service().reads.stats(),
+        "search_cache": get_request_service().search_cache.stats(),
+        "storage_memory": get_request_service().storage.memory_stats(),
+        "storage_commits": {
+            "durability": get_request_service().storage.durability,
+            **get_request_service().storage.commits.stats()
+        }
     }
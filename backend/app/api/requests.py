@@ -1,17 +1,18 @@
 """Request management API endpoints."""
 from typing import List, Optional
 from fastapi import APIRouter, Request, HTTPException, status, Depends
-from fastapi.responses import JSONResponse, StreamingResponse
-import json
-from io import BytesIO
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from app.models.request import (
     Request as EvalRequest, RequestCreate, RequestUpdate,
     StartEvaluation, AddRunLinks, Priority
 )
+from app.models.queue import QueuePosition
+from app.models.revision import RequestRevision, RevisionSummary
 from app.models.user import User
-from app.services.request_service import request_service
-from app.services.auth_service import auth_service
+from app.services.request_service import RequestService, get_request_service
+from app.services.auth_service import get_auth_service
 from app.utils.logger import get_logger
+from app.utils.serialization import iter_json_array, iter_ndjson, join_json_array
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/requests", tags=["requests"])
@@ -20,7 +21,7 @@ router = APIRouter(prefix="/api/requests", tags=["requests"])
 async def get_current_user(request: Request) -> User:
     """Dependency to get current authenticated user."""
     session_id = request.cookies.get("session_id")
-    user = await auth_service.get_current_user(session_id)
+    user = await get_auth_service().get_current_user(session_id)
     
     if not user:
         raise HTTPException(
@@ -41,35 +42,65 @@ async def require_admin(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
+def requests_response(service: RequestService, requests: List[EvalRequest]) -> Response:
+    """Build a JSON array response by splicing each request's cached bytes."""
+    payloads = service.serialize_requests(requests)
+    return Response(content=join_json_array(payloads), media_type="application/json")
+
+
 @router.get("", response_model=List[EvalRequest])
 async def list_requests(
     status_filter: Optional[str] = None,
-    current_user: User = Depends(get_current_user)
+    agent_category: Optional[str] = None,
+    include_archived: bool = False,
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
 ):
-    """List all evaluation requests, optionally filtered by status."""
-    requests = await request_service.list_requests(status=status_filter)
+    """List all evaluation requests, optionally filtered by status and agent category.
+    
+    Requests completed more than ``ARCHIVE_AFTER_DAYS`` ago are archived and
+    only listed with ``include_archived=true``.
+    """
+    requests = await service.list_requests(status=status_filter, include_archived=include_archived)
+    if agent_category:
+        try:
+            requests = service.filter_by_agent_category(requests, agent_category)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            ) from e
     logger.info(f"User {current_user.name} listed {len(requests)} requests")
-    return requests
+    return requests_response(service, requests)
 
 
 @router.post("", response_model=EvalRequest, status_code=status.HTTP_201_CREATED)
 async def create_request(
     request_data: RequestCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
 ):
     """Create new evaluation request."""
-    request = await request_service.create_request(request_data, current_user)
-    logger.info(f"User {current_user.name} created request {request.id}")
-    return request
+    try:
+        request = await service.create_request(request_data, current_user)
+        logger.info(f"User {current_user.name} created request {request.id}")
+        return request
+    
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        ) from e
 
 
 @router.get("/{request_id}", response_model=EvalRequest)
 async def get_request(
     request_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
 ):
     """Get evaluation request by ID."""
-    request = await request_service.get_request(request_id)
+    request = await service.get_request(request_id)
     
     if not request:
         raise HTTPException(
@@ -80,15 +111,77 @@ async def get_request(
     return request
 
 
+@router.get("/{request_id}/queue-position", response_model=QueuePosition)
+async def get_queue_position(
+    request_id: str,
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
+):
+    """Get a pending request's position in the queue and its estimated start."""
+    try:
+        position = await service.get_queue_position(request_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        ) from e
+    
+    if not position:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Request with id '{request_id}' not found"
+        )
+    
+    return position
+
+
+@router.get("/{request_id}/revisions", response_model=List[RevisionSummary])
+async def list_revisions(
+    request_id: str,
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
+):
+    """List the recorded revisions of an evaluation request."""
+    revisions = await service.list_revisions(request_id)
+    
+    if revisions is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Request with id '{request_id}' not found"
+        )
+    
+    return revisions
+
+
+@router.get("/{request_id}/revisions/{revision}", response_model=RequestRevision)
+async def get_revision(
+    request_id: str,
+    revision: int,
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
+):
+    """Get an evaluation request as it was at a given revision."""
+    request_revision = await service.get_revision(request_id, revision)
+    
+    if not request_revision:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Revision {revision} of request '{request_id}' not found"
+        )
+    
+    return request_revision
+
+
 @router.put("/{request_id}", response_model=EvalRequest)
 async def update_request(
     request_id: str,
     update_data: RequestUpdate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
 ):
     """Update evaluation request."""
     try:
-        request = await request_service.update_request(request_id, update_data, current_user)
+        request = await service.update_request(request_id, update_data, current_user)
         
         if not request:
             raise HTTPException(
@@ -109,10 +202,11 @@ async def update_request(
 @router.delete("/{request_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_request(
     request_id: str,
-    admin_user: User = Depends(require_admin)
+    admin_user: User = Depends(require_admin),
+    service: RequestService = Depends(get_request_service)
 ):
     """Delete evaluation request (admin only)."""
-    success = await request_service.delete_request(request_id, admin_user)
+    success = await service.delete_request(request_id, admin_user)
     
     if not success:
         raise HTTPException(
@@ -127,11 +221,12 @@ async def delete_request(
 async def start_evaluation(
     request_id: str,
     start_data: StartEvaluation,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
 ):
     """Start evaluation (move to in_progress status)."""
     try:
-        request = await request_service.start_evaluation(request_id, start_data, current_user)
+        request = await service.start_evaluation(request_id, start_data, current_user)
         
         if not request:
             raise HTTPException(
@@ -153,11 +248,12 @@ async def start_evaluation(
 async def add_run_links(
     request_id: str,
     links_data: AddRunLinks,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
 ):
     """Add run links to in-progress or completed evaluation."""
     try:
-        request = await request_service.add_run_links(request_id, links_data, current_user)
+        request = await service.add_run_links(request_id, links_data, current_user)
         
         if not request:
             raise HTTPException(
@@ -178,11 +274,12 @@ async def add_run_links(
 @router.post("/{request_id}/complete", response_model=EvalRequest)
 async def complete_evaluation(
     request_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
 ):
     """Mark evaluation as completed."""
     try:
-        request = await request_service.complete_evaluation(request_id, current_user)
+        request = await service.complete_evaluation(request_id, current_user)
         
         if not request:
             raise HTTPException(
@@ -203,12 +300,13 @@ async def complete_evaluation(
 @router.get("/search/{query}", response_model=List[EvalRequest])
 async def search_requests(
     query: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    service: RequestService = Depends(get_request_service)
 ):
     """Search evaluation requests."""
-    requests = await request_service.search_requests(query)
+    requests = await service.search_requests(query)
     logger.info(f"User {current_user.name} searched for '{query}', found {len(requests)} results")
-    return requests
+    return requests_response(service, requests)
 
 
 # ===== Admin-Only Endpoints =====
@@ -217,10 +315,11 @@ async def search_requests(
 async def update_priority(
     request_id: str,
     priority: Priority,
-    admin_user: User = Depends(require_admin)
+    admin_user: User = Depends(require_admin),
+    service: RequestService = Depends(get_request_service)
 ):
     """Update request priority (admin only)."""
-    request = await request_service.update_priority(request_id, priority, admin_user)
+    request = await service.update_priority(request_id, priority, admin_user)
     
     if not request:
         raise HTTPException(
@@ -234,46 +333,50 @@ async def update_priority(
 
 @router.get("/export/json")
 async def export_requests(
-    admin_user: User = Depends(require_admin)
+    admin_user: User = Depends(require_admin),
+    service: RequestService = Depends(get_request_service)
 ):
     """Export all requests as JSON file (admin only)."""
-    requests = await request_service.list_requests(sort_by_priority=False)
-    
-    # Convert to dict for JSON serialization
-    requests_data = [req.model_dump(mode='json') for req in requests]
+    # Cached per-request JSON and raw archived records, streamed as one array
+    payloads = await service.export_payloads()
     
-    # Create JSON file in memory
-    json_data = json.dumps(requests_data, indent=2, default=str)
-    buffer = BytesIO(json_data.encode('utf-8'))
-    
-    logger.info(f"Admin {admin_user.name} exported {len(requests)} requests")
+    logger.info(f"Admin {admin_user.name} exported {len(payloads)} requests")
     
     return StreamingResponse(
-        buffer,
+        iter_json_array(payloads),
         media_type="application/json",
         headers={"Content-Disposition": "attachment; filename=evals_requests_export.json"}
     )
 
 
+@router.get("/export/ndjson")
+async def export_requests_ndjson(
+    admin_user: User = Depends(require_admin),
+    service: RequestService = Depends(get_request_service)
+):
+    """Export all requests as newline-delimited JSON (admin only)."""
+    payloads = await service.export_payloads()
+    
+    logger.info(f"Admin {admin_user.name} exported {len(payloads)} requests as NDJSON")
+    
+    return StreamingResponse(
+        iter_ndjson(payloads),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=evals_requests_export.ndjson"}
+    )
+
+
 @router.post("/import/json", status_code=status.HTTP_201_CREATED)
 async def import_requests(
     requests_data: List[EvalRequest],
-    admin_user: User = Depends(require_admin)
+    admin_user: User = Depends(require_admin),
+    service: RequestService = Depends(get_request_service)
 ):
     """Import requests from JSON (admin only)."""
-    imported_count = 0
-    errors = []
-    
-    for req_data in requests_data:
-        try:
-            # Save each request
-            await request_service.storage.save_request(req_data)
-            imported_count += 1
-        except Exception as e:
-            errors.append({
-                "id": req_data.id,
-                "error": str(e)
-            })
+    # Committed as one batch, and counted in history and analytics
+    failed = await service.import_requests(requests_data, admin_user)
+    errors = [{"id": request_id, "error": error} for request_id, error in failed.items()]
+    imported_count = len(requests_data) - sum(1 for req_data in requests_data if req_data.id in failed)
     
     logger.info(f"Admin {admin_user.name} imported {imported_count} requests ({len(errors)} errors)")
     
@@ -0,0 +1,55 @@
+"""Scheduler API endpoints (admin only)."""
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Query
+from app.api.requests import require_admin
+from app.models.user import User
+from app.services.scheduler_service import SchedulerService, get_scheduler_service
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/api/scheduler", tags=["scheduler"])
+
+
+@router.get("/load")
+async def get_load(
+    admin_user: User = Depends(require_admin),
+    scheduler: SchedulerService = Depends(get_scheduler_service)
+) -> List[Dict[str, Any]]:
+    """Get in-progress and assigned requests per executor against their capacity."""
+    return await scheduler.get_load()
+
+
+@router.post("/assign")
+async def assign(
+    dry_run: bool = True,
+    admin_user: User = Depends(require_admin),
+    scheduler: SchedulerService = Depends(get_scheduler_service)
+) -> Dict[str, Any]:
+    """
+    Assign pending requests to executors with free capacity.
+    
+    Highest priority and longest waiting requests go first. With
+    ``dry_run`` (the default) the assignments are only proposed.
+    """
+    result = await scheduler.assign(dry_run=dry_run, user=admin_user)
+    if not dry_run:
+        logger.info(f"Admin {admin_user.name} assigned {len(result['assigned'])} requests")
+    return result
+
+
+@router.get("/simulate")
+async def simulate(
+    capacity: Optional[int] = Query(None, ge=1),
+    executors: Optional[List[str]] = Query(None),
+    admin_user: User = Depends(require_admin),
+    scheduler: SchedulerService = Depends(get_scheduler_service)
+) -> Dict[str, Any]:
+    """
+    Replay completed requests through the scheduler and compare queue times.
+    
+    Args:
+        capacity: Concurrent requests per executor (defaults to SCHEDULER_DEFAULT_CAPACITY).
+        executors: Executor pool (defaults to everyone who executed a request).
+    """
+    return await scheduler.simulate(capacity=capacity, executors=executors)
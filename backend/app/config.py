@@ -1,6 +1,6 @@
 """Application configuration using Pydantic Settings."""
 import os
-from typing import List
+from typing import List, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -43,12 +43,46 @@ class Settings(BaseSettings):
     data_dir: str = "./data"
     backup_enabled: bool = True
     backup_retention_days: int = 30
+    archive_enabled: bool = True  # Move long-completed requests into monthly archive segments
+    archive_after_days: int = 90  # Days after completion before a request is archived
+    archive_interval_seconds: int = 6 * 60 * 60
+    archive_compress: bool = False  # zlib each archived record (smaller, but exports can't stream it as stored)
+    shared_snapshot_enabled: bool = True  # Workers on one machine share a mapped snapshot of the hot requests
+    snapshot_dir: str = ""  # Defaults to a directory in /dev/shm, else data_dir/snapshot
+    snapshot_publish_delay_ms: float = 50  # Writes within this window are published as one snapshot
+    snapshot_max_mb: int = 32  # Larger snapshots aren't published (a container's /dev/shm is often 64 MB)
+    storage_watch: Literal["auto", "events", "polling", "off"] = "auto"  # auto polls on network filesystems
+    storage_watch_poll_ms: int = 200  # Poll interval when polling
+    storage_durability: Literal["none", "batched", "per-write"] = "batched"  # fsync: never, once per commit batch, every write
+    storage_commit_window_ms: float = 2  # How long a commit waits for concurrent saves to join its batch
+    
+    # Scheduler (opt-in auto-assignment of pending requests)
+    scheduler_enabled: bool = False
+    scheduler_interval_seconds: int = 300
+    scheduler_default_capacity: int = 2  # Max in-progress + assigned requests per executor
+    scheduler_capacities: str = ""  # e.g. "Jane Doe=3,John Smith=1"; limits the pool to these executors
+    
+    # Admission control for search/export/import/mutation routes (see app.middleware.admission)
+    admission_enabled: bool = True
+    admission_rate_limits: str = "search=10/30,export=0.2/3,import=0.2/3,mutation=5/20"  # Per user: tokens/second / burst
+    admission_concurrency: str = "search=16,export=2,import=1,mutation=8"  # Max in flight per worker
+    
+    # Portal config (data/config.json) is re-checked for edits at most this often
+    config_check_interval_seconds: float = 2.0
+    
+    # Search results cached per query (LRU, invalidated by any write)
+    search_cache_size: int = 256
+    
+    # Warm caches in the background at startup; GET /ready reports progress
+    warmup_enabled: bool = True
     
     # Server Configuration
     host: str = "0.0.0.0"
     port: int = 8000
     reload: bool = True
     log_level: str = "INFO"
+    log_format: str = "json"  # json | text
+    log_sample_rates: str = ""  # e.g. "app.access=0.1,app.storage=0.5" (INFO/DEBUG only)
     
     # Feature Flags
     enable_api_docs: bool = True
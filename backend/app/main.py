@@ -1,14 +1,26 @@
 """Main FastAPI application."""
-from fastapi import FastAPI
+import asyncio
+import secrets
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from pathlib import Path
 from app.config import settings
-from app.api import auth, requests, health, config
-from app.utils.logger import get_logger
+from app.api import auth, requests, health, config, analytics, scheduler
+from app.middleware.admission import AdmissionMiddleware
+from app.services.config_service import get_config_service
+from app.services.request_service import get_request_service
+from app.services.scheduler_service import get_scheduler_service
+from app.services.warmup_service import get_warmup_service
+from app.utils.logger import get_logger, request_id_var
 
 logger = get_logger(__name__)
+access_logger = get_logger("app.access")
+
+# Long-running background tasks started at startup and cancelled at shutdown
+background_tasks = []
 
 # Create FastAPI app
 app = FastAPI(
@@ -19,6 +31,9 @@ app = FastAPI(
     redoc_url="/redoc" if settings.enable_api_docs else None
 )
 
+# Shed bursts on expensive routes (innermost, so rejections get CORS headers and access logs)
+app.add_middleware(AdmissionMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -28,11 +43,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    """Tag each request with an ID for log correlation and log its latency."""
+    request_id = request.headers.get("x-request-id") or secrets.token_hex(8)
+    token = request_id_var.set(request_id)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        access_logger.info(
+            f"{request.method} {request.url.path} {response.status_code}",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 2)
+            }
+        )
+        return response
+    finally:
+        request_id_var.reset(token)
+
+
 # Include API routers
 app.include_router(auth.router)
 app.include_router(requests.router)
 app.include_router(health.router)
 app.include_router(config.router)
+app.include_router(analytics.router)
+app.include_router(scheduler.router)
 
 # Mount frontend static files
 # Try multiple possible locations for the frontend directory
@@ -75,12 +116,58 @@ async def startup_event():
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"Data directory: {settings.data_dir}")
     logger.info(f"API docs: {'enabled' if settings.enable_api_docs else 'disabled'}")
+    
+    # Seed the editable portal config from the defaults on first start
+    try:
+        get_config_service().ensure_file()
+    except OSError as e:
+        logger.warning(f"Could not seed portal config, serving defaults: {e}")
+    
+    # Preload caches in the background; GET /ready turns 200 when done
+    warmup = get_warmup_service()
+    if settings.warmup_enabled:
+        background_tasks.append(asyncio.create_task(warmup.run(get_request_service())))
+    else:
+        warmup.skip()
+    
+    # Move request files from the flat layout into shards while serving
+    storage = get_request_service().storage
+    background_tasks.append(asyncio.create_task(storage.migrate_flat_layout()))
+    
+    # Push other workers' writes into the caches instead of stat-ing on every read
+    background_tasks.append(asyncio.create_task(
+        storage.run_watcher(settings.storage_watch, settings.storage_watch_poll_ms)
+    ))
+    
+    # Archive long-completed requests so listings only load live work
+    if settings.archive_enabled:
+        background_tasks.append(asyncio.create_task(
+            storage.run_archiver(settings.archive_after_days, settings.archive_interval_seconds)
+        ))
+    
+    # Enforce backup retention in the background
+    backups = storage.backups
+    if backups is not None:
+        background_tasks.append(asyncio.create_task(backups.run_pruner()))
+    
+    # Opt-in auto-assignment of pending requests
+    if settings.scheduler_enabled:
+        background_tasks.append(asyncio.create_task(get_scheduler_service().run()))
+        logger.info(f"Scheduler enabled (every {settings.scheduler_interval_seconds}s)")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown tasks."""
     logger.info("Shutting down 3PCxP Evals Portal API")
+    
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    
+    # Commit saves still queued for a batch before the process exits
+    await get_request_service().storage.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,4 @@
+"""Package initialization for middleware."""
+from app.middleware.admission import AdmissionMiddleware, get_admission_controller
+
+__all__ = ["AdmissionMiddleware", "get_admission_controller"]
@@ -0,0 +1,230 @@
+"""Admission control for expensive routes.
+
+Search runs on every keystroke, and export/import can each monopolize a
+worker's event loop and disk. Requests to these routes are classified into
+route classes and admitted only if:
+
+- the caller's token bucket for the class has a token (else 429), and
+- the class is below its concurrency limit in this worker (else 503).
+
+Both rejections are immediate and carry ``Retry-After``, so a burst is shed
+instead of queueing behind the event loop. Other routes pass straight
+through.
+"""
+import math
+import time
+from typing import Any, Dict, Optional, Tuple
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config import settings
+from app.services.auth_service import get_auth_service
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ROUTE_CLASSES = ("search", "export", "import", "mutation")
+
+# Idle buckets are dropped once this many callers are tracked
+_MAX_BUCKETS = 10000
+
+
+def parse_rate_limits(value: str) -> Dict[str, Tuple[float, float]]:
+    """Parse ``"class=rate/burst,..."`` (tokens per second / bucket size)."""
+    limits = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, limit = item.split("=", 1)
+            rate, _, burst = limit.partition("/")
+            limits[name.strip()] = (float(rate), float(burst or rate))
+    return limits
+
+
+def parse_concurrency(value: str) -> Dict[str, int]:
+    """Parse ``"class=limit,..."`` (requests in flight per worker)."""
+    limits = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, limit = item.split("=", 1)
+            limits[name.strip()] = int(limit)
+    return limits
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """Route class of a request, or None if it isn't admission-controlled."""
+    if path.startswith("/api/requests/search/"):
+        return "search"
+    if path.startswith("/api/requests/export/"):
+        return "export"
+    if path.startswith("/api/requests/import/"):
+        return "import"
+    if method in ("POST", "PUT", "PATCH", "DELETE") and (
+        path.startswith("/api/requests") or path.startswith("/api/scheduler")
+    ):
+        return "mutation"
+    return None
+
+
+class TokenBucket:
+    """Refills ``rate`` tokens per second up to ``capacity``."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take a token; returns 0 if granted, else seconds until one is available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (1 - self.tokens) / self.rate
+
+    def full(self, now: float) -> bool:
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+
+class AdmissionController:
+    """Per-user token buckets and per-class concurrency limits for one worker."""
+
+    def __init__(
+        self,
+        rate_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        concurrency: Optional[Dict[str, int]] = None
+    ):
+        self.rate_limits = rate_limits if rate_limits is not None else parse_rate_limits(settings.admission_rate_limits)
+        self.concurrency = concurrency if concurrency is not None else parse_concurrency(settings.admission_concurrency)
+        self.buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self.in_flight: Dict[str, int] = {name: 0 for name in ROUTE_CLASSES}
+        self.counters: Dict[str, Dict[str, int]] = {
+            name: {"admitted": 0, "rate_limited": 0, "shed": 0} for name in ROUTE_CLASSES
+        }
+
+    def _bucket(self, route_class: str, caller: str, now: float) -> Optional[TokenBucket]:
+        limit = self.rate_limits.get(route_class)
+        if limit is None:
+            return None
+        key = (route_class, caller)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= _MAX_BUCKETS:
+                self._prune(now)
+            bucket = self.buckets[key] = TokenBucket(limit[0], limit[1], now)
+        return bucket
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets that have refilled; they behave exactly like new ones."""
+        for key in [key for key, bucket in self.buckets.items() if bucket.full(now)]:
+            del self.buckets[key]
+
+    def admit(self, route_class: str, caller: str) -> Tuple[Optional[int], float]:
+        """Try to admit a request.
+
+        Returns ``(None, 0)`` if admitted (the caller must :meth:`release`), or
+        ``(status_code, retry_after_seconds)`` if rejected.
+        """
+        counters = self.counters[route_class]
+        limit = self.concurrency.get(route_class)
+        if limit is not None and self.in_flight[route_class] >= limit:
+            counters["shed"] += 1
+            return 503, 1.0
+
+        now = time.monotonic()
+        bucket = self._bucket(route_class, caller, now)
+        if bucket is not None:
+            wait = bucket.take(now)
+            if wait:
+                counters["rate_limited"] += 1
+                return 429, wait
+
+        counters["admitted"] += 1
+        self.in_flight[route_class] += 1
+        return None, 0.0
+
+    def release(self, route_class: str) -> None:
+        self.in_flight[route_class] -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Limits, in-flight requests and admission counters per route class."""
+        classes = {}
+        for name in ROUTE_CLASSES:
+            rate, burst = self.rate_limits.get(name, (None, None))
+            classes[name] = {
+                "rate_per_second": rate,
+                "burst": burst,
+                "concurrency_limit": self.concurrency.get(name),
+                "in_flight": self.in_flight[name],
+                **self.counters[name]
+            }
+        return {"enabled": settings.admission_enabled, "tracked_callers": len(self.buckets), "classes": classes}
+
+
+async def _caller(scope: Scope) -> str:
+    """Rate-limit key: the signed-in user, else the client address.
+
+    The session cookie is resolved rather than used as the key, so a client
+    can't get a fresh bucket by sending a made-up one.
+    """
+    request = Request(scope)
+    user = await get_auth_service().get_current_user(request.cookies.get("session_id"))
+    if user is not None:
+        return f"user:{user.oid}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying :class:`AdmissionController` to HTTP requests."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.admission_enabled:
+            await self.app(scope, receive, send)
+            return
+        route_class = classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        controller = get_admission_controller()
+        rejected, retry_after = controller.admit(route_class, await _caller(scope))
+        if rejected is not None:
+            if rejected == 429:
+                detail = f"Too many {route_class} requests; retry later"
+            else:
+                detail = f"Server busy with {route_class} requests; retry later"
+            logger.warning(
+                f"Rejected {scope['method']} {scope['path']} with {rejected}",
+                extra={"route_class": route_class, "status_code": rejected}
+            )
+            response = JSONResponse(
+                {"detail": detail},
+                status_code=rejected,
+                headers={"Retry-After": str(max(1, math.ceil(min(retry_after, 3600))))}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(route_class)
+
+
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get this worker's admission controller, creating it on first use."""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController()
+    return _admission_controller
@@ -7,6 +7,8 @@ from app.models.request import (
     StartEvaluation,
     AddRunLinks
 )
+from app.models.queue import QueuePosition
+from app.models.revision import RevisionSummary, RequestRevision
 from app.models.user import User, Session
 
 __all__ = [
@@ -16,6 +18,9 @@ __all__ = [
     "RunLink",
     "StartEvaluation",
     "AddRunLinks",
+    "QueuePosition",
+    "RevisionSummary",
+    "RequestRevision",
     "User",
     "Session",
 ]
@@ -0,0 +1,26 @@
+"""Pydantic models for the pending request queue."""
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class QueuePosition(BaseModel):
+    """Where a pending request sits in the queue and when it is likely to start."""
+    request_id: str = Field(..., description="Request ID")
+    position: int = Field(..., description="1-based position among pending requests")
+    pending_total: int = Field(..., description="Number of pending requests")
+    throughput_per_day: float = Field(..., description="Average requests started per day recently")
+    estimated_start_at: Optional[datetime] = Field(
+        None, description="Estimated start time (null when nothing was started recently)"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "request_id": "req_1732198765_abc123",
+                "position": 3,
+                "pending_total": 12,
+                "throughput_per_day": 1.5,
+                "estimated_start_at": "2025-11-23T10:30:00Z"
+            }
+        }
@@ -2,7 +2,15 @@
 from datetime import datetime, timezone
 from typing import List, Literal, Optional
 from enum import Enum
-from pydantic import BaseModel, Field, field_validator, HttpUrl
+from pydantic import BaseModel, Field, ValidationInfo, field_validator, HttpUrl
+
+# Validation context for records that were fully validated when they were written
+TRUSTED_CONTEXT = {"trusted": True}
+
+
+def is_trusted(info: ValidationInfo) -> bool:
+    """Check whether the data being validated comes from a trusted stored record."""
+    return bool(info.context and info.context.get("trusted"))
 
 
 class Priority(str, Enum):
@@ -38,8 +46,10 @@ class RunLink(BaseModel):
     
     @field_validator('url')
     @classmethod
-    def validate_url(cls, v: str) -> str:
+    def validate_url(cls, v: str, info: ValidationInfo) -> str:
         """Validate URL format."""
+        if is_trusted(info):
+            return v
         if not v.startswith(('http://', 'https://')):
             raise ValueError('URL must start with http:// or https://')
         return v
@@ -56,14 +66,14 @@ class RunLink(BaseModel):
 
 class RequestBase(BaseModel):
     """Base model for request data."""
-    purpose: Literal["RAI check", "Flight review", "GPT-5 migration", "Ad-hoc"] = Field(
-        ..., description="Purpose of the evaluation"
+    purpose: str = Field(
+        ..., description="Purpose of the evaluation, one of the portal config's purposes"
     )
     purpose_reason: Optional[str] = Field(
         None, max_length=500, description="Required reason if purpose is Ad-hoc"
     )
-    agent_type: Literal["DA", "FCC", "OAI Apps SDK"] = Field(
-        ..., description="Type of agent: Declarative Agent, Federated Copilot Connector, or OAI Apps SDK"
+    agent_type: str = Field(
+        ..., description="Type of agent (e.g. DA, FCC, OAI Apps SDK), one of the portal config's agent types"
     )
     agents: List[str] = Field(
         ..., min_length=1, description="List of selected agents"
@@ -82,6 +92,8 @@ class RequestBase(BaseModel):
     @classmethod
     def validate_purpose_reason(cls, v: Optional[str], info) -> Optional[str]:
         """Validate that purpose_reason is provided for Ad-hoc requests."""
+        if is_trusted(info):
+            return v
         if info.data.get('purpose') == 'Ad-hoc' and not v:
             raise ValueError('purpose_reason is required for Ad-hoc requests')
         return v
@@ -90,6 +102,8 @@ class RequestBase(BaseModel):
     @classmethod
     def validate_query_set_details(cls, v: Optional[str], info) -> Optional[str]:
         """Validate that query_set_details is provided for Others query set."""
+        if is_trusted(info):
+            return v
         if info.data.get('query_set') == 'Others' and not v:
             raise ValueError('query_set_details is required for Others query set')
         return v
@@ -102,9 +116,9 @@ class RequestCreate(RequestBase):
 
 class RequestUpdate(BaseModel):
     """Model for updating an existing request."""
-    purpose: Optional[Literal["RAI check", "Flight review", "GPT-5 migration", "Ad-hoc"]] = None
+    purpose: Optional[str] = None
     purpose_reason: Optional[str] = Field(None, max_length=500)
-    agent_type: Optional[Literal["DA", "FCC", "OAI Apps SDK"]] = None
+    agent_type: Optional[str] = None
     agents: Optional[List[str]] = Field(None, min_length=1)
     query_set: Optional[str] = None
     query_set_details: Optional[str] = Field(None, max_length=500)
@@ -126,6 +140,8 @@ class Request(RequestBase):
     executor: Optional[str] = Field(None, description="Person executing the evaluation")
     started_at: Optional[datetime] = Field(None, description="When execution started")
     completed_at: Optional[datetime] = Field(None, description="When execution completed")
+    assigned_to: Optional[str] = Field(None, description="Executor the scheduler assigned this request to")
+    assigned_at: Optional[datetime] = Field(None, description="When the request was assigned")
     run_links: List[RunLink] = Field(default_factory=list, description="List of run links")
     update_history: List[UpdateEntry] = Field(default_factory=list, description="History of updates made to this request")
     
@@ -149,6 +165,8 @@ class Request(RequestBase):
                 "executor": None,
                 "started_at": None,
                 "completed_at": None,
+                "assigned_to": None,
+                "assigned_at": None,
                 "run_links": []
             }
         }
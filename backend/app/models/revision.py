@@ -0,0 +1,34 @@
+"""Pydantic models for request revision history."""
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from app.models.request import Request
+
+
+class RevisionSummary(BaseModel):
+    """Metadata for one recorded revision of a request."""
+    revision: int = Field(..., description="Revision number (0 is the oldest recorded state)")
+    action: str = Field(..., description="Mutation that produced this revision (create, update, start, ...)")
+    author: Optional[str] = Field(None, description="Person who made the change")
+    recorded_at: datetime = Field(..., description="When the revision was recorded")
+    changed_fields: List[str] = Field(default_factory=list, description="Top-level fields changed by this revision")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "revision": 2,
+                "action": "start",
+                "author": "Jane Doe",
+                "recorded_at": "2025-11-21T10:30:00Z",
+                "changed_fields": ["executor", "run_links", "started_at", "status"]
+            }
+        }
+
+
+class RequestRevision(BaseModel):
+    """A request as it looked at a given revision."""
+    revision: int = Field(..., description="Revision number")
+    action: str = Field(..., description="Mutation that produced this revision")
+    author: Optional[str] = Field(None, description="Person who made the change")
+    recorded_at: datetime = Field(..., description="When the revision was recorded")
+    request: Request = Field(..., description="Request state at this revision")
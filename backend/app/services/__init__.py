@@ -1,5 +1,27 @@
-"""Package initialization for services layer."""
-from app.services.auth_service import auth_service
-from app.services.request_service import request_service
+"""Package initialization for services layer.
 
-__all__ = ["auth_service", "request_service"]
+Service instances are created on first use (see the ``get_*`` functions),
+so importing this package stays cheap and has no side effects.
+"""
+from app.services.auth_service import get_auth_service
+from app.services.request_service import get_request_service
+from app.services.scheduler_service import get_scheduler_service
+
+__all__ = [
+    "auth_service",
+    "request_service",
+    "scheduler_service",
+    "get_auth_service",
+    "get_request_service",
+    "get_scheduler_service",
+]
+
+
+def __getattr__(name: str):
+    if name == "auth_service":
+        return get_auth_service()
+    if name == "request_service":
+        return get_request_service()
+    if name == "scheduler_service":
+        return get_scheduler_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,491 @@
+"""Incrementally maintained analytics over evaluation requests."""
+import asyncio
+import shutil
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+from app.models.request import Request
+from app.storage.json_storage import JSONStorage
+from app.utils.logger import get_logger
+from app.utils.quantile_sketch import QuantileSketch
+from app.utils.state_file import StateFile
+
+logger = get_logger(__name__)
+
+# Dimensions turnaround times can be sliced by
+TURNAROUND_DIMENSIONS = ("priority", "purpose", "agent_type", "executor")
+TURNAROUND_QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+# Dimensions request counts can be grouped by. A request is counted once per
+# cell of the request-level cube, and once per agent in the agent-level cube.
+COUNT_DIMENSIONS = ("status", "priority", "purpose", "agent_type", "agent")
+_REQUEST_CUBE_DIMENSIONS = COUNT_DIMENSIONS[:-1]
+
+CountKey = Tuple[str, ...]
+
+# Lifecycle events rolled up per day, and the timestamp each is bucketed by
+ROLLUP_METRICS = {"created": "submitted_at", "started": "started_at", "completed": "completed_at"}
+ROLLUP_BUCKETS = ("day", "week")
+# Longest time series served in one query
+TIMESERIES_MAX_DAYS = 3 * 366
+
+
+def _dimension_value(request: Request, dimension: str) -> Optional[str]:
+    value = getattr(request, dimension)
+    return value.value if hasattr(value, "value") else value
+
+
+class AnalyticsService:
+    """Analytics kept up to date from RequestService mutations.
+
+    State lives in small JSON files under ``analytics_dir`` so it survives
+    restarts and is shared by workers: each worker reloads a file when it
+    changes and, holding the file's lock, rereads, applies a change and
+    rewrites it atomically. If a
+    state file is missing it is rebuilt once from storage.
+    """
+
+    def __init__(self, storage: JSONStorage, analytics_dir: Path):
+        self.storage = storage
+        self.analytics_dir = Path(analytics_dir)
+        self.analytics_dir.mkdir(parents=True, exist_ok=True)
+
+        self.turnaround_file = self.analytics_dir / "turnaround.json"
+        self._turnaround_state = StateFile(self.turnaround_file)
+        self._turnaround: Dict[str, Dict[str, QuantileSketch]] = {"wait": {}, "execution": {}}
+
+        self.counts_file = self.analytics_dir / "counts.json"
+        self._counts_state = StateFile(self.counts_file)
+        self._request_counts: Dict[CountKey, int] = {}
+        self._agent_counts: Dict[CountKey, int] = {}
+
+        # One file per month: {"days": {"YYYY-MM-DD": {metric: {slice: count}}}}
+        self.rollups_dir = self.analytics_dir / "rollups"
+        self._rollup_months: Dict[str, Tuple[StateFile, dict]] = {}
+
+    # ----- Turnaround times -----
+
+    @staticmethod
+    def _slice_keys(request: Request) -> List[str]:
+        keys = ["all"]
+        for dimension in TURNAROUND_DIMENSIONS:
+            value = _dimension_value(request, dimension)
+            if value is not None:
+                keys.append(f"{dimension}={value}")
+        return keys
+
+    def _observe(self, metric: str, request: Request, seconds: float) -> None:
+        sketches = self._turnaround[metric]
+        for key in self._slice_keys(request):
+            sketches.setdefault(key, QuantileSketch()).add(max(seconds, 0.0))
+
+    @staticmethod
+    def _intervals(request: Request) -> List[Tuple[str, float]]:
+        """A request's (metric, seconds) wait and execution times from its current timestamps."""
+        intervals = []
+        if request.started_at:
+            intervals.append(("wait", (request.started_at - request.submitted_at).total_seconds()))
+            if request.completed_at:
+                intervals.append(("execution", (request.completed_at - request.started_at).total_seconds()))
+        return intervals
+
+    def _observe_request(self, request: Request) -> None:
+        """Add a request's wait and execution times from its current timestamps."""
+        for metric, seconds in self._intervals(request):
+            self._observe(metric, request, seconds)
+
+    def _save_turnaround(self) -> None:
+        data = {
+            metric: {key: sketch.to_dict() for key, sketch in sketches.items()}
+            for metric, sketches in self._turnaround.items()
+        }
+        self._turnaround_state.write(data)
+
+    async def rebuild_turnaround(self) -> None:
+        """Recompute turnaround sketches from every stored request."""
+        self._turnaround = {"wait": {}, "execution": {}}
+        for request in await self.storage.list_all_requests(include_archived=True):
+            self._observe_request(request)
+        self._save_turnaround()
+        logger.info("Rebuilt turnaround analytics from storage")
+
+    def _read_turnaround(self) -> None:
+        data = self._turnaround_state.read()
+        self._turnaround = {
+            metric: {key: QuantileSketch.from_dict(s) for key, s in data.get(metric, {}).items()}
+            for metric in ("wait", "execution")
+        }
+
+    async def _load_turnaround(self) -> bool:
+        """Make sure in-memory sketches match the state file.
+
+        Returns True if the state had to be rebuilt from storage.
+        """
+        if not self._turnaround_state.exists():
+            await self.rebuild_turnaround()
+            return True
+        if self._turnaround_state.changed():
+            try:
+                self._read_turnaround()
+            except Exception as e:
+                logger.warning(f"Failed to load turnaround analytics, rebuilding: {e}")
+                await self.rebuild_turnaround()
+                return True
+        return False
+
+    async def _apply_turnaround(self, before: Optional[Request], after: Optional[Request]) -> None:
+        if await self._load_turnaround():
+            return  # Rebuilt from storage, which already reflects this change
+
+        if after is None:
+            return
+
+        if before is None:
+            # Imported, or created already started or completed
+            intervals = self._intervals(after)
+        elif before.status == "pending" and after.status == "in_progress" and after.started_at:
+            intervals = [("wait", (after.started_at - after.submitted_at).total_seconds())]
+        elif before.status == "in_progress" and after.status == "completed" and after.completed_at:
+            intervals = [("execution", (after.completed_at - after.started_at).total_seconds())]
+        else:
+            return
+        if not intervals:
+            return
+        with self._turnaround_state.locked():
+            # Another worker may have written since the load above
+            if self._turnaround_state.changed():
+                self._read_turnaround()
+            for metric, seconds in intervals:
+                self._observe(metric, after, seconds)
+            self._save_turnaround()
+
+    async def get_turnaround(self, group_by: Optional[str] = None) -> Dict[str, Any]:
+        """Percentiles of wait (submitted -> started) and execution (started -> completed) times.
+
+        Without ``group_by`` only the overall figures are returned; otherwise
+        one entry per value of that dimension.
+        """
+        if group_by is not None and group_by not in TURNAROUND_DIMENSIONS:
+            raise ValueError(f"Cannot group turnaround by '{group_by}'")
+        await self._load_turnaround()
+
+        prefix = f"{group_by}=" if group_by else None
+        result: Dict[str, Any] = {"unit": "seconds", "group_by": group_by}
+        for metric, sketches in self._turnaround.items():
+            slices = {}
+            for key, sketch in sorted(sketches.items()):
+                if prefix is None and key != "all":
+                    continue
+                if prefix is not None and not key.startswith(prefix):
+                    continue
+                label = key[len(prefix):] if prefix else key
+                slices[label] = {
+                    "count": sketch.count,
+                    **{name: sketch.quantile(q) for name, q in TURNAROUND_QUANTILES.items()}
+                }
+            result[metric] = slices
+        return result
+
+    # ----- Aggregate counters -----
+
+    @staticmethod
+    def _count_keys(request: Request) -> Tuple[List[CountKey], List[CountKey]]:
+        """Cells a request contributes to in the request and agent cubes."""
+        base = tuple(_dimension_value(request, d) for d in _REQUEST_CUBE_DIMENSIONS)
+        return [base], [base + (agent,) for agent in dict.fromkeys(request.agents)]
+
+    @staticmethod
+    def _bump(cube: Dict[CountKey, int], keys: Iterable[CountKey], delta: int) -> None:
+        for key in keys:
+            count = cube.get(key, 0) + delta
+            if count > 0:
+                cube[key] = count
+            else:
+                cube.pop(key, None)
+
+    def _save_counts(self) -> None:
+        self._counts_state.write({
+            "requests": [[*key, count] for key, count in self._request_counts.items()],
+            "agents": [[*key, count] for key, count in self._agent_counts.items()]
+        })
+
+    async def rebuild_counts(self) -> None:
+        """Recompute aggregate counters from every stored request."""
+        self._request_counts, self._agent_counts = {}, {}
+        for request in await self.storage.list_all_requests(include_archived=True):
+            request_keys, agent_keys = self._count_keys(request)
+            self._bump(self._request_counts, request_keys, 1)
+            self._bump(self._agent_counts, agent_keys, 1)
+        self._save_counts()
+        logger.info("Rebuilt aggregate counters from storage")
+
+    def _read_counts(self) -> None:
+        data = self._counts_state.read()
+        self._request_counts = {tuple(row[:-1]): row[-1] for row in data["requests"]}
+        self._agent_counts = {tuple(row[:-1]): row[-1] for row in data["agents"]}
+
+    async def _load_counts(self) -> bool:
+        """Make sure in-memory counters match the state file.
+
+        Returns True if the counters had to be rebuilt from storage.
+        """
+        if not self._counts_state.exists():
+            await self.rebuild_counts()
+            return True
+        if self._counts_state.changed():
+            try:
+                self._read_counts()
+            except Exception as e:
+                logger.warning(f"Failed to load aggregate counters, rebuilding: {e}")
+                await self.rebuild_counts()
+                return True
+        return False
+
+    async def _apply_counts(self, before: Optional[Request], after: Optional[Request]) -> None:
+        if await self._load_counts():
+            return  # Rebuilt from storage, which already reflects this change
+
+        old_request_keys, old_agent_keys = self._count_keys(before) if before else ([], [])
+        new_request_keys, new_agent_keys = self._count_keys(after) if after else ([], [])
+        if old_request_keys == new_request_keys and old_agent_keys == new_agent_keys:
+            return
+
+        with self._counts_state.locked():
+            if self._counts_state.changed():
+                self._read_counts()
+            self._bump(self._request_counts, old_request_keys, -1)
+            self._bump(self._agent_counts, old_agent_keys, -1)
+            self._bump(self._request_counts, new_request_keys, 1)
+            self._bump(self._agent_counts, new_agent_keys, 1)
+            self._save_counts()
+
+    async def get_counts(
+        self,
+        group_by: Iterable[str] = (),
+        filters: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Count requests grouped by any combination of COUNT_DIMENSIONS.
+
+        ``filters`` restricts to cells whose dimensions equal the given values.
+        Grouping or filtering by ``agent`` counts a request once per agent.
+        """
+        group_by = list(dict.fromkeys(group_by))
+        filters = filters or {}
+        for dimension in [*group_by, *filters]:
+            if dimension not in COUNT_DIMENSIONS:
+                raise ValueError(f"Cannot group counts by '{dimension}'")
+        await self._load_counts()
+
+        use_agents = "agent" in group_by or "agent" in filters
+        dimensions = COUNT_DIMENSIONS if use_agents else _REQUEST_CUBE_DIMENSIONS
+        cube = self._agent_counts if use_agents else self._request_counts
+        group_positions = [dimensions.index(d) for d in group_by]
+        filter_positions = [(dimensions.index(d), value) for d, value in filters.items()]
+
+        groups: Dict[CountKey, int] = {}
+        total = 0
+        for key, count in cube.items():
+            if any(key[position] != value for position, value in filter_positions):
+                continue
+            group = tuple(key[position] for position in group_positions)
+            groups[group] = groups.get(group, 0) + count
+            total += count
+
+        return {
+            "group_by": group_by,
+            "filters": filters,
+            "total": total,
+            "groups": [
+                {**dict(zip(group_by, group, strict=True)), "count": count}
+                for group, count in sorted(groups.items(), key=lambda item: (-item[1], item[0]))
+            ]
+        }
+
+    # ----- Daily throughput rollups -----
+
+    @staticmethod
+    def _rollup_slices(agent_type: Optional[str], purpose: Optional[str]) -> str:
+        if agent_type and purpose:
+            return f"agent_type={agent_type}|purpose={purpose}"
+        if agent_type:
+            return f"agent_type={agent_type}"
+        if purpose:
+            return f"purpose={purpose}"
+        return "all"
+
+    @classmethod
+    def _rollup_events(cls, request: Optional[Request]) -> Counter:
+        """(metric, day, slice) cells a request contributes to."""
+        events: Counter = Counter()
+        if request is None:
+            return events
+        slices = {
+            cls._rollup_slices(agent_type, purpose)
+            for agent_type in (None, request.agent_type)
+            for purpose in (None, request.purpose)
+        }
+        for metric, field in ROLLUP_METRICS.items():
+            timestamp = getattr(request, field)
+            if timestamp is not None:
+                day = timestamp.astimezone(timezone.utc).date().isoformat()
+                for key in slices:
+                    events[(metric, day, key)] += 1
+        return events
+
+    def _month_file_path(self, month: str) -> Path:
+        return self.rollups_dir / f"{month}.json"
+
+    def _month_file(self, month: str) -> StateFile:
+        if month not in self._rollup_months:
+            self._rollup_months[month] = (StateFile(self._month_file_path(month)), {"days": {}})
+        return self._rollup_months[month][0]
+
+    def _month_state(self, month: str) -> dict:
+        """Rollup data for a month (``YYYY-MM``), reloaded if another worker changed it."""
+        state = self._month_file(month)
+        data = self._rollup_months[month][1]
+        if state.changed():
+            data = state.read(default={"days": {}})
+            self._rollup_months[month] = (state, data)
+        return data
+
+    def _apply_rollup_delta(self, delta: Dict[Tuple[str, str, str], int]) -> None:
+        by_month: Dict[str, List[Tuple[str, str, str, int]]] = {}
+        for (metric, day, key), change in delta.items():
+            if change != 0:
+                by_month.setdefault(day[:7], []).append((metric, day, key, change))
+        for month, changes in by_month.items():
+            state = self._month_file(month)
+            with state.locked():
+                data = self._month_state(month)
+                for metric, day, key, change in changes:
+                    counts = data["days"].setdefault(day, {}).setdefault(metric, {})
+                    counts[key] = counts.get(key, 0) + change
+                    if counts[key] <= 0:
+                        del counts[key]
+                state.write(data)
+
+    async def rebuild_rollups(self) -> None:
+        """Recompute all daily rollups from every stored request."""
+        events: Counter = Counter()
+        for request in await self.storage.list_all_requests(include_archived=True):
+            events.update(self._rollup_events(request))
+
+        shutil.rmtree(self.rollups_dir, ignore_errors=True)
+        self.rollups_dir.mkdir(parents=True, exist_ok=True)
+        self._rollup_months = {}
+        self._apply_rollup_delta(events)
+        logger.info("Rebuilt daily rollups from storage")
+
+    async def _load_rollups(self) -> bool:
+        """Build rollups from storage the first time. Returns True if rebuilt."""
+        if self.rollups_dir.exists():
+            return False
+        await self.rebuild_rollups()
+        return True
+
+    async def _apply_rollups(self, before: Optional[Request], after: Optional[Request]) -> None:
+        if await self._load_rollups():
+            return  # Rebuilt from storage, which already reflects this change
+
+        delta = self._rollup_events(after)
+        delta.subtract(self._rollup_events(before))
+        self._apply_rollup_delta(delta)
+
+    async def get_timeseries(
+        self,
+        metric: str,
+        bucket: str = "day",
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        agent_type: Optional[str] = None,
+        purpose: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Counts of lifecycle events per day or week between ``start`` and ``end``.
+
+        Defaults to the last 90 days, and spans at most ``TIMESERIES_MAX_DAYS``.
+        Only the monthly rollup files covering the range are read; empty buckets
+        are included with a count of 0.
+        """
+        if metric not in ROLLUP_METRICS:
+            raise ValueError(f"Unknown metric '{metric}'")
+        if bucket not in ROLLUP_BUCKETS:
+            raise ValueError(f"Unknown bucket '{bucket}'")
+        end = end or datetime.now(timezone.utc).date()
+        start = start or end - timedelta(days=89)
+        if start > end:
+            raise ValueError("start must not be after end")
+        if (end - start).days >= TIMESERIES_MAX_DAYS:
+            raise ValueError(f"Time series span at most {TIMESERIES_MAX_DAYS} days")
+        await self._load_rollups()
+
+        key = self._rollup_slices(agent_type, purpose)
+        if bucket == "week":
+            start -= timedelta(days=start.weekday())
+
+        step = timedelta(days=7 if bucket == "week" else 1)
+        points: Dict[date, int] = {}
+        day = start
+        while day <= end:
+            points[day] = 0
+            day += step
+
+        month = start.replace(day=1)
+        while month <= end:
+            name = month.isoformat()[:7]
+            # Months without a file aren't cached, so probing old ranges doesn't grow memory
+            if name in self._rollup_months or self._month_file_path(name).exists():
+                for day_key, counts in self._month_state(name)["days"].items():
+                    day = date.fromisoformat(day_key)
+                    count = counts.get(metric, {}).get(key, 0)
+                    if count and start <= day <= end:
+                        points[day - timedelta(days=day.weekday()) if bucket == "week" else day] += count
+            month = (month + timedelta(days=31)).replace(day=1)
+
+        return {
+            "metric": metric,
+            "bucket": bucket,
+            "filters": {k: v for k, v in {"agent_type": agent_type, "purpose": purpose}.items() if v},
+            "points": [{"bucket_start": d.isoformat(), "count": c} for d, c in points.items()]
+        }
+
+    # ----- Warm-up -----
+
+    async def warm_up(self) -> None:
+        """Load (or build) all analytics state, including the last 90 days of rollups."""
+        await self._load_turnaround()
+        await self._load_counts()
+        await self._load_rollups()
+        today = datetime.now(timezone.utc).date()
+        for month in sorted({(today - timedelta(days=d)).isoformat()[:7] for d in range(0, 90, 28)}):
+            self._month_state(month)
+
+    # ----- Hooks -----
+
+    async def on_change(self, before: Optional[Request], after: Optional[Request]) -> None:
+        """Apply a saved mutation (before is None on create, after is None on delete)."""
+        try:
+            await self._apply_turnaround(before, after)
+            await self._apply_counts(before, after)
+            await self._apply_rollups(before, after)
+        except Exception as e:
+            logger.error(f"Failed to update analytics: {e}")
+
+    async def rebuild(self) -> None:
+        """Recompute all analytics state from storage (recovers from drift)."""
+        await self.rebuild_turnaround()
+        await self.rebuild_counts()
+        await self.rebuild_rollups()
+
+
+if __name__ == "__main__":
+    # Usage: python -m app.services.analytics_service rebuild
+    if sys.argv[1:] != ["rebuild"]:
+        print("Usage: python -m app.services.analytics_service rebuild")
+        sys.exit(2)
+
+    service = AnalyticsService(JSONStorage(data_dir=settings.data_dir), Path(settings.data_dir) / "analytics")
+    asyncio.run(service.rebuild())
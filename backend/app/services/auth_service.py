@@ -2,7 +2,6 @@
 import secrets
 from typing import Optional
 from datetime import datetime, timedelta, timezone
-from msal import ConfidentialClientApplication
 from app.models.user import User, Session
 from app.config import settings
 from app.storage.session_storage import SessionStorage
@@ -15,19 +14,29 @@ class AuthService:
     """Handle OAuth 2.0 authentication flow with Microsoft Entra."""
     
     def __init__(self):
-        # Skip MSAL initialization in test mode to avoid network calls
+        # MSAL client is built on first login (see msal_app)
+        self._msal_app = None
         if settings.is_testing:
-            self.msal_app = None
             logger.info("Running in test mode - MSAL disabled")
-        else:
-            self.msal_app = ConfidentialClientApplication(
+        
+        # File-based session storage (works across multiple workers)
+        self.storage = SessionStorage()
+    
+    @property
+    def msal_app(self):
+        """MSAL client, created on first use (None in test mode).
+        
+        msal pulls in its crypto/HTTP stack and does authority discovery over
+        the network, so workers that only serve API calls never pay for it.
+        """
+        if self._msal_app is None and not settings.is_testing:
+            from msal import ConfidentialClientApplication
+            self._msal_app = ConfidentialClientApplication(
                 client_id=settings.azure_client_id,
                 client_credential=settings.azure_client_secret,
                 authority=settings.azure_authority
             )
-        
-        # File-based session storage (works across multiple workers)
-        self.storage = SessionStorage()
+        return self._msal_app
     
     async def get_auth_url(self, session_id: str) -> str:
         """Generate Microsoft login URL with PKCE."""
@@ -127,5 +136,19 @@ class AuthService:
         return session.user if session else None
 
 
-# Global auth service instance
-auth_service = AuthService()
+_auth_service: Optional[AuthService] = None
+
+
+def get_auth_service() -> AuthService:
+    """Get the shared auth service, creating it on first use."""
+    global _auth_service
+    if _auth_service is None:
+        _auth_service = AuthService()
+    return _auth_service
+
+
+def __getattr__(name: str):
+    # ``auth_service`` is still importable, but only built when first accessed
+    if name == "auth_service":
+        return get_auth_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,151 @@
+"""Portal configuration (purposes, agents, query sets) loaded from the data dir."""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Optional
+from app.config import settings
+from app.utils.logger import get_logger
+from app.utils.state_file import StateFile
+
+logger = get_logger(__name__)
+
+CONFIG_FILENAME = "config.json"
+
+# Served until data/config.json exists, and used to seed it at startup
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "purposes": [
+        "RAI check",
+        "Flight review",
+        "GPT-5 migration",
+        "Ad-hoc"
+    ],
+    "agent_types": [
+        {"value": "DA", "label": "Declarative Agent"},
+        {"value": "FCC", "label": "Federated Copilot Connector"},
+        {"value": "OAI Apps SDK", "label": "OAI Apps SDK"}
+    ],
+    "agent_hierarchy": {
+        "DA": {
+            "Message Extensions": ["Mock MEs", "Jira Cloud"],
+            "OpenAPI": ["GitHub Mock", "KYC Mock", "GitHub", "IDEAS", "KYC"],
+            "Remote MCP": ["Monday.com", "Connect", "Sales UAT"],
+            "Instructions++": ["Hugo", "Vantage Rewards", "Sales Genie", "IT Helpdesk", "Adobe Express"]
+        },
+        "FCC": ["Notion", "Canva", "HubSpot", "Linear", "Google Calendar", "Google Contacts", "Intercom"],
+        "OAI Apps SDK": ["Others"]
+    },
+    "query_sets": [
+        "Default",
+        "Others"
+    ],
+    "configs": {
+        "control": [
+            "Current Prod",
+            "Others"
+        ],
+        "treatment": [
+            "Current Prod",
+            "Others"
+        ]
+    },
+    "priority_levels": [
+        {"value": "Low", "label": "Low"},
+        {"value": "Medium", "label": "Medium"},
+        {"value": "High", "label": "High"}
+    ]
+}
+
+REQUIRED_KEYS = tuple(DEFAULT_CONFIG)
+
+
+class PortalConfig:
+    """One loaded configuration version with its serialized form and lookup sets."""
+
+    def __init__(self, data: Dict[str, Any], version: int = 0):
+        if not isinstance(data, dict):
+            raise ValueError("Config must be a JSON object")
+        missing = [key for key in REQUIRED_KEYS if key not in data]
+        if missing:
+            raise ValueError(f"Config is missing {', '.join(missing)}")
+        self.version = version
+        self.data = {key: data[key] for key in REQUIRED_KEYS}
+        if not isinstance(self.data["agent_hierarchy"], dict):
+            raise ValueError("Config agent_hierarchy must be an object")
+        self.body = json.dumps(self.data, separators=(",", ":")).encode()
+        self.etag = f'"{version}-{hashlib.sha256(self.body).hexdigest()[:16]}"'
+
+        self.purposes: FrozenSet[str] = frozenset(self.data["purposes"])
+        self.agent_types: FrozenSet[str] = frozenset(item["value"] for item in self.data["agent_types"])
+        self.agents_by_type: Dict[str, FrozenSet[str]] = {}
+        self.agents_by_category: Dict[str, FrozenSet[str]] = {}
+        for agent_type, agents in self.data["agent_hierarchy"].items():
+            if isinstance(agents, dict):
+                # Grouped by category (e.g. DA: OpenAPI, Remote MCP, ...)
+                for category, category_agents in agents.items():
+                    self.agents_by_category[category] = frozenset(category_agents)
+                self.agents_by_type[agent_type] = frozenset(
+                    agent for category_agents in agents.values() for agent in category_agents
+                )
+            else:
+                self.agents_by_type[agent_type] = frozenset(agents)
+
+    def is_known_agent(self, agent_type: str, agent: str) -> bool:
+        """Whether ``agent`` is listed for ``agent_type`` (custom agents are not)."""
+        return agent in self.agents_by_type.get(agent_type, ())
+
+
+class ConfigService:
+    """Serves the portal configuration from ``data/config.json``, hot-reloaded.
+
+    The file holds the same keys as :data:`DEFAULT_CONFIG` plus an integer
+    ``version``. Each worker stats it at most every
+    ``config_check_interval_seconds`` and reloads when its mtime changes, so
+    edits take effect without a restart. An invalid file is logged and the
+    previous configuration kept.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None):
+        self.file = StateFile(Path(data_dir or settings.data_dir) / CONFIG_FILENAME)
+        self._config = PortalConfig(DEFAULT_CONFIG)
+        self._checked_at: Optional[float] = None
+
+    def ensure_file(self) -> None:
+        """Seed the config file from the defaults if it doesn't exist yet."""
+        if self.file.exists():
+            return
+        self.file.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.file.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "w") as f:
+            json.dump({"version": 1, **DEFAULT_CONFIG}, f, indent=2)
+        # Another worker may have seeded it meanwhile; either copy is the default
+        os.replace(temp_path, self.file.path)
+        logger.info(f"Seeded portal config at {self.file.path}")
+
+    def get(self) -> PortalConfig:
+        """Current configuration, reloading the file if it changed."""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < settings.config_check_interval_seconds:
+            return self._config
+        self._checked_at = now
+        if not self.file.changed():
+            return self._config
+        try:
+            data = self.file.read(default={"version": 0, **DEFAULT_CONFIG})
+            self._config = PortalConfig(data, int(data.get("version", 0)))
+            logger.info(f"Loaded portal config version {self._config.version}")
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+            logger.error(f"Invalid portal config {self.file.path}, keeping version {self._config.version}: {e}")
+        return self._config
+
+
+_config_service: Optional[ConfigService] = None
+
+
+def get_config_service() -> ConfigService:
+    """Get the shared config service, creating it on first use."""
+    global _config_service
+    if _config_service is None:
+        _config_service = ConfigService()
+    return _config_service
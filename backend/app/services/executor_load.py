@@ -0,0 +1,68 @@
+"""Per-executor load index."""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.storage.summary import RequestLike
+
+
+def _load_entry(request: RequestLike) -> Optional[Tuple[str, str]]:
+    """(kind, executor) a request counts towards, if any."""
+    if request.status == "in_progress" and request.executor:
+        return ("in_progress", request.executor)
+    if request.status == "pending" and request.assigned_to:
+        return ("assigned", request.assigned_to)
+    return None
+
+
+class ExecutorLoad:
+    """In-progress and assigned-but-pending request counts per executor.
+
+    Also remembers every executor seen, so the scheduler has a default pool.
+    Maintained incrementally alongside the pending queue.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[str, Tuple[str, str]] = {}
+        self._counts: Dict[str, Counter] = {"in_progress": Counter(), "assigned": Counter()}
+        self.known: Set[str] = set()
+
+    def rebuild(self, requests: Iterable[RequestLike]) -> None:
+        """Replace the index with the given requests."""
+        self._by_id = {}
+        self._counts = {"in_progress": Counter(), "assigned": Counter()}
+        self.known = set()
+        for request in requests:
+            self.update(request)
+
+    def discard(self, request_id: str) -> None:
+        """Stop counting a request."""
+        entry = self._by_id.pop(request_id, None)
+        if entry is not None:
+            kind, executor = entry
+            self._counts[kind][executor] -= 1
+            if self._counts[kind][executor] <= 0:
+                del self._counts[kind][executor]
+
+    def update(self, request: RequestLike) -> None:
+        """Re-index a request after a change."""
+        self.discard(request.id)
+        if request.executor:
+            self.known.add(request.executor)
+        entry = _load_entry(request)
+        if entry is not None:
+            kind, executor = entry
+            self._by_id[request.id] = entry
+            self._counts[kind][executor] += 1
+
+    def in_progress(self, executor: str) -> int:
+        return self._counts["in_progress"][executor]
+
+    def assigned(self, executor: str) -> int:
+        return self._counts["assigned"][executor]
+
+    def load(self, executor: str) -> int:
+        """Requests an executor is working on or has been assigned."""
+        return self.in_progress(executor) + self.assigned(executor)
+
+    def executors(self) -> List[str]:
+        """Every executor seen or currently loaded, sorted."""
+        return sorted(self.known | set(self._counts["in_progress"]) | set(self._counts["assigned"]))
@@ -0,0 +1,83 @@
+"""Ordered queue of pending requests."""
+from bisect import bisect_left, insort
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.models.request import Priority
+from app.storage.summary import RequestLike
+
+# High -> Medium -> Low
+PRIORITY_ORDER = {Priority.HIGH: 0, Priority.MEDIUM: 1, Priority.LOW: 2}
+
+# (priority rank, submitted_at timestamp, id); negated timestamp for the dashboard
+QueueKey = Tuple[int, float, str]
+
+
+def queue_key(request: RequestLike) -> QueueKey:
+    """Queue order: priority first, then longest waiting first (as the scheduler assigns)."""
+    return (
+        PRIORITY_ORDER.get(request.priority, 1),
+        request.submitted_at.timestamp(),
+        request.id
+    )
+
+
+def dashboard_key(request: RequestLike) -> QueueKey:
+    """Dashboard order: priority first, then newest first."""
+    return (
+        PRIORITY_ORDER.get(request.priority, 1),
+        -request.submitted_at.timestamp(),
+        request.id
+    )
+
+
+class PendingQueue:
+    """Pending requests kept in queue order, so a position counts the requests ahead.
+
+    A sorted list of keys plus a lookup by ID: a request's position is a
+    binary search instead of a full sort. Inserts and removals shift the list,
+    which is negligible next to the file write that triggers them.
+    """
+
+    def __init__(self):
+        self._keys: List[QueueKey] = []
+        self._by_id: Dict[str, QueueKey] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def rebuild(self, requests: Iterable[RequestLike]) -> None:
+        """Replace the queue contents with the pending requests given."""
+        self._by_id = {req.id: queue_key(req) for req in requests if req.status == "pending"}
+        self._keys = sorted(self._by_id.values())
+
+    def discard(self, request_id: str) -> None:
+        """Remove a request if it is queued."""
+        key = self._by_id.pop(request_id, None)
+        if key is not None:
+            del self._keys[bisect_left(self._keys, key)]
+
+    def update(self, request: RequestLike) -> None:
+        """Re-queue a request after a change (dropped unless still pending)."""
+        self.discard(request.id)
+        if request.status == "pending":
+            key = queue_key(request)
+            self._by_id[request.id] = key
+            insort(self._keys, key)
+
+    def position(self, request_id: str) -> Optional[int]:
+        """1-based position of a request, or None if it isn't queued."""
+        key = self._by_id.get(request_id)
+        if key is None:
+            return None
+        return bisect_left(self._keys, key) + 1
+
+    def ids(self) -> List[str]:
+        """Queued request IDs in order."""
+        return [key[2] for key in self._keys]
+
+    def dashboard_ids(self) -> List[str]:
+        """Queued request IDs in dashboard order: the queue reversed within each priority."""
+        ids: List[str] = []
+        for _, keys in groupby(self._keys, key=lambda key: key[0]):
+            ids.extend(key[2] for key in reversed(list(keys)))
+        return ids
@@ -1,24 +1,136 @@
 """Request service for business logic and CRUD operations."""
-from typing import List, Optional
-from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 import secrets
 from app.models.request import (
     Request, RequestCreate, RequestUpdate, 
     StartEvaluation, AddRunLinks, RunLink, Priority, UpdateEntry
 )
+from app.models.queue import QueuePosition
+from app.models.revision import RequestRevision, RevisionSummary
 from app.models.user import User
-from app.storage.json_storage import JSONStorage
+from app.services.analytics_service import AnalyticsService
+from app.services.config_service import get_config_service
+from app.services.executor_load import ExecutorLoad
+from app.services.pending_queue import PendingQueue, dashboard_key
+from app.services.search_cache import SearchCache
+from app.services.single_flight import SingleFlight
+from app.storage.json_storage import JSONStorage, matches_query
+from app.storage.revision_storage import RevisionStorage
+from app.storage.snapshot import default_snapshot_dir
+from app.storage.summary import RequestLike, RequestSummary
 from app.config import settings
 from app.utils.logger import get_logger
+from app.utils.serialization import Payload
 
 logger = get_logger(__name__)
 
+# Days of start history averaged for queue ETAs
+QUEUE_ETA_WINDOW_DAYS = 14
+
 
 class RequestService:
     """Business logic for evaluation requests."""
     
     def __init__(self):
-        self.storage = JSONStorage(data_dir=settings.data_dir)
+        self.storage = JSONStorage(
+            data_dir=settings.data_dir,
+            backup_enabled=settings.backup_enabled,
+            backup_retention_days=settings.backup_retention_days,
+            archive_compress=settings.archive_compress,
+            snapshot_dir=self._snapshot_dir(),
+            snapshot_publish_delay_ms=settings.snapshot_publish_delay_ms,
+            snapshot_max_bytes=settings.snapshot_max_mb * 1024 * 1024,
+            durability=settings.storage_durability,
+            commit_window_ms=settings.storage_commit_window_ms
+        )
+        self.revisions = RevisionStorage(Path(settings.data_dir) / "revisions")
+        self.analytics = AnalyticsService(self.storage, Path(settings.data_dir) / "analytics")
+        self.config = get_config_service()
+        
+        # In-memory indexes derived from storage, valid for _indexed_generation
+        self.pending = PendingQueue()
+        self.executor_load = ExecutorLoad()
+        self._indexed_generation: Optional[int] = None
+        
+        # Concurrent identical reads share one storage scan
+        self.reads = SingleFlight()
+        self.search_cache = SearchCache(settings.search_cache_size)
+    
+    @staticmethod
+    def _snapshot_dir() -> Optional[str]:
+        if not settings.shared_snapshot_enabled:
+            return None
+        return settings.snapshot_dir or str(default_snapshot_dir(Path(settings.data_dir)))
+    
+    async def _sync_indexes(self) -> None:
+        """Make sure the in-memory indexes reflect storage, rebuilding if another worker wrote."""
+        generation = self.storage.generation()
+        if self._indexed_generation != generation:
+            summaries = await self.storage.list_summaries()
+            self.pending.rebuild(summaries)
+            self.executor_load.rebuild(summaries)
+            self._indexed_generation = generation
+    
+    async def get_pending_queue(self) -> PendingQueue:
+        """Get the pending queue, up to date with storage."""
+        await self._sync_indexes()
+        return self.pending
+    
+    async def get_executor_load(self) -> ExecutorLoad:
+        """Get the per-executor load index, up to date with storage."""
+        await self._sync_indexes()
+        return self.executor_load
+    
+    def _update_indexes(self, before: Optional[Request], after: Optional[Request]) -> None:
+        """Apply a just-saved change to the in-memory indexes.
+        
+        Only done if the save was the sole write since the indexes were last in
+        sync; otherwise they are left stale and rebuilt on next use.
+        """
+        generation = self.storage.generation()
+        if self._indexed_generation != generation - 1:
+            return
+        if after is not None:
+            self.pending.update(after)
+            self.executor_load.update(after)
+        elif before is not None:
+            self.pending.discard(before.id)
+            self.executor_load.discard(before.id)
+        self._indexed_generation = generation
+    
+    async def _after_change(
+        self,
+        action: str,
+        user: User,
+        before: Optional[Request],
+        after: Optional[Request]
+    ) -> None:
+        """Propagate a saved mutation to revision history and analytics.
+        
+        ``before`` is None on create and ``after`` is None on delete.
+        """
+        self._update_indexes(before, after)
+        if after is not None:
+            await self.revisions.record(
+                after.id,
+                action,
+                user.name,
+                before.model_dump(mode="json") if before is not None else None,
+                after.model_dump(mode="json")
+            )
+        await self.analytics.on_change(before, after)
+    
+    def _validate_purpose(self, purpose: str) -> None:
+        """Reject purposes not offered by the current portal config."""
+        if purpose not in self.config.get().purposes:
+            raise ValueError(f"Purpose '{purpose}' is not currently offered")
+    
+    def _validate_agent_type(self, agent_type: str) -> None:
+        """Reject agent types not offered by the current portal config."""
+        if agent_type not in self.config.get().agent_types:
+            raise ValueError(f"Agent type '{agent_type}' is not currently offered")
     
     def _generate_id(self) -> str:
         """Generate unique request ID."""
@@ -28,6 +140,8 @@ class RequestService:
     
     async def create_request(self, request_data: RequestCreate, submitter: User) -> Request:
         """Create new evaluation request."""
+        self._validate_purpose(request_data.purpose)
+        self._validate_agent_type(request_data.agent_type)
         request_id = self._generate_id()
         
         # Create request with auto-populated fields
@@ -52,6 +166,7 @@ class RequestService:
         
         # Save to storage
         await self.storage.save_request(request)
+        await self._after_change("create", submitter, None, request)
         logger.info(f"Created request {request_id} by {submitter.name}")
         
         return request
@@ -60,25 +175,52 @@ class RequestService:
         """Get request by ID."""
         return await self.storage.get_request(request_id)
     
-    async def list_requests(self, status: Optional[str] = None, sort_by_priority: bool = True) -> List[Request]:
-        """List all requests, optionally filtered by status and sorted by priority."""
+    async def list_requests(
+        self,
+        status: Optional[str] = None,
+        sort_by_priority: bool = True,
+        include_archived: bool = False
+    ) -> List[RequestSummary]:
+        """List all requests, optionally filtered by status and sorted by priority.
+        
+        Returns summaries (see :meth:`serialize_requests` for the full JSON).
+        Archived requests (completed long ago) are only included if asked for.
+        """
+        key = ("list", status, sort_by_priority, include_archived, self.storage.generation())
+        return list(await self.reads.do(
+            key, lambda: self._list_requests(status, sort_by_priority, include_archived)
+        ))
+    
+    async def _list_requests(
+        self, status: Optional[str], sort_by_priority: bool, include_archived: bool
+    ) -> List[RequestSummary]:
+        if status == "pending" and sort_by_priority:
+            # Already kept in order; only the queued records are read
+            queue = await self.get_pending_queue()
+            requests = []
+            for request_id in queue.dashboard_ids():
+                summary = await self.storage.get_summary(request_id)
+                if summary:
+                    requests.append(summary)
+            return requests
+        
+        requests = await self.storage.list_summaries(include_archived=include_archived)
         if status:
-            requests = await self.storage.get_requests_by_status(status)
-        else:
-            requests = await self.storage.list_all_requests()
+            requests = [req for req in requests if req.status == status]
         
         # Sort by priority (High -> Medium -> Low) then by submitted_at (newest first)
         if sort_by_priority:
-            priority_order = {Priority.HIGH: 0, Priority.MEDIUM: 1, Priority.LOW: 2}
-            requests.sort(
-                key=lambda r: (
-                    priority_order.get(r.priority, 1),  # Priority first
-                    -r.submitted_at.timestamp()  # Then by time (descending)
-                )
-            )
+            requests.sort(key=dashboard_key)
         
         return requests
     
+    def filter_by_agent_category(self, requests: List[RequestLike], category: str) -> List[RequestLike]:
+        """Keep requests using at least one agent of a category (e.g. "OpenAPI")."""
+        agents = self.config.get().agents_by_category.get(category)
+        if agents is None:
+            raise ValueError(f"Unknown agent category '{category}'")
+        return [req for req in requests if not agents.isdisjoint(req.agents)]
+    
     async def update_request(
         self, 
         request_id: str, 
@@ -93,10 +235,15 @@ class RequestService:
         
         # Update fields (only non-None values)
         update_dict = update_data.model_dump(exclude_unset=True)
+        if update_dict.get("purpose") not in (None, request.purpose):
+            self._validate_purpose(update_dict["purpose"])
+        if update_dict.get("agent_type") not in (None, request.agent_type):
+            self._validate_agent_type(update_dict["agent_type"])
         updated_request = request.model_copy(update=update_dict)
         
         # Save updated request
         await self.storage.save_request(updated_request)
+        await self._after_change("update", user, request, updated_request)
         logger.info(f"Updated request {request_id} by {user.name}")
         
         return updated_request
@@ -133,6 +280,7 @@ class RequestService:
         
         # Save updated request
         await self.storage.save_request(updated_request)
+        await self._after_change("start", executor, request, updated_request)
         logger.info(f"Started evaluation {request_id} by {executor.name}")
         
         return updated_request
@@ -184,6 +332,7 @@ class RequestService:
         
         # Save updated request
         await self.storage.save_request(updated_request)
+        await self._after_change("links", user, request, updated_request)
         logger.info(f"Added {len(new_links)} run links to {request_id} by {user.name}")
         
         return updated_request
@@ -211,6 +360,7 @@ class RequestService:
         
         # Save updated request
         await self.storage.save_request(updated_request)
+        await self._after_change("complete", user, request, updated_request)
         logger.info(f"Completed evaluation {request_id} by {user.name}")
         
         return updated_request
@@ -232,21 +382,163 @@ class RequestService:
         
         # Save updated request
         await self.storage.save_request(updated_request)
+        await self._after_change("priority", user, request, updated_request)
         logger.info(f"Updated priority of {request_id} to {priority.value} by {user.name}")
         
         return updated_request
     
+    async def assign_request(
+        self,
+        request_id: str,
+        executor: str,
+        user: User
+    ) -> Optional[Request]:
+        """Assign a pending request to an executor (does not start it)."""
+        request = await self.storage.get_request(request_id)
+        if not request:
+            return None
+        
+        if request.status != "pending":
+            raise ValueError(f"Cannot assign request with status '{request.status}'")
+        
+        updated_request = request.model_copy(update={
+            "assigned_to": executor,
+            "assigned_at": datetime.now(timezone.utc)
+        })
+        
+        await self.storage.save_request(updated_request)
+        await self._after_change("assign", user, request, updated_request)
+        logger.info(f"Assigned request {request_id} to {executor} by {user.name}")
+        
+        return updated_request
+    
     async def delete_request(self, request_id: str, user: User) -> bool:
         """Delete request."""
+        request = await self.storage.get_request(request_id)
         success = await self.storage.delete_request(request_id)
         if success:
+            await self._after_change("delete", user, request, None)
             logger.info(f"Deleted request {request_id} by {user.name}")
         return success
     
-    async def search_requests(self, query: str) -> List[Request]:
-        """Search requests by query string."""
-        return await self.storage.search_requests(query)
+    async def import_requests(self, requests: List[Request], user: User) -> Dict[str, str]:
+        """Save imported requests as is, replacing stored ones with the same IDs.
+        
+        They are committed as one batch. Returns the error for each request
+        ID that failed to save.
+        """
+        current = {request.id: await self.storage.get_request(request.id) for request in requests}
+        errors: Dict[str, str] = {}
+        try:
+            await self.storage.save_requests(requests)
+        except Exception:
+            # Find out which ones failed; rewriting the saved ones is harmless
+            for request in requests:
+                try:
+                    await self.storage.save_request(request)
+                except Exception as e:
+                    errors[request.id] = str(e)
+        for request in requests:
+            if request.id not in errors:
+                await self._after_change("import", user, current[request.id], request)
+                current[request.id] = request
+        return errors
+    
+    async def search_requests(self, query: str) -> List[RequestSummary]:
+        """Search requests by query string (summaries, like :meth:`list_requests`)."""
+        # Matching is case-insensitive, so differently-cased queries share results
+        query_lower = query.lower()
+        generation = self.storage.generation()
+        results = self.search_cache.get(query_lower, generation)
+        if results is None:
+            key = ("search", query_lower, generation)
+            results = await self.reads.do(key, lambda: self._search(query_lower, generation))
+        return list(results)
+    
+    async def _search(self, query_lower: str, generation: int) -> List[RequestSummary]:
+        """Compute and cache search results, narrowing a cached prefix's results if possible."""
+        base = self.search_cache.narrowing_base(query_lower, generation)
+        if base is not None:
+            results = [req for req in base if matches_query(req, query_lower)]
+        else:
+            results = await self.storage.search_requests(query_lower)
+        self.search_cache.put(query_lower, generation, results)
+        return results
+    
+    async def get_queue_position(self, request_id: str) -> Optional[QueuePosition]:
+        """Get a pending request's queue position and estimated start time.
+        
+        The ETA assumes requests keep starting at the average daily rate of
+        the last ``QUEUE_ETA_WINDOW_DAYS`` days (from the analytics rollups).
+        """
+        request = await self.storage.get_request(request_id)
+        if not request:
+            return None
+        
+        if request.status != "pending":
+            raise ValueError(f"Request with status '{request.status}' is not queued")
+        
+        queue = await self.get_pending_queue()
+        position = queue.position(request_id)
+        if position is None:
+            raise ValueError(f"Request '{request_id}' is not queued")
+        
+        today = datetime.now(timezone.utc).date()
+        started = await self.analytics.get_timeseries(
+            "started", start=today - timedelta(days=QUEUE_ETA_WINDOW_DAYS - 1), end=today
+        )
+        throughput = sum(point["count"] for point in started["points"]) / QUEUE_ETA_WINDOW_DAYS
+        
+        estimated_start_at = None
+        if throughput > 0:
+            estimated_start_at = datetime.now(timezone.utc) + timedelta(days=position / throughput)
+        
+        return QueuePosition(
+            request_id=request_id,
+            position=position,
+            pending_total=len(queue),
+            throughput_per_day=round(throughput, 2),
+            estimated_start_at=estimated_start_at
+        )
+    
+    async def list_revisions(self, request_id: str) -> Optional[List[RevisionSummary]]:
+        """List a request's recorded revisions, or None if the request doesn't exist."""
+        revisions = await self.revisions.list_revisions(request_id)
+        if not revisions and await self.storage.get_request(request_id) is None:
+            return None
+        return [RevisionSummary(**revision) for revision in revisions]
+    
+    async def get_revision(self, request_id: str, revision: int) -> Optional[RequestRevision]:
+        """Rebuild a request as it was at a given revision."""
+        data = await self.revisions.get_revision(request_id, revision)
+        return RequestRevision(**data) if data else None
+    
+    def serialize_requests(self, requests: List[RequestLike]) -> List[Payload]:
+        """Get canonical compact JSON bytes for each request or summary (cached per version)."""
+        return self.storage.serialize_many(requests)
+    
+    async def export_payloads(self) -> List[Payload]:
+        """Canonical JSON of every request, hot and archived, for exports."""
+        return await self.storage.export_payloads()
+
+
+_request_service: Optional[RequestService] = None
+
+
+def get_request_service() -> RequestService:
+    """Get the shared request service, creating it on first use.
+    
+    Construction touches the data dir, so it is deferred until a request or
+    the startup hooks need it rather than done at import time.
+    """
+    global _request_service
+    if _request_service is None:
+        _request_service = RequestService()
+    return _request_service
 
 
-# Global request service instance
-request_service = RequestService()
+def __getattr__(name: str):
+    # ``request_service`` is still importable, but only built when first accessed
+    if name == "request_service":
+        return get_request_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,220 @@
+"""Capacity-aware auto-assignment of pending requests to executors."""
+import asyncio
+import heapq
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from app.config import settings
+from app.models.request import Request
+from app.models.user import User
+from app.services.pending_queue import PRIORITY_ORDER
+from app.services.request_service import RequestService, get_request_service
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Author recorded in revision history for automatic assignments
+SCHEDULER_USER = User(oid="scheduler", name="Scheduler", email="scheduler@localhost")
+
+
+def parse_capacities(value: str) -> Dict[str, int]:
+    """Parse ``"name=capacity,name=capacity"`` into a dict."""
+    capacities = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, capacity = item.rsplit("=", 1)
+            capacities[name.strip()] = int(capacity)
+    return capacities
+
+
+def _schedule_key(request: Request) -> tuple:
+    """Scheduling order: priority first, then longest waiting first."""
+    return (PRIORITY_ORDER.get(request.priority, 1), request.submitted_at, request.id)
+
+
+def _wait_stats(waits: List[float]) -> Dict[str, Optional[float]]:
+    """Mean/p50/p90 of wait times in seconds, reported in hours."""
+    if not waits:
+        return {"mean_hours": None, "p50_hours": None, "p90_hours": None}
+    waits = sorted(waits)
+
+    def percentile(q: float) -> float:
+        return round(waits[min(len(waits) - 1, int(q * len(waits)))] / 3600, 2)
+
+    return {
+        "mean_hours": round(sum(waits) / len(waits) / 3600, 2),
+        "p50_hours": percentile(0.5),
+        "p90_hours": percentile(0.9)
+    }
+
+
+class SchedulerService:
+    """Proposes or performs assignments of pending requests under per-executor capacity.
+
+    Opt-in: nothing is assigned automatically unless ``scheduler_enabled`` is
+    set, in which case :meth:`run` assigns every ``scheduler_interval_seconds``.
+    Load comes from the request service's executor index (in-progress plus
+    assigned-but-pending requests per executor).
+    """
+
+    def __init__(self, requests: RequestService):
+        self.requests = requests
+
+    def capacities(self, executors: List[str]) -> Dict[str, int]:
+        """Capacity per executor in the pool.
+
+        Configured capacities define the pool; otherwise every known executor
+        gets the default capacity.
+        """
+        configured = parse_capacities(settings.scheduler_capacities)
+        if configured:
+            return configured
+        return {name: settings.scheduler_default_capacity for name in executors}
+
+    async def get_load(self) -> List[Dict[str, Any]]:
+        """Current load and capacity per executor in the pool."""
+        load = await self.requests.get_executor_load()
+        return [
+            {
+                "executor": name,
+                "in_progress": load.in_progress(name),
+                "assigned": load.assigned(name),
+                "capacity": capacity,
+                "available": max(0, capacity - load.load(name))
+            }
+            for name, capacity in sorted(self.capacities(load.executors()).items())
+        ]
+
+    async def propose(self) -> List[Dict[str, Any]]:
+        """Assignments that would fill free capacity, highest priority and oldest first."""
+        available = {row["executor"]: row["available"] for row in await self.get_load()}
+        queue = await self.requests.get_pending_queue()
+
+        candidates = []
+        for request_id in queue.ids():
+            request = await self.requests.get_request(request_id)
+            if request and request.status == "pending" and not request.assigned_to:
+                candidates.append(request)
+        candidates.sort(key=_schedule_key)
+
+        now = datetime.now(timezone.utc)
+        proposals = []
+        for request in candidates:
+            # Most free capacity first; ties broken by name for stable results
+            executor = min(
+                (name for name, free in available.items() if free > 0),
+                key=lambda name: (-available[name], name),
+                default=None
+            )
+            if executor is None:
+                break
+            available[executor] -= 1
+            proposals.append({
+                "request_id": request.id,
+                "executor": executor,
+                "priority": request.priority.value,
+                "waiting_hours": round((now - request.submitted_at).total_seconds() / 3600, 2)
+            })
+        return proposals
+
+    async def assign(self, dry_run: bool = True, user: User = SCHEDULER_USER) -> Dict[str, Any]:
+        """Propose assignments and, unless ``dry_run``, perform them."""
+        proposals = await self.propose()
+        assigned = []
+        if not dry_run:
+            for proposal in proposals:
+                try:
+                    if await self.requests.assign_request(proposal["request_id"], proposal["executor"], user):
+                        assigned.append(proposal)
+                except ValueError as e:
+                    # Started or changed since the proposal was made
+                    logger.info(f"Skipped assignment of {proposal['request_id']}: {e}")
+            if assigned:
+                logger.info(f"Scheduler assigned {len(assigned)} requests")
+        return {"dry_run": dry_run, "proposals": proposals, "assigned": assigned}
+
+    async def run(self, interval: Optional[int] = None) -> None:
+        """Assign periodically until cancelled."""
+        interval = interval or settings.scheduler_interval_seconds
+        while True:
+            try:
+                await self.assign(dry_run=False)
+            except Exception as e:
+                logger.error(f"Scheduler run failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def simulate(
+        self,
+        capacity: Optional[int] = None,
+        executors: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Replay completed requests through the scheduler and compare queue times.
+
+        Each completed request arrives at its ``submitted_at`` and occupies one
+        executor slot for its historical execution time. Slots are filled in
+        scheduling order as soon as they free up. The result compares the
+        simulated wait (submission to start) with the actual one.
+        """
+        history = [
+            req for req in await self.requests.storage.list_all_requests(include_archived=True)
+            if req.started_at and req.completed_at
+        ]
+        history.sort(key=lambda req: req.submitted_at)
+        if executors is None:
+            executors = sorted({req.executor for req in history if req.executor})
+        capacity = capacity or settings.scheduler_default_capacity
+        slot_count = len(executors) * capacity
+
+        actual = [(req.started_at - req.submitted_at).total_seconds() for req in history]
+        simulated: List[float] = []
+        if slot_count and history:
+            origin = history[0].submitted_at
+            arrivals = [
+                (
+                    (req.submitted_at - origin).total_seconds(),
+                    (req.completed_at - req.started_at).total_seconds(),
+                    PRIORITY_ORDER.get(req.priority, 1)
+                )
+                for req in history
+            ]
+            slots = [0.0] * slot_count  # Time each slot frees up (min-heap)
+            waiting: list = []
+            i = 0
+            while i < len(arrivals) or waiting:
+                free_at = slots[0]
+                # Admit everything that arrived by the time the next slot frees
+                # up (or the next arrival, if nothing is waiting)
+                now = free_at if waiting else max(free_at, arrivals[i][0])
+                while i < len(arrivals) and arrivals[i][0] <= now:
+                    arrived, duration, rank = arrivals[i]
+                    heapq.heappush(waiting, (rank, arrived, i, duration))
+                    i += 1
+                _, arrived, _, duration = heapq.heappop(waiting)
+                start = max(free_at, arrived)
+                heapq.heapreplace(slots, start + duration)
+                simulated.append(start - arrived)
+
+        actual_stats = _wait_stats(actual)
+        simulated_stats = _wait_stats(simulated)
+        improvement = None
+        if actual_stats["mean_hours"] and simulated_stats["mean_hours"] is not None:
+            improvement = round(100 * (1 - simulated_stats["mean_hours"] / actual_stats["mean_hours"]), 1)
+
+        return {
+            "requests": len(history),
+            "executors": executors,
+            "capacity": capacity,
+            "actual": actual_stats,
+            "simulated": simulated_stats,
+            "mean_wait_improvement_pct": improvement
+        }
+
+
+_scheduler_service: Optional[SchedulerService] = None
+
+
+def get_scheduler_service() -> SchedulerService:
+    """Get the shared scheduler, creating it on first use."""
+    global _scheduler_service
+    if _scheduler_service is None:
+        _scheduler_service = SchedulerService(get_request_service())
+    return _scheduler_service
@@ -0,0 +1,82 @@
+"""Bounded LRU cache of search results."""
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from app.storage.summary import RequestSummary
+
+
+class SearchCache:
+    """Search results per normalized (lowercased) query, valid for one storage generation.
+
+    Any write moves the storage generation, which empties the cache on the
+    next lookup. Since search is substring matching, the results for a query
+    contain the results for every longer query that starts with it:
+    :meth:`narrowing_base` finds the longest cached prefix so "gith" can be
+    answered by filtering the results for "git" instead of scanning storage.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.generation: Optional[int] = None
+        self._entries: "OrderedDict[str, List[RequestSummary]]" = OrderedDict()
+        self.hits = 0
+        self.prefix_hits = 0
+        self.misses = 0
+
+    def _check_generation(self, generation: int) -> None:
+        if generation != self.generation:
+            self._entries.clear()
+            self.generation = generation
+
+    def get(self, query: str, generation: int) -> Optional[List[RequestSummary]]:
+        """Cached results for exactly this query, or None."""
+        self._check_generation(generation)
+        results = self._entries.get(query)
+        if results is not None:
+            self._entries.move_to_end(query)
+            self.hits += 1
+        return results
+
+    def narrowing_base(self, query: str, generation: int) -> Optional[List[RequestSummary]]:
+        """Cached results for the longest proper prefix of ``query``, or None.
+
+        Counts a prefix hit or a miss, so call it only after :meth:`get` missed.
+        """
+        self._check_generation(generation)
+        for end in range(len(query) - 1, 0, -1):
+            results = self._entries.get(query[:end])
+            if results is not None:
+                self._entries.move_to_end(query[:end])
+                self.prefix_hits += 1
+                return results
+        self.misses += 1
+        return None
+
+    def put(self, query: str, generation: int, results: List[RequestSummary]) -> None:
+        """Cache results computed at ``generation`` (dropped if the cache has moved on)."""
+        if generation != self.generation:
+            return
+        self._entries[query] = results
+        self._entries.move_to_end(query)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and approximate memory held by the cache itself.
+
+        Cached results reference the storage layer's summaries, so only the
+        keys and result lists count towards ``approx_bytes``.
+        """
+        lookups = self.hits + self.prefix_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "cached_results": sum(len(results) for results in self._entries.values()),
+            "approx_bytes": sum(
+                sys.getsizeof(query) + sys.getsizeof(results) for query, results in self._entries.items()
+            ),
+            "hits": self.hits,
+            "prefix_hits": self.prefix_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.prefix_hits) / lookups, 3) if lookups else None
+        }
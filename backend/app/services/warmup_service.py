@@ -0,0 +1,118 @@
+"""Background cache warm-up after startup."""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from app.services.request_service import RequestService
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Phases in the order they run
+WARMUP_PHASES = ("index", "records", "serialized", "indexes", "analytics")
+
+# Yield to the event loop every N records so requests keep being served
+_YIELD_EVERY = 100
+
+
+class WarmupService:
+    """Preloads storage and derived caches, tracking progress for ``GET /ready``.
+
+    Loading every record caches its summary and compact JSON (no full
+    models are kept) and pulls the files into the page cache (slow on a
+    network share). Until warm-up finishes the instance
+    reports not ready, so platform probes can hold traffic. A failed warm-up
+    still ends ready: caches fill lazily, just slower.
+    """
+
+    def __init__(self):
+        self.state = "pending"  # pending | warming | ready
+        self.phases: Dict[str, str] = {phase: "pending" for phase in WARMUP_PHASES}
+        self.records_loaded = 0
+        self.records_total = 0
+        self.started_at: Optional[datetime] = None
+        self.duration_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def skip(self) -> None:
+        """Mark ready without warming (warm-up disabled)."""
+        self.state = "ready"
+        self.phases = {phase: "skipped" for phase in WARMUP_PHASES}
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "status": self.state,
+            "phases": dict(self.phases),
+            "records": {"loaded": self.records_loaded, "total": self.records_total},
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "duration_seconds": self.duration_seconds,
+            "error": self.error
+        }
+
+    async def run(self, service: RequestService) -> None:
+        """Run all phases, then mark ready."""
+        self.state = "warming"
+        self.started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        phase = WARMUP_PHASES[0]
+        try:
+            phase = "index"
+            self.phases[phase] = "running"
+            request_ids = service.storage.list_request_ids()
+            self.records_total = len(request_ids)
+            self.phases[phase] = "done"
+
+            phase = "records"
+            self.phases[phase] = "running"
+            summaries = []
+            for i, request_id in enumerate(request_ids, 1):
+                summary = await service.storage.get_summary(request_id)
+                if summary is not None:
+                    summaries.append(summary)
+                self.records_loaded = i
+                if i % _YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+            self.phases[phase] = "done"
+
+            phase = "serialized"
+            self.phases[phase] = "running"
+            service.serialize_requests(summaries)
+            self.phases[phase] = "done"
+
+            phase = "indexes"
+            self.phases[phase] = "running"
+            await service.get_pending_queue()
+            self.phases[phase] = "done"
+
+            phase = "analytics"
+            self.phases[phase] = "running"
+            await service.analytics.warm_up()
+            self.phases[phase] = "done"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.phases[phase] = "failed"
+            self.error = f"{phase}: {e}"
+            logger.error(f"Warm-up failed during {phase}: {e}")
+
+        self.duration_seconds = round(time.perf_counter() - start, 3)
+        self.state = "ready"
+        logger.info(
+            f"Warm-up finished in {self.duration_seconds}s ({self.records_loaded} records)",
+            extra={"duration_seconds": self.duration_seconds, "records": self.records_loaded}
+        )
+
+
+_warmup_service: Optional[WarmupService] = None
+
+
+def get_warmup_service() -> WarmupService:
+    """Get the shared warm-up tracker."""
+    global _warmup_service
+    if _warmup_service is None:
+        _warmup_service = WarmupService()
+    return _warmup_service
@@ -1,4 +1,6 @@
 """Package initialization for storage layer."""
+from app.storage.backup_store import BackupStore
 from app.storage.json_storage import JSONStorage
+from app.storage.revision_storage import RevisionStorage
 
-__all__ = ["JSONStorage"]
+__all__ = ["BackupStore", "JSONStorage", "RevisionStorage"]
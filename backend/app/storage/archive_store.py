@@ -0,0 +1,205 @@
+"""Archive tier: completed requests in monthly packed segment files."""
+import asyncio
+import time
+import zlib
+from contextlib import ExitStack, asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+from app.storage.packed_segment import PackedSegment, write_packed_segment
+from app.utils.logger import get_logger
+from app.utils.state_file import locked_directory
+
+logger = get_logger(__name__)
+
+SEGMENT_SUFFIX = ".pack"
+
+# Seconds between attempts to take the archive lock while another worker holds it
+_LOCK_RETRY = 0.05
+
+# (st_mtime_ns, st_size) of a segment file, as for request files
+SegmentVersion = Tuple[int, int]
+
+
+def _parse_segment_name(name: str) -> Optional[Tuple[str, int]]:
+    """``"2025-10.3.pack"`` -> ``("2025-10", 3)``, or None for other files."""
+    if not name.endswith(SEGMENT_SUFFIX):
+        return None
+    month, _, sequence = name[:-len(SEGMENT_SUFFIX)].rpartition(".")
+    return (month, int(sequence)) if month and sequence.isdigit() else None
+
+
+class ArchiveStore:
+    """Completed requests, in one packed segment per completion month.
+
+    Segments are immutable: changing a month writes ``YYYY-MM.<n+1>.pack``
+    and then removes the older files, under a lock on the directory shared
+    by all workers. Readers memory-map the newest file of each month and re-list
+    the directory only when its mtime changes. Since a file is never
+    overwritten, a worker still reading an older mapping (a lookup, or an
+    export streaming from it) keeps a consistent view, and nothing is
+    replaced while mapped (which Windows refuses).
+    """
+
+    def __init__(self, archive_dir: Path, compress: bool = False):
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.compress = compress
+        self._lock = asyncio.Lock()
+        self._segments: Dict[str, PackedSegment] = {}
+        # Month of the segment holding each archived request
+        self._months: Dict[str, str] = {}
+        self._dir_mtime: Optional[int] = None
+        # Set while a watcher reports changes, so sync() needn't stat
+        self.watched = False
+
+    def _segment_files(self) -> Dict[str, List[Tuple[int, Path]]]:
+        """Segment files per month, newest first."""
+        files: Dict[str, List[Tuple[int, Path]]] = {}
+        for path in self.archive_dir.iterdir():
+            parsed = _parse_segment_name(path.name)
+            if parsed is not None:
+                files.setdefault(parsed[0], []).append((parsed[1], path))
+        for month_files in files.values():
+            month_files.sort(reverse=True)
+        return files
+
+    def sync(self) -> None:
+        """Refresh if any segment was added or removed (one stat when not, none while watched)."""
+        if self.watched and self._dir_mtime is not None:
+            return
+        if self.archive_dir.stat().st_mtime_ns != self._dir_mtime:
+            self.refresh()
+    
+    def invalidate(self) -> None:
+        """Re-list the directory on the next :meth:`sync`."""
+        self._dir_mtime = None
+
+    def refresh(self) -> None:
+        """Map the newest segment of each month, reusing mappings that are still current."""
+        self._dir_mtime = self.archive_dir.stat().st_mtime_ns
+        segments = {}
+        for month, month_files in self._segment_files().items():
+            _, path = month_files[0]
+            cached = self._segments.get(month)
+            if cached is not None and cached.path == path:
+                segments[month] = cached
+                continue
+            try:
+                segments[month] = PackedSegment(path)
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to map archive segment {path.name}: {e}")
+        if segments != self._segments:
+            self._months = {
+                request_id: month for month, segment in sorted(segments.items()) for request_id in segment.ids()
+            }
+        self._segments = segments
+
+    def _find(self, request_id: str) -> Optional[PackedSegment]:
+        month = self._months.get(request_id)
+        return self._segments.get(month) if month is not None else None
+
+    def __contains__(self, request_id: str) -> bool:
+        return self._find(request_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._months)
+
+    def ids(self) -> List[str]:
+        return list(self._months)
+
+    def version(self, request_id: str) -> Optional[SegmentVersion]:
+        """Version of the segment holding a request, or None if not archived."""
+        segment = self._find(request_id)
+        return segment.version if segment is not None else None
+
+    def read(self, request_id: str) -> Optional[bytes]:
+        """Canonical JSON of an archived request, or None."""
+        segment = self._find(request_id)
+        if segment is None:
+            return None
+        try:
+            return segment.read(request_id)
+        except zlib.error as e:
+            logger.error(f"Failed to read archived request {request_id}: {e}")
+            return None
+
+    def iter_payloads(self) -> Iterator[Tuple[str, SegmentVersion, Union[bytes, memoryview]]]:
+        """Every archived (request_id, segment version, canonical JSON), month by month.
+
+        Payloads of uncompressed segments are views into the mapping, which
+        can be streamed out without copying.
+        """
+        for _, segment in sorted(self._segments.items()):
+            try:
+                for request_id, payload in segment.iter_payloads():
+                    yield request_id, segment.version, payload
+            except zlib.error as e:
+                logger.error(f"Failed to read archive segment {segment.path.name}: {e}")
+
+    def _read_month(self, month: str) -> Dict[str, bytes]:
+        segment = self._segments.get(month)
+        if segment is None:
+            return {}
+        return {request_id: bytes(payload) for request_id, payload in segment.iter_payloads()}
+
+    def _write_month(self, month: str, records: Dict[str, bytes]) -> None:
+        """Write a month's next segment file (or none if empty) and drop the older ones."""
+        month_files = self._segment_files().get(month, [])
+        if records:
+            sequence = month_files[0][0] + 1 if month_files else 1
+            write_packed_segment(
+                self.archive_dir / f"{month}.{sequence}{SEGMENT_SUFFIX}", records, compress=self.compress
+            )
+        for _, path in month_files:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # Still mapped by a reader on Windows; removed when the month is next written
+                logger.warning(f"Could not remove old archive segment {path.name}: {e}")
+
+    def add(self, month: str, records: Dict[str, bytes]) -> None:
+        """Merge records into a month's segment (call while holding :meth:`lock`)."""
+        self.refresh()
+        merged = self._read_month(month)
+        merged.update(records)
+        self._write_month(month, merged)
+        self.refresh()
+
+    def remove(self, request_ids: List[str]) -> int:
+        """Drop records from their segments (call while holding :meth:`lock`)."""
+        self.refresh()
+        by_month: Dict[str, List[str]] = {}
+        for request_id in request_ids:
+            month = self._months.get(request_id)
+            if month is not None:
+                by_month.setdefault(month, []).append(request_id)
+        removed = 0
+        for month, month_ids in by_month.items():
+            records = self._read_month(month)
+            for request_id in month_ids:
+                removed += records.pop(request_id, None) is not None
+            self._write_month(month, records)
+        self.refresh()
+        return removed
+
+    @asynccontextmanager
+    async def lock(self, timeout: float = 30.0) -> AsyncIterator[None]:
+        """Cross-worker lock for segment rewrites (see :func:`locked_directory`).
+
+        Held across awaits, so this worker's coroutines queue on an asyncio
+        lock and other workers' hold is waited out without blocking the loop.
+        """
+        deadline = time.monotonic() + timeout
+        async with self._lock:
+            with ExitStack() as stack:
+                while True:
+                    try:
+                        stack.enter_context(locked_directory(self.archive_dir, blocking=False))
+                        break
+                    except BlockingIOError as e:
+                        if time.monotonic() > deadline:
+                            raise TimeoutError("Timed out waiting for the archive lock") from e
+                        await asyncio.sleep(_LOCK_RETRY)
+                yield
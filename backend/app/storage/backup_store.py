@@ -0,0 +1,221 @@
+"""Content-addressed, compressed backup store with retention enforcement."""
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from app.utils.logger import get_logger
+from app.utils.state_file import locked_directory, write_atomic
+
+logger = get_logger(__name__)
+
+# How often the background pruner enforces retention
+PRUNE_INTERVAL_SECONDS = 6 * 60 * 60
+
+# Unreferenced blobs younger than this are kept: another worker may have written
+# the blob and not yet recorded it in its manifest
+ORPHAN_GRACE_SECONDS = 60 * 60
+
+
+class BackupStore:
+    """Deduplicated request backups.
+
+    Layout under ``backups_dir``:
+    - ``blobs/<hh>/<sha256>.json.gz``: gzip-compressed request JSON, one per distinct content
+    - ``manifests/<request_id>.json``: ordered list of versions pointing at blobs
+
+    Each save records the new content; identical content is skipped, so no-op
+    updates cost no backup I/O beyond an in-memory hash comparison.
+
+    Recording a version and pruning one manifest or blob each hold the lock
+    on ``manifests/``, so a prune (run in a thread, or by another worker)
+    never drops a version just appended or a blob a new version reuses.
+    """
+
+    def __init__(self, backups_dir: Path, retention_days: int = 30):
+        self.backups_dir = Path(backups_dir)
+        self.blobs_dir = self.backups_dir / "blobs"
+        self.manifests_dir = self.backups_dir / "manifests"
+        self.retention_days = retention_days
+
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+
+        # Latest recorded content hash per request, keyed by manifest mtime so
+        # versions appended by other workers are noticed
+        self._latest: Dict[str, Tuple[int, Optional[str]]] = {}
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """Hash used to address a blob."""
+        return hashlib.sha256(content).hexdigest()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blobs_dir / digest[:2] / f"{digest}.json.gz"
+
+    def _manifest_path(self, request_id: str) -> Path:
+        return self.manifests_dir / f"{request_id}.json"
+
+    def _read_manifest(self, request_id: str) -> dict:
+        """Read a request's manifest, returning an empty one if missing or corrupt."""
+        path = self._manifest_path(request_id)
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"request_id": request_id, "versions": []}
+        except Exception as e:
+            logger.warning(f"Failed to read backup manifest for {request_id}: {e}")
+            return {"request_id": request_id, "versions": []}
+
+    def _write_manifest(self, request_id: str, manifest: dict) -> None:
+        """Write a manifest atomically."""
+        write_atomic(self._manifest_path(request_id), json.dumps(manifest).encode())
+
+    def _manifest_mtime(self, request_id: str) -> int:
+        try:
+            return self._manifest_path(request_id).stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def _latest_hash(self, request_id: str) -> Optional[str]:
+        mtime = self._manifest_mtime(request_id)
+        cached = self._latest.get(request_id)
+        if cached is None or cached[0] != mtime:
+            versions = self._read_manifest(request_id)["versions"] if mtime else []
+            cached = (mtime, versions[-1]["hash"] if versions else None)
+            self._latest[request_id] = cached
+        return cached[1]
+
+    def has_history(self, request_id: str) -> bool:
+        """Check whether any version of a request has been backed up."""
+        return self._latest_hash(request_id) is not None
+
+    def _write_blob(self, digest: str, content: bytes) -> None:
+        path = self._blob_path(digest)
+        try:
+            # Reused: refresh its mtime so a prune that hasn't seen the new
+            # version yet treats it as recent rather than orphaned
+            os.utime(path)
+            return
+        except FileNotFoundError:
+            pass
+        write_atomic(path, gzip.compress(content, compresslevel=6))
+
+    def _append_version(self, request_id: str, digest: str, event: str) -> None:
+        manifest = self._read_manifest(request_id)
+        manifest["versions"].append({
+            "hash": digest,
+            "event": event,
+            "saved_at": datetime.now(timezone.utc).isoformat()
+        })
+        self._write_manifest(request_id, manifest)
+        self._latest[request_id] = (self._manifest_mtime(request_id), digest)
+
+    def backup(self, request_id: str, content: bytes, event: str = "save") -> bool:
+        """Record a version of a request. Returns False if the content is unchanged."""
+        digest = self.content_hash(content)
+        if event == "save" and self._latest_hash(request_id) == digest:
+            return False
+
+        try:
+            with locked_directory(self.manifests_dir):
+                self._write_blob(digest, content)
+                self._append_version(request_id, digest, event)
+            logger.debug(f"Backed up request {request_id} ({digest[:12]}, {event})")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to backup request {request_id}: {e}")
+            return False
+
+    def list_versions(self, request_id: str) -> List[dict]:
+        """List recorded versions of a request, oldest first."""
+        return self._read_manifest(request_id)["versions"]
+
+    def read_version(self, digest: str) -> Optional[bytes]:
+        """Read the uncompressed content of a backed-up version."""
+        try:
+            with open(self._blob_path(digest), 'rb') as f:
+                return gzip.decompress(f.read())
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _is_orphan(blob_path: Path, orphan_cutoff: float) -> bool:
+        """Whether an unreferenced blob is past the grace period (and still exists)."""
+        try:
+            return blob_path.stat().st_mtime < orphan_cutoff
+        except FileNotFoundError:
+            return False
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """Enforce retention. Returns the number of files removed.
+
+        Versions older than ``retention_days`` are dropped, except the newest
+        version of each request that still exists. Manifests of deleted
+        requests expire entirely once the deletion is past retention. Blobs
+        no manifest references are then removed, as are legacy ``YYYY-MM-DD``
+        copy directories past retention.
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=self.retention_days)
+        removed = 0
+        referenced = set()
+
+        for manifest_path in self.manifests_dir.glob("*.json"):
+            request_id = manifest_path.stem
+            with locked_directory(self.manifests_dir):
+                manifest = self._read_manifest(request_id)
+                versions = manifest["versions"]
+                kept = [v for v in versions if datetime.fromisoformat(v["saved_at"]) >= cutoff]
+                if not kept and versions and versions[-1]["event"] != "delete":
+                    kept = versions[-1:]
+
+                if not kept:
+                    manifest_path.unlink(missing_ok=True)
+                    self._latest.pop(request_id, None)
+                    removed += 1
+                    continue
+
+                if len(kept) != len(versions):
+                    manifest["versions"] = kept
+                    self._write_manifest(request_id, manifest)
+            referenced.update(v["hash"] for v in kept)
+
+        orphan_cutoff = time.time() - ORPHAN_GRACE_SECONDS
+        for blob_path in self.blobs_dir.glob("*/*.json.gz"):
+            digest = blob_path.name[:-len(".json.gz")]
+            if digest in referenced or not self._is_orphan(blob_path, orphan_cutoff):
+                continue
+            with locked_directory(self.manifests_dir):
+                # Recheck: a backup may have reused the blob since the scan above
+                if self._is_orphan(blob_path, orphan_cutoff):
+                    blob_path.unlink()
+                    removed += 1
+
+        for legacy_dir in self.backups_dir.iterdir():
+            try:
+                day = datetime.strptime(legacy_dir.name, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            except ValueError:
+                continue
+            if legacy_dir.is_dir() and day < cutoff:
+                shutil.rmtree(legacy_dir, ignore_errors=True)
+                removed += 1
+
+        if removed:
+            logger.info(f"Pruned {removed} expired backup files")
+        return removed
+
+    async def run_pruner(self, interval_seconds: int = PRUNE_INTERVAL_SECONDS) -> None:
+        """Background task that enforces retention periodically."""
+        while True:
+            try:
+                await asyncio.to_thread(self.prune)
+            except Exception as e:
+                logger.error(f"Backup pruning failed: {e}")
+            await asyncio.sleep(interval_seconds)
@@ -0,0 +1,66 @@
+"""The storage generation: a counter shared by every worker on a data dir."""
+import os
+import struct
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows
+
+# Big-endian count at offset 0, rewritten in place so the file never grows
+_COUNTER = struct.Struct(">Q")
+
+
+def _pread(fd: int, size: int) -> bytes:
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, 0)
+    os.lseek(fd, 0, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+def _pwrite(fd: int, data: bytes) -> None:
+    if hasattr(os, "pwrite"):
+        os.pwrite(fd, data, 0)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, data)
+
+
+def _decode(fd: int) -> int:
+    content = _pread(fd, _COUNTER.size)
+    if len(content) == _COUNTER.size and content.strip(b".") != b"":
+        return _COUNTER.unpack(content)[0]
+    # Empty, or the older format: one "." appended per write
+    return os.fstat(fd).st_size
+
+
+def read_generation(path: Path) -> int:
+    """Current generation, 0 if nothing was ever written."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return 0
+    try:
+        return _decode(fd)
+    finally:
+        os.close(fd)
+
+
+def bump_generation(path: Path, writes: int = 1) -> int:
+    """Advance the generation by ``writes`` and return the new value.
+
+    The read-modify-write holds an exclusive lock on the file, so
+    concurrent workers never lose an increment. A file in the older
+    append-only format is converted, keeping its count.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        generation = _decode(fd) + writes
+        _pwrite(fd, _COUNTER.pack(generation))
+        os.ftruncate(fd, _COUNTER.size)
+        return generation
+    finally:
+        os.close(fd)
@@ -0,0 +1,116 @@
+"""Group commit: concurrent writes share one index update and one fsync barrier."""
+import asyncio
+import os
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DURABILITY_LEVELS = ("none", "batched", "per-write")
+
+T = TypeVar("T")
+
+# Flushes a batch; returns each item's error (None on success), in order
+FlushBatch = Callable[[List[T]], Awaitable[List[Optional[BaseException]]]]
+
+
+def fsync_file(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_dir(path: Path) -> None:
+    """Persist a directory's entries (a rename into it). Not supported on Windows, where it is skipped."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def fsync_all(files: Iterable[Path] = (), dirs: Iterable[Path] = ()) -> None:
+    """One barrier: file contents first, then the directory entries pointing at them."""
+    for path in files:
+        fsync_file(path)
+    for path in dirs:
+        fsync_dir(path)
+
+
+class GroupCommitter(Generic[T]):
+    """Batches concurrent submissions into one flush.
+
+    The first submitter starts a flush task; everything submitted until it
+    runs (``window_ms``, or the current turn of the event loop with 0)
+    forms its batch, and anything submitted while a flush is in flight
+    (e.g. waiting on fsync) forms the next one. Each submitter waits until
+    its own item is flushed and gets its error. ``max_batch=1`` commits
+    writes one by one.
+    """
+
+    def __init__(self, flush: FlushBatch, window_ms: float = 0, max_batch: Optional[int] = None):
+        self.flush = flush
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, *items: T) -> None:
+        """Queue items for the next batch and wait until they are flushed."""
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item in items:
+            future = loop.create_future()
+            self._pending.append((item, future))
+            futures.append(future)
+        if self._task is None:
+            # A task, so a cancelled submitter can't abort a batch others wait on
+            self._task = asyncio.create_task(self._run())
+        await asyncio.gather(*futures)
+
+    async def _run(self) -> None:
+        try:
+            while self._pending:
+                await asyncio.sleep(self.window_ms / 1000)
+                size = self.max_batch or len(self._pending)
+                batch, self._pending = self._pending[:size], self._pending[size:]
+                try:
+                    errors = await self.flush([item for item, _ in batch])
+                    if len(errors) != len(batch):
+                        raise RuntimeError(f"Flush returned {len(errors)} results for a batch of {len(batch)}")
+                except Exception as e:
+                    errors = [e] * len(batch)
+                self.batches += 1
+                self.items += len(batch)
+                for (_, future), error in zip(batch, errors, strict=True):
+                    if future.done():
+                        continue
+                    if error is None:
+                        future.set_result(None)
+                    else:
+                        future.set_exception(error)
+        finally:
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._pending),
+            "batches": self.batches,
+            "writes": self.items,
+            "writes_per_batch": round(self.items / self.batches, 2) if self.batches else None
+        }
+
+    async def drain(self) -> None:
+        """Wait for every queued item to be flushed (graceful shutdown)."""
+        while self._task is not None:
+            await asyncio.shield(self._task)
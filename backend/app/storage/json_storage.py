@@ -1,45 +1,183 @@
 """JSON file storage with atomic writes and file locking."""
+import asyncio
+import itertools
 import json
 import os
-import shutil
-from datetime import datetime, timezone
+import sys
+import weakref
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Any, Iterable, List, NamedTuple, Optional, Dict, Set, Tuple
 import aiofiles
-from app.models.request import Request
+from app.models.request import Request, TRUSTED_CONTEXT
+from app.storage.archive_store import ArchiveStore
+from app.storage.backup_store import BackupStore
+from app.storage.generation import bump_generation, read_generation
+from app.storage.group_commit import DURABILITY_LEVELS, GroupCommitter, fsync_all, fsync_file
+from app.storage.sharding import ShardedLayout
+from app.storage.snapshot import DEFAULT_MAX_BYTES, Snapshot, SnapshotStore, encode_entry, store_id
+from app.storage.summary import RequestLike, RequestSummary, search_text, summary_size
+from app.storage.watcher import StorageWatcher
 from app.utils.logger import get_logger
+from app.utils.serialization import Payload
 
 logger = get_logger(__name__)
 
+# File version used to validate cache entries: (st_mtime_ns, st_size)
+FileVersion = Tuple[int, int]
+
+# Bump whenever the stored record layout or model validation rules change.
+# Records stamped with the current version were validated on write and skip
+# the Python-level field validators on load; anything else is fully validated.
+STORAGE_SCHEMA_VERSION = 1
+# The stamp is always written as the first key, so it can be checked without parsing
+_SCHEMA_PREFIX = f'{{\n  "schema_version": {STORAGE_SCHEMA_VERSION},'
+
+
+def as_utc(value: datetime) -> datetime:
+    """An aware datetime; naive ones (records stored without a timezone) are taken as UTC."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def matches_query(req: RequestLike, query_lower: str) -> bool:
+    """Whether a lowercased query occurs in any searchable field of a request or summary."""
+    text = req.search_text if isinstance(req, RequestSummary) else search_text(req)
+    return query_lower in text
+
+
+class CachedRecord(NamedTuple):
+    """Summary of a request plus its canonical compact JSON, tied to a file version.
+    
+    ``raw`` is None while the shared snapshot holds this version's JSON.
+    """
+    version: FileVersion
+    summary: RequestSummary
+    raw: Optional[bytes]
+
+
+class PendingWrite(NamedTuple):
+    """A request written to its temp file, waiting for its batch to commit."""
+    request: Request
+    raw: bytes
+    temp_path: Path
+    file_path: Path
+
+
+class SnapshotPlan(NamedTuple):
+    """A snapshot waiting to be published: ``changes`` applied to the snapshot of ``base``.
+    
+    A change of None removes the request. Without a ``base``, the changes
+    are the whole snapshot.
+    """
+    generation: int
+    base: Optional[int]
+    changes: Dict[str, Optional[bytes]]
+
 
 class JSONStorage:
     """Storage layer for managing evaluation requests as JSON files."""
     
-    def __init__(self, data_dir: str = "./data"):
+    def __init__(
+        self,
+        data_dir: str = "./data",
+        backup_enabled: bool = True,
+        backup_retention_days: int = 30,
+        archive_compress: bool = False,
+        snapshot_dir: Optional[str] = None,
+        durability: str = "batched",
+        commit_window_ms: float = 2,
+        snapshot_publish_delay_ms: float = 50,
+        snapshot_max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability '{durability}', expected one of {', '.join(DURABILITY_LEVELS)}")
         self.data_dir = Path(data_dir)
         self.requests_dir = self.data_dir / "requests"
+        self.layout = ShardedLayout(self.requests_dir)
         self.backups_dir = self.data_dir / "backups"
         self.index_file = self.data_dir / "index.json"
+        self.generation_file = self.data_dir / "generation"
+        self.archive = ArchiveStore(self.data_dir / "archive", compress=archive_compress)
+        self.backups = (
+            BackupStore(self.backups_dir, retention_days=backup_retention_days)
+            if backup_enabled else None
+        )
+        
+        # Concurrent saves share one index update, generation bump and fsync
+        # barrier; per-write durability commits (and fsyncs) them one by one
+        self.durability = durability
+        self.commits: GroupCommitter[PendingWrite] = GroupCommitter(
+            self._commit_batch,
+            window_ms=commit_window_ms,
+            max_batch=1 if durability == "per-write" else None
+        )
+        self._temp_names = itertools.count()
+        
+        # Per-request cache, revalidated against the file's mtime/size on every
+        # read unless a watcher is keeping it coherent (see set_watched)
+        self._records: Dict[str, CachedRecord] = {}
+        # Full models still referenced by a caller, reused while they live;
+        # anything else is rebuilt from the cached bytes on demand
+        self._models: "weakref.WeakValueDictionary[str, Request]" = weakref.WeakValueDictionary()
         
         # Create directories if they don't exist
         self.requests_dir.mkdir(parents=True, exist_ok=True)
         self.backups_dir.mkdir(parents=True, exist_ok=True)
         
+        # Snapshot of the hot requests shared by the workers on this machine
+        self.snapshots = (
+            SnapshotStore(Path(snapshot_dir), store_id(self.data_dir), max_bytes=snapshot_max_bytes)
+            if snapshot_dir else None
+        )
+        self._snapshot: Optional[Snapshot] = None
+        # Writes are published off the event loop, a burst of them as one snapshot
+        self.snapshot_publish_delay_ms = snapshot_publish_delay_ms
+        self._snapshot_plan: Optional[SnapshotPlan] = None
+        self._snapshot_publishing: Optional[int] = None
+        self._snapshot_task: Optional[asyncio.Task] = None
+        # Request count of a snapshot over the size limit, not rebuilt while at least as many
+        self._snapshot_overflow: Optional[int] = None
+        
+        # Trusted while watched; the watcher drops what other workers change
+        self.watched = False
+        self._generation: Optional[int] = None
+        self._pending_generation: Optional[int] = None
+        # Cached records to check against their files once more before trusting
+        self._unverified: Set[str] = set()
+        self._index_ids: Optional[List[str]] = None
+        self._snapshot_missing: Optional[int] = None
+        
+        # Held across index read-modify-writes, which yield while fsyncing
+        self._index_lock = asyncio.Lock()
+        
         # Initialize index if it doesn't exist
         if not self.index_file.exists():
-            self._write_index({"request_ids": [], "last_updated": datetime.now(timezone.utc).isoformat()})
+            temp_file = self._index_temp_file()
+            temp_file.write_text(json.dumps({"request_ids": [], "last_updated": datetime.now(timezone.utc).isoformat()}))
+            os.replace(temp_file, self.index_file)
+    
+    def _index_temp_file(self) -> Path:
+        # One per worker, so workers writing the index at once don't share a temp file
+        return self.index_file.with_suffix(f".{os.getpid()}.tmp")
     
-    def _write_index(self, data: dict) -> None:
-        """Write index file atomically."""
-        temp_file = self.index_file.with_suffix(".tmp")
+    async def _write_index(self, data: dict) -> None:
+        """Write index file atomically (call while holding ``_index_lock``).
+        
+        Unless durability is "none", the new contents are fsynced off the
+        event loop before the rename; syncing the directory entry is left to
+        the caller's barrier.
+        """
+        temp_file = self._index_temp_file()
         try:
             with open(temp_file, 'w') as f:
                 json.dump(data, f, indent=2)
+            if self.durability != "none":
+                await asyncio.to_thread(fsync_file, temp_file)
             os.replace(temp_file, self.index_file)
+            self._index_ids = list(data["request_ids"]) if self.watched else None
         except Exception as e:
             logger.error(f"Failed to write index: {e}")
-            if temp_file.exists():
-                temp_file.unlink()
+            temp_file.unlink(missing_ok=True)
             raise
     
     def _read_index(self) -> dict:
@@ -51,116 +189,765 @@ class JSONStorage:
             logger.error(f"Failed to read index: {e}")
             return {"request_ids": [], "last_updated": datetime.now(timezone.utc).isoformat()}
     
-    def _update_index_add(self, request_id: str) -> None:
+    async def _update_index_add(self, request_id: str) -> None:
         """Add request ID to index."""
-        index = self._read_index()
-        if request_id not in index["request_ids"]:
-            index["request_ids"].append(request_id)
-            index["last_updated"] = datetime.now(timezone.utc).isoformat()
-            index["count"] = len(index["request_ids"])
-            self._write_index(index)
-    
-    def _update_index_remove(self, request_id: str) -> None:
+        async with self._index_lock:
+            index = self._read_index()
+            if request_id not in index["request_ids"]:
+                index["request_ids"].append(request_id)
+                index["last_updated"] = datetime.now(timezone.utc).isoformat()
+                index["count"] = len(index["request_ids"])
+                await self._write_index(index)
+    
+    async def _update_index_remove(self, request_id: str) -> None:
         """Remove request ID from index."""
-        index = self._read_index()
-        if request_id in index["request_ids"]:
-            index["request_ids"].remove(request_id)
-            index["last_updated"] = datetime.now(timezone.utc).isoformat()
-            index["count"] = len(index["request_ids"])
-            self._write_index(index)
-    
-    def _backup_request(self, request_id: str) -> None:
-        """Create backup of request file."""
-        source = self.requests_dir / f"{request_id}.json"
-        if not source.exists():
-            return
+        async with self._index_lock:
+            index = self._read_index()
+            if request_id in index["request_ids"]:
+                index["request_ids"].remove(request_id)
+                index["last_updated"] = datetime.now(timezone.utc).isoformat()
+                index["count"] = len(index["request_ids"])
+                await self._write_index(index)
+    
+    def generation(self) -> int:
+        """Return the storage generation, which grows on every save or delete.
         
-        # Create date-based backup directory
-        backup_date_dir = self.backups_dir / datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        backup_date_dir.mkdir(parents=True, exist_ok=True)
+        Shared by all workers on the same data dir, so in-memory derived state
+        (queues, caches) can tell whether anything changed since it was built.
+        """
+        if self.watched and self._generation is not None:
+            return self._generation
+        return self._read_generation()
+    
+    def _read_generation(self) -> int:
+        return read_generation(self.generation_file)
+    
+    def _bump_generation(self, writes: int = 1) -> int:
+        """Advance the generation by ``writes`` and return the new value.
+        
+        A batch advances it by one per write in a single update, so indexes
+        kept in sync one write at a time notice it covered several.
+        """
+        previous = self._generation
+        generation = bump_generation(self.generation_file, writes)
+        if self.watched:
+            if previous is None or generation != previous + writes:
+                # Other workers committed too, and their events may not be in yet
+                self._index_ids = None
+                self._revalidate_records()
+            self._generation = generation
+        return generation
+    
+    @staticmethod
+    def _file_version(file_path: Path) -> Optional[FileVersion]:
+        """Return the cache version of a file, or None if it does not exist."""
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _locate(self, request_id: str) -> Tuple[Path, Optional[FileVersion]]:
+        """Find a request's file: its shard, else the flat layout (not yet migrated)."""
+        file_path = self.layout.path(request_id)
+        version = self._file_version(file_path)
+        if version is None:
+            legacy_path = self.layout.legacy_path(request_id)
+            legacy_version = self._file_version(legacy_path)
+            if legacy_version is not None:
+                return legacy_path, legacy_version
+        return file_path, version
+    
+    async def migrate_flat_layout(self, batch_size: int = 200) -> int:
+        """Move request files from the flat layout into shards, in the background.
         
-        # Copy file to backup
-        dest = backup_date_dir / f"{request_id}.json"
+        Reads and writes handle both layouts meanwhile, so this can run while
+        serving; it yields to the event loop between batches. Returns the
+        number of files moved.
+        """
+        moved = 0
+        for i, request_id in enumerate(list(self.layout.legacy_keys()), start=1):
+            if self.layout.migrate(request_id):
+                moved += 1
+            if i % batch_size == 0:
+                await asyncio.sleep(0)
+        if moved:
+            logger.info(f"Migrated {moved} request files to the sharded layout")
+        return moved
+    
+    def _cache_record(self, request: Request, version: Optional[FileVersion], raw: Optional[bytes] = None) -> None:
+        """Remember a freshly written or parsed request."""
+        if version is None:
+            self._forget(request.id)
+        else:
+            if raw is None:
+                raw = request.model_dump_json().encode("utf-8")
+            self._records[request.id] = CachedRecord(version, RequestSummary.from_request(request), raw)
+            self._models[request.id] = request
+    
+    def _forget(self, request_id: str) -> None:
+        self._records.pop(request_id, None)
+        self._models.pop(request_id, None)
+    
+    def _raw(self, request_id: str, record: CachedRecord) -> Optional[Payload]:
+        """A cached record's canonical JSON: its own bytes, else a view into the snapshot."""
+        if record.raw is not None:
+            return record.raw
+        if self._snapshot is not None:
+            view = self._snapshot.raw(request_id, record.version)
+            if view is not None:
+                return view
+        # The snapshot moved on past this version; serve what the file has now
+        file_path, _ = self._locate(request_id)
         try:
-            shutil.copy2(source, dest)
-            logger.info(f"Backed up request {request_id}")
+            return self._load_record(file_path.read_text()).model_dump_json().encode("utf-8")
         except Exception as e:
-            logger.warning(f"Failed to backup request {request_id}: {e}")
+            logger.error(f"Failed to load request {request_id}: {e}")
+            return None
     
-    async def save_request(self, request: Request) -> None:
-        """Save request to JSON file atomically."""
+    def _model(self, request_id: str, record: CachedRecord) -> Optional[Request]:
+        """The full model of a cached record, reused if a caller still holds it."""
+        request = self._models.get(request_id)
+        if request is None:
+            raw = self._raw(request_id, record)
+            if raw is None:
+                return None
+            # Cached bytes were validated when the record was written or read
+            request = Request.model_validate_json(bytes(raw), context=TRUSTED_CONTEXT)
+            self._models[request_id] = request
+        return request
+    
+    def serialize(self, request: RequestLike) -> Optional[Payload]:
+        """Return the canonical compact JSON for a request or summary.
+        
+        Requests and summaries handed out by this storage reuse the cached
+        bytes (or the shared snapshot's). A summary whose request has since
+        been deleted gives None.
+        """
+        cached = self._records.get(request.id)
+        if isinstance(request, RequestSummary):
+            return self._raw(request.id, cached) if cached is not None else None
+        if cached is not None and self._models.get(request.id) is request:
+            raw = self._raw(request.id, cached)
+            if raw is not None:
+                return raw
+        return request.model_dump_json().encode("utf-8")
+    
+    def serialize_many(self, requests: List[RequestLike]) -> List[Payload]:
+        """Return canonical compact JSON bytes for each request, in order."""
+        payloads = (self.serialize(req) for req in requests)
+        return [payload for payload in payloads if payload is not None]
+    
+    async def _backup_existing(self, request_id: str) -> None:
+        """Seed the backup history with the on-disk version if none was recorded yet.
+        
+        Covers records written before the backup store existed, so their
+        pre-update content is not lost on the first save.
+        """
+        if self.backups is None or self.backups.has_history(request_id):
+            return
+        request = await self.get_request(request_id)
+        if request is not None:
+            self.backups.backup(request_id, bytes(self.serialize(request)))
+    
+    async def _prepare_write(self, request: Request) -> PendingWrite:
+        """Write a request's new version to a temp file next to it, ready to commit."""
         request_id = request.id
-        file_path = self.requests_dir / f"{request_id}.json"
-        temp_path = file_path.with_suffix(".tmp")
+        # Move a flat-layout file into its shard first, so it can't later be
+        # migrated over this newer version
+        self.layout.migrate(request_id)
+        file_path = self.layout.path(request_id)
+        self.layout.ensure_parent(file_path)
+        # Unique, as a batch may hold two versions of one request
+        temp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.{next(self._temp_names)}.tmp")
         
         try:
-            # Backup existing file if it exists
+            # Backup existing file if it has no recorded history yet
             if file_path.exists():
-                self._backup_request(request_id)
+                await self._backup_existing(request_id)
             
             # Write to temporary file
+            raw = request.model_dump_json().encode("utf-8")
             async with aiofiles.open(temp_path, 'w') as f:
-                # Convert Pydantic model to dict and serialize
-                data = request.model_dump(mode='json')
+                # Pretty-print on disk; the compact form is kept for responses
+                data = {"schema_version": STORAGE_SCHEMA_VERSION, **json.loads(raw)}
                 await f.write(json.dumps(data, indent=2, default=str))
-            
-            # Atomic rename
-            os.replace(temp_path, file_path)
-            
-            # Update index
-            self._update_index_add(request_id)
-            
-            logger.info(f"Saved request {request_id}")
         except Exception as e:
             logger.error(f"Failed to save request {request_id}: {e}")
-            if temp_path.exists():
-                temp_path.unlink()
+            temp_path.unlink(missing_ok=True)
             raise
+        return PendingWrite(request, raw, temp_path, file_path)
     
-    async def get_request(self, request_id: str) -> Optional[Request]:
-        """Retrieve request by ID."""
-        file_path = self.requests_dir / f"{request_id}.json"
+    async def _commit_batch(self, writes: List[PendingWrite]) -> List[Optional[BaseException]]:
+        """Commit a batch of prepared writes (run by the group committer).
         
-        if not file_path.exists():
-            return None
+        Unless durability is "none", the temp files are fsynced before they
+        are renamed into place, and the directories after, each as one
+        barrier for the whole batch off the event loop (as is the new index,
+        see :meth:`_write_index`). In between, the renames, the index update,
+        the generation bump and the snapshot are done once for the batch.
+        """
+        durable = self.durability != "none"
+        if durable:
+            try:
+                await asyncio.to_thread(fsync_all, [write.temp_path for write in writes])
+            except OSError as e:
+                logger.error(f"Failed to sync {len(writes)} request writes: {e}")
+                for write in writes:
+                    write.temp_path.unlink(missing_ok=True)
+                return [e] * len(writes)
+        
+        errors: List[Optional[BaseException]] = []
+        committed: List[PendingWrite] = []
+        for write in writes:
+            request_id = write.request.id
+            try:
+                # Atomic rename
+                os.replace(write.temp_path, write.file_path)
+            except OSError as e:
+                logger.error(f"Failed to save request {request_id}: {e}")
+                write.temp_path.unlink(missing_ok=True)
+                errors.append(e)
+                continue
+            errors.append(None)
+            committed.append(write)
+            self._cache_record(write.request, self._file_version(write.file_path), write.raw)
+            
+            # Record the new version (skipped when content is unchanged)
+            if self.backups is not None:
+                try:
+                    self.backups.backup(request_id, write.raw)
+                except Exception as e:
+                    logger.error(f"Failed to back up request {request_id}: {e}")
+        if not committed:
+            return errors
+        
+        # Update index
+        request_ids = list(dict.fromkeys(write.request.id for write in committed))
+        async with self._index_lock:
+            index = self._read_index()
+            known = set(index["request_ids"])
+            new_ids = [request_id for request_id in request_ids if request_id not in known]
+            if new_ids:
+                index["request_ids"].extend(new_ids)
+                index["last_updated"] = datetime.now(timezone.utc).isoformat()
+                index["count"] = len(index["request_ids"])
+                await self._write_index(index)
+        generation = self._bump_generation(len(committed))
+        self._publish_snapshot(generation, changed=request_ids, writes=len(committed))
+        
+        # A saved archived request moves back to the hot tier
+        self.archive.sync()
+        unarchived = [request_id for request_id in request_ids if request_id in self.archive]
+        if unarchived:
+            async with self.archive.lock():
+                self.archive.remove(unarchived)
+        
+        if durable:
+            dirs = {write.file_path.parent for write in committed}
+            if new_ids:
+                dirs.add(self.data_dir)
+            try:
+                await asyncio.to_thread(fsync_all, dirs=dirs)
+            except OSError as e:
+                logger.error(f"Failed to sync request directories: {e}")
+                return [error or e for error in errors]
+        return errors
+    
+    async def save_request(self, request: Request) -> None:
+        """Save request to JSON file atomically, committed with any concurrent saves."""
+        await self.commits.submit(await self._prepare_write(request))
+        logger.info(f"Saved request {request.id}")
+    
+    async def save_requests(self, requests: List[Request]) -> None:
+        """Save many requests as one batch (bulk import and seeding)."""
+        writes = [await self._prepare_write(request) for request in requests]
+        await self.commits.submit(*writes)
+        logger.info(f"Saved {len(requests)} requests")
+    
+    async def flush(self) -> None:
+        """Wait for queued writes to commit and their snapshot to be published (graceful shutdown)."""
+        await self.commits.drain()
+        while self._snapshot_task is not None:
+            await asyncio.shield(self._snapshot_task)
+    
+    @staticmethod
+    def _load_record(content: str) -> Request:
+        """Build a Request from stored JSON, taking the fast path for trusted records.
+        
+        Records stamped with the current schema version are parsed and built in a
+        single pydantic-core pass with field validators short-circuited. Older or
+        unstamped records go through full validation.
+        """
+        if content.startswith(_SCHEMA_PREFIX):
+            return Request.model_validate_json(content, context=TRUSTED_CONTEXT)
+        return Request(**json.loads(content))
+    
+    async def _load(
+        self, request_id: str, snapshot: Optional[Snapshot] = None
+    ) -> Tuple[Optional[CachedRecord], Optional[Request]]:
+        """Current cached record of a hot or archived request, re-reading it if it changed.
+        
+        With a current ``snapshot``, versions and changed records come from
+        it and the request file isn't touched. Also returns the model when
+        one had to be parsed, so callers that want it don't parse the bytes a
+        second time.
+        """
+        if snapshot is not None:
+            return self._load_from_snapshot(request_id, snapshot)
+        
+        cached = self._records.get(request_id)
+        if cached is not None and self.watched and request_id not in self._unverified:
+            return cached, None
+        
+        file_path, version = self._locate(request_id)
+        self._unverified.discard(request_id)
+        if version is None:
+            return self._load_archived(request_id)
+        
+        if cached is not None and cached.version == version:
+            return cached, None
         
         try:
             async with aiofiles.open(file_path, 'r') as f:
                 content = await f.read()
-                data = json.loads(content)
-                return Request(**data)
+            request = self._load_record(content)
         except Exception as e:
             logger.error(f"Failed to load request {request_id}: {e}")
+            return None, None
+        self._cache_record(request, version)
+        return self._records.get(request.id), request
+    
+    def _load_from_snapshot(
+        self, request_id: str, snapshot: Snapshot
+    ) -> Tuple[Optional[CachedRecord], Optional[Request]]:
+        version = snapshot.version(request_id)
+        if version is None:
+            return self._load_archived(request_id)
+        self._unverified.discard(request_id)
+        cached = self._records.get(request_id)
+        if cached is not None and cached.version == version:
+            if cached.raw is not None:
+                # The shared mapping holds the same bytes
+                cached = cached._replace(raw=None)
+                self._records[request_id] = cached
+            return cached, None
+        entry = snapshot.entry(request_id)
+        self._models.pop(request_id, None)
+        record = self._records[request_id] = CachedRecord(entry.version, entry.summary, None)
+        return record, None
+    
+    def _current_snapshot(self, generation: int) -> Optional[Snapshot]:
+        """The shared snapshot of ``generation``, mapping it if needed, or None if there is none."""
+        if self.snapshots is None:
             return None
+        if self._snapshot is not None and self._snapshot.generation == generation:
+            return self._snapshot
+        if self._snapshot_missing == generation:
+            return None
+        snapshot = self.snapshots.open(generation)
+        if snapshot is not None:
+            self._snapshot = snapshot
+        elif self.watched:
+            # Not looked for again until the watcher sees a snapshot published
+            self._snapshot_missing = generation
+        return snapshot
+    
+    def _publish_snapshot(
+        self, generation: int, changed: Iterable[str] = (), removed: Iterable[str] = (), writes: int = 1
+    ) -> None:
+        """Plan the snapshot of a generation this worker just committed.
+        
+        It patches the snapshot from before the commit (``writes``
+        generations back) with the changed and removed requests; only their
+        entries are encoded here, the rest is copied when it is published.
+        If that one isn't there (another worker's commit in between hasn't
+        been published), nothing is published and the next full listing
+        rebuilds it; reads use the files until then.
+        """
+        if self.snapshots is None:
+            return
+        changes: Dict[str, Optional[bytes]] = dict.fromkeys(removed)
+        for request_id in changed:
+            record = self._records.get(request_id)
+            raw = self._raw(request_id, record) if record is not None else None
+            if raw is None:
+                self._snapshot_plan = None
+                return
+            changes[request_id] = encode_entry(record.version, record.summary, raw)
+        base = generation - writes
+        plan = self._snapshot_plan
+        if plan is not None and plan.generation == base:
+            # Not published yet: fold this commit into it
+            plan.changes.update(changes)
+            self._schedule_snapshot(plan._replace(generation=generation))
+        elif self._snapshot_publishing == base or self._current_snapshot(base) is not None:
+            self._schedule_snapshot(SnapshotPlan(generation, base, changes))
+        else:
+            self._snapshot_plan = None
+    
+    def _rebuild_snapshot(self, generation: int, request_ids: List[str]) -> None:
+        """Plan a snapshot from records just loaded from the files, unless a write happened meanwhile.
+        
+        Skipped while a snapshot is on its way anyway, and while there are
+        as many requests as there were when one went over the size limit.
+        """
+        if self.generation() != generation or self._snapshot_plan is not None or self._snapshot_publishing is not None:
+            return
+        if self._snapshot_overflow is not None and len(request_ids) >= self._snapshot_overflow:
+            return
+        changes: Dict[str, Optional[bytes]] = {}
+        for request_id in request_ids:
+            record = self._records.get(request_id)
+            raw = self._raw(request_id, record) if record is not None else None
+            if raw is not None:
+                changes[request_id] = encode_entry(record.version, record.summary, raw)
+        self._schedule_snapshot(SnapshotPlan(generation, None, changes))
+    
+    def _schedule_snapshot(self, plan: SnapshotPlan) -> None:
+        self._snapshot_plan = plan
+        if self._snapshot_task is None:
+            self._snapshot_task = asyncio.create_task(self._publish_snapshots())
+    
+    async def _publish_snapshots(self) -> None:
+        """Background task: publish the latest planned snapshot every ``snapshot_publish_delay_ms``.
+        
+        Writes made meanwhile join the plan, so a burst of them is published
+        once; copying the entries and writing the file happen off the event
+        loop.
+        """
+        try:
+            while self._snapshot_plan is not None:
+                await asyncio.sleep(self.snapshot_publish_delay_ms / 1000)
+                plan, self._snapshot_plan = self._snapshot_plan, None
+                base = self._current_snapshot(plan.base) if plan.base is not None else None
+                if plan.base is not None and base is None:
+                    continue
+                self._snapshot_publishing = plan.generation
+                try:
+                    snapshot = await asyncio.to_thread(self._write_snapshot, plan, base)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Failed to publish snapshot for generation {plan.generation}: {e}")
+                    continue
+                finally:
+                    self._snapshot_publishing = None
+                if snapshot is None:
+                    # Over the size limit; unmap the last one, its file is gone
+                    self._snapshot_overflow = len(self.list_request_ids())
+                    self._snapshot = None
+                elif self._snapshot is None or self._snapshot.generation < snapshot.generation:
+                    self._snapshot_overflow = None
+                    self._snapshot = snapshot
+        finally:
+            self._snapshot_task = None
     
-    async def list_all_requests(self) -> List[Request]:
-        """List all requests."""
-        index = self._read_index()
+    def _write_snapshot(self, plan: SnapshotPlan, base: Optional[Snapshot]) -> Optional[Snapshot]:
+        """Merge a plan into its base and publish it (run in a thread)."""
+        entries: Dict[str, Payload] = {}
+        if base is not None:
+            entries = {
+                request_id: payload for request_id, payload in base.iter_entries() if request_id not in plan.changes
+            }
+        entries.update((request_id, payload) for request_id, payload in plan.changes.items() if payload is not None)
+        return self.snapshots.publish(plan.generation, entries)
+    
+    async def get_request(self, request_id: str) -> Optional[Request]:
+        """Retrieve request by ID (from the hot files, else the archive)."""
+        record, request = await self._load(request_id, self._current_snapshot(self.generation()))
+        if record is None:
+            return None
+        return request if request is not None else self._model(request_id, record)
+    
+    async def get_summary(self, request_id: str) -> Optional[RequestSummary]:
+        """Retrieve a request's summary by ID, without building the full model."""
+        record, _ = await self._load(request_id, self._current_snapshot(self.generation()))
+        return record.summary if record is not None else None
+    
+    def list_request_ids(self) -> List[str]:
+        """List all request IDs from the index."""
+        if self._index_ids is not None:
+            return list(self._index_ids)
+        request_ids = self._read_index()["request_ids"]
+        if self.watched:
+            self._index_ids = list(request_ids)
+        return request_ids
+    
+    async def list_all_requests(self, include_archived: bool = False) -> List[Request]:
+        """List all hot requests, plus archived ones if asked."""
         requests = []
         
-        for request_id in index["request_ids"]:
+        for request_id in self.list_request_ids():
             request = await self.get_request(request_id)
             if request:
                 requests.append(request)
         
+        if include_archived:
+            # A hot copy of an archived request (mid-move) wins
+            hot_ids = {req.id for req in requests}
+            requests.extend(req for req in self.list_archived_requests() if req.id not in hot_ids)
+        
         return requests
     
+    async def list_summaries(self, include_archived: bool = False) -> List[RequestSummary]:
+        """Like :meth:`list_all_requests`, but summaries only: no full model is kept or built for cached records.
+        
+        Reads go through the shared snapshot when it is current; otherwise
+        the files are scanned and a snapshot is published from the result.
+        """
+        generation = self.generation()
+        snapshot = self._current_snapshot(generation)
+        summaries = []
+        for request_id in self.list_request_ids():
+            record, _ = await self._load(request_id, snapshot)
+            if record is not None:
+                summaries.append(record.summary)
+        if snapshot is None and self.snapshots is not None:
+            self._rebuild_snapshot(generation, [summary.id for summary in summaries])
+        
+        if include_archived:
+            hot_ids = {summary.id for summary in summaries}
+            self.archive.sync()
+            for request_id, version, payload in self.archive.iter_payloads():
+                if request_id in hot_ids:
+                    continue
+                cached = self._records.get(request_id)
+                if cached is None or cached.version != version:
+                    self._cache_archived(bytes(payload), version)
+                    cached = self._records[request_id]
+                summaries.append(cached.summary)
+        
+        return summaries
+    
+    def memory_stats(self) -> Dict[str, Any]:
+        """Approximate memory held by the per-request cache, per request and in total.
+        
+        Interned strings are shared by all summaries and not counted, nor is
+        JSON served from the shared snapshot. Full models are only alive
+        while a caller holds them; ``live_models`` counts those.
+        """
+        records = len(self._records)
+        summary_bytes = sum(summary_size(record.summary) for record in self._records.values())
+        raw_bytes = sum(sys.getsizeof(record.raw) for record in self._records.values() if record.raw is not None)
+        return {
+            "records": records,
+            "summary_bytes": summary_bytes,
+            "raw_bytes": raw_bytes,
+            "bytes_per_request": round((summary_bytes + raw_bytes) / records) if records else None,
+            "live_models": len(self._models),
+            # Mapped by every worker on the machine, so not counted per request
+            "snapshot": {
+                "generation": self._snapshot.generation,
+                "records": len(self._snapshot),
+                "bytes": self._snapshot.segment.size
+            } if self._snapshot is not None else None
+        }
+    
+    # ===== Archive tier =====
+    
+    def _load_archived(self, request_id: str) -> Tuple[Optional[CachedRecord], Optional[Request]]:
+        """Load an archived request, cached like hot ones (keyed on its segment's version)."""
+        self.archive.sync()
+        version = self.archive.version(request_id)
+        if version is None:
+            self._forget(request_id)
+            return None, None
+        cached = self._records.get(request_id)
+        if cached is not None and cached.version == version:
+            return cached, None
+        raw = self.archive.read(request_id)
+        if raw is None:
+            return None, None
+        request = self._cache_archived(raw, version)
+        return self._records[request_id], request
+    
+    def _cache_archived(self, raw: bytes, version: Tuple[int, int]) -> Request:
+        # Archived records were validated when first saved
+        request = Request.model_validate_json(raw, context=TRUSTED_CONTEXT)
+        self._cache_record(request, version, raw)
+        return request
+    
+    def list_archived_requests(self) -> List[Request]:
+        """All archived requests, parsing only those not already cached."""
+        self.archive.sync()
+        requests = []
+        for request_id, version, payload in self.archive.iter_payloads():
+            cached = self._records.get(request_id)
+            if cached is not None and cached.version == version:
+                requests.append(self._model(request_id, cached))
+            else:
+                requests.append(self._cache_archived(bytes(payload), version))
+        return requests
+    
+    async def export_payloads(self) -> List[Payload]:
+        """Canonical JSON of every request, hot then archived.
+        
+        Hot records come from the cache and archived ones are passed through
+        as stored; neither is parsed. From uncompressed segments they are
+        views into the mapped file, so exporting the archive copies nothing
+        until the response is written.
+        """
+        hot = await self.list_summaries()
+        payloads: List[Payload] = self.serialize_many(hot)
+        hot_ids = {summary.id for summary in hot}
+        self.archive.sync()
+        payloads.extend(
+            payload for request_id, _, payload in self.archive.iter_payloads() if request_id not in hot_ids
+        )
+        return payloads
+    
+    async def archive_completed(self, completed_before: datetime) -> int:
+        """Move requests completed before a cutoff into monthly archive segments.
+        
+        Records are written to their ``YYYY-MM`` (completion month) segment
+        first and only then removed from the hot files and the index, so a
+        crash leaves a request in both tiers (the hot copy wins), never in
+        neither. Returns the number of requests archived.
+        """
+        async with self.archive.lock():
+            self.archive.refresh()
+            cutoff = as_utc(completed_before)
+            candidates = []
+            for summary in await self.list_summaries():
+                if summary.status == "completed" and summary.completed_at and as_utc(summary.completed_at) < cutoff:
+                    candidates.append((summary, self._records[summary.id]))
+            if not candidates:
+                return 0
+            
+            by_month: Dict[str, Dict[str, bytes]] = {}
+            written = []
+            for summary, record in candidates:
+                raw = self._raw(summary.id, record)
+                # Deleted or unreadable since it was listed: nothing to archive
+                if raw is None:
+                    continue
+                by_month.setdefault(summary.completed_at.strftime("%Y-%m"), {})[summary.id] = raw
+                written.append((summary, record))
+            for month, records in by_month.items():
+                self.archive.add(month, records)
+            
+            archived = set()
+            for summary, record in written:
+                file_path, current = self._locate(summary.id)
+                # Changed by another worker since it was read: keep the hot copy
+                if current == record.version:
+                    file_path.unlink(missing_ok=True)
+                    self._forget(summary.id)
+                    archived.add(summary.id)
+            if not archived:
+                return 0
+            
+            async with self._index_lock:
+                index = self._read_index()
+                index["request_ids"] = [rid for rid in index["request_ids"] if rid not in archived]
+                index["last_updated"] = datetime.now(timezone.utc).isoformat()
+                index["count"] = len(index["request_ids"])
+                await self._write_index(index)
+            self._publish_snapshot(self._bump_generation(), removed=archived)
+        
+        logger.info(f"Archived {len(archived)} completed requests into {len(by_month)} monthly segments")
+        return len(archived)
+    
+    async def run_archiver(self, after_days: int, interval_seconds: int) -> None:
+        """Background task archiving requests completed more than ``after_days`` ago."""
+        while True:
+            try:
+                await self.archive_completed(datetime.now(timezone.utc) - timedelta(days=after_days))
+            except Exception as e:
+                logger.error(f"Archiving failed: {e}")
+            await asyncio.sleep(interval_seconds)
+    
+    # ===== Change watching =====
+    
+    def set_watched(self, watched: bool) -> None:
+        """Trust the caches (a :class:`StorageWatcher` reports changes) or revalidate on every read.
+        
+        Records cached before the watch was up may have missed changes, so
+        turning it on revalidates them once (after reading the generation,
+        so none of the writes it counts is missed).
+        """
+        self.watched = watched
+        self.archive.watched = watched
+        self._generation = self._read_generation() if watched else None
+        self._pending_generation = None
+        self._index_ids = None
+        self._snapshot_missing = None
+        self._unverified = set()
+        self.archive.invalidate()
+        if watched:
+            self._revalidate_records()
+    
+    def _revalidate_records(self) -> None:
+        """Check every cached record against its file again, each on its next read."""
+        self._unverified = set(self._records)
+    
+    def poll(self) -> None:
+        """Catch up with other workers' writes when polling: one stat while nothing changed."""
+        generation = self._read_generation()
+        if generation != self._generation:
+            self._revalidate_records()
+            self.archive.invalidate()
+            self._index_ids = None
+            self._snapshot_missing = None
+            self._generation = generation
+    
+    def invalidate(
+        self,
+        request_ids: Iterable[str] = (),
+        generation: bool = False,
+        archive: bool = False,
+        snapshots: bool = False
+    ) -> None:
+        """Apply one batch of filesystem changes (called by the watcher after every batch or timeout).
+        
+        A changed record is kept if it still matches the file, as after this
+        worker's own writes. A changed generation is read now but only taken
+        on the next call: the value read may count writes whose file events
+        are still queued, and those arrive by the next batch. The index is
+        re-read with the generation, since every index write is followed by
+        a generation bump.
+        """
+        for request_id in request_ids:
+            record = self._records.get(request_id)
+            if record is not None and self._locate(request_id)[1] != record.version:
+                self._forget(request_id)
+        if archive:
+            self.archive.invalidate()
+        if snapshots:
+            self._snapshot_missing = None
+        pending = self._pending_generation
+        if pending is not None and (self._generation is None or pending > self._generation):
+            self._generation = pending
+            self._index_ids = None
+        self._pending_generation = self._read_generation() if generation else None
+    
+    async def run_watcher(self, mode: str = "auto", poll_delay_ms: int = 200) -> None:
+        """Background task keeping the caches coherent from filesystem events."""
+        await StorageWatcher(self, mode, poll_delay_ms).run()
+    
     async def delete_request(self, request_id: str) -> bool:
-        """Delete request file."""
-        file_path = self.requests_dir / f"{request_id}.json"
+        """Delete request file (or archived record)."""
+        self.layout.migrate(request_id)
+        file_path = self.layout.path(request_id)
         
         if not file_path.exists():
-            return False
+            return await self._delete_archived(request_id)
         
         try:
             # Backup before deletion
-            self._backup_request(request_id)
+            if self.backups is not None:
+                request = await self.get_request(request_id)
+                if request is not None:
+                    self.backups.backup(request_id, bytes(self.serialize(request)), event="delete")
             
             # Delete file
             file_path.unlink()
+            self._forget(request_id)
             
             # Update index
-            self._update_index_remove(request_id)
+            await self._update_index_remove(request_id)
+            self._publish_snapshot(self._bump_generation(), removed=[request_id])
+            if self.durability != "none":
+                await asyncio.to_thread(fsync_all, dirs=[file_path.parent, self.data_dir])
             
             logger.info(f"Deleted request {request_id}")
             return True
@@ -168,30 +955,37 @@ class JSONStorage:
             logger.error(f"Failed to delete request {request_id}: {e}")
             return False
     
+    async def _delete_archived(self, request_id: str) -> bool:
+        """Delete a request that only exists in the archive."""
+        record, _ = self._load_archived(request_id)
+        if record is None:
+            return False
+        try:
+            if self.backups is not None:
+                self.backups.backup(request_id, record.raw, event="delete")
+            async with self.archive.lock():
+                self.archive.remove([request_id])
+            self._forget(request_id)
+            self._publish_snapshot(self._bump_generation())
+            logger.info(f"Deleted archived request {request_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete archived request {request_id}: {e}")
+            return False
+    
     async def get_requests_by_status(self, status: str) -> List[Request]:
-        """Get all requests with a specific status."""
-        all_requests = await self.list_all_requests()
-        return [req for req in all_requests if req.status == status]
+        """Get all requests with a specific status (only those are built as full models)."""
+        requests = []
+        for summary in await self.list_summaries():
+            record = self._records.get(summary.id)
+            if summary.status == status and record is not None:
+                requests.append(self._model(summary.id, record))
+        return requests
     
-    async def search_requests(self, query: str) -> List[Request]:
-        """Search requests by query string."""
-        all_requests = await self.list_all_requests()
+    async def search_requests(self, query: str) -> List[RequestSummary]:
+        """Search requests (hot and archived) by query string, matching summaries only."""
         query_lower = query.lower()
-        
-        results = []
-        for req in all_requests:
-            # Search in multiple fields
-            searchable = [
-                req.purpose,
-                req.purpose_reason or "",
-                req.agent_type,
-                *req.agents,
-                req.submitter,
-                req.executor or "",
-                req.notes or ""
-            ]
-            
-            if any(query_lower in str(field).lower() for field in searchable):
-                results.append(req)
-        
-        return results
+        return [
+            summary for summary in await self.list_summaries(include_archived=True)
+            if matches_query(summary, query_lower)
+        ]
@@ -0,0 +1,137 @@
+"""Read-optimized packed segment files: length-prefixed records plus a sorted offset index."""
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterator, Mapping, Optional, Tuple, Union
+
+PACK_MAGIC = b"EVPACK1\n"
+INDEX_MAGIC = b"EVPACKIX"
+
+# Records are compressed one by one, so each stays independently readable
+FLAG_ZLIB = 1
+
+_LENGTH = struct.Struct(">I")
+# Index entry after the NUL-padded key: payload offset, payload length
+_ENTRY = struct.Struct(">QI")
+# Fixed-size trailer: index offset, record count, key width, flags, magic
+_TRAILER = struct.Struct(">QIHH8s")
+
+
+def write_packed_segment(path: Path, records: Mapping[str, bytes], compress: bool = False) -> None:
+    """Write a packed segment atomically (temp file, then rename).
+
+    Layout: magic, then each record as a 4-byte length and its payload in ID
+    order, then one fixed-width index entry per record (the ID NUL-padded to
+    the longest ID, payload offset, payload length), then the trailer. Fixed
+    width entries sorted by ID make a lookup a binary search over the index.
+    """
+    keys = sorted((request_id.encode("utf-8"), request_id) for request_id in records)
+    key_width = max((len(key) for key, _ in keys), default=1)
+    temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    entries = []
+    with open(temp_path, "wb") as f:
+        f.write(PACK_MAGIC)
+        offset = len(PACK_MAGIC)
+        for key, request_id in keys:
+            payload = records[request_id]
+            if compress:
+                payload = zlib.compress(payload)
+            f.write(_LENGTH.pack(len(payload)))
+            f.write(payload)
+            offset += _LENGTH.size
+            entries.append(key.ljust(key_width, b"\0") + _ENTRY.pack(offset, len(payload)))
+            offset += len(payload)
+        f.write(b"".join(entries))
+        f.write(_TRAILER.pack(offset, len(keys), key_width, FLAG_ZLIB if compress else 0, INDEX_MAGIC))
+    os.replace(temp_path, path)
+
+
+class PackedSegment:
+    """A memory-mapped, immutable packed segment.
+
+    Lookups binary-search the index in the mapping and slice the payload out
+    of it, so only the pages touched are read. :meth:`raw` and
+    :meth:`iter_payloads` hand out views into the mapping without copying;
+    the mapping stays alive as long as any view does, even after the file
+    has been replaced or unlinked.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.version = (stat.st_mtime_ns, stat.st_size)
+            if stat.st_size < len(PACK_MAGIC) + _TRAILER.size:
+                raise ValueError(f"Not a packed segment: {self.path}")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = len(self._map)
+        self._view = memoryview(self._map)
+        index_offset, self._count, self._key_width, flags, magic = _TRAILER.unpack_from(
+            self._map, len(self._map) - _TRAILER.size
+        )
+        self._entry_size = self._key_width + _ENTRY.size
+        if (
+            self._map[:len(PACK_MAGIC)] != PACK_MAGIC
+            or magic != INDEX_MAGIC
+            or index_offset + self._count * self._entry_size + _TRAILER.size != len(self._map)
+        ):
+            raise ValueError(f"Not a packed segment: {self.path}")
+        self._index_offset = index_offset
+        self.compressed = bool(flags & FLAG_ZLIB)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, request_id: str) -> bool:
+        return self._find(request_id) is not None
+
+    def _key(self, position: int) -> bytes:
+        start = self._index_offset + position * self._entry_size
+        return self._map[start:start + self._key_width]
+
+    def _entry(self, position: int) -> Tuple[int, int]:
+        return _ENTRY.unpack_from(self._map, self._index_offset + position * self._entry_size + self._key_width)
+
+    def _find(self, request_id: str) -> Optional[int]:
+        key = request_id.encode("utf-8")
+        if len(key) > self._key_width:
+            return None
+        key = key.ljust(self._key_width, b"\0")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self._count and self._key(low) == key else None
+
+    def raw(self, request_id: str) -> Optional[memoryview]:
+        """The stored payload (compressed if the segment is) as a view, or None."""
+        position = self._find(request_id)
+        if position is None:
+            return None
+        offset, length = self._entry(position)
+        return self._view[offset:offset + length]
+
+    def read(self, request_id: str) -> Optional[bytes]:
+        """A record's JSON, decompressed if needed, or None."""
+        payload = self.raw(request_id)
+        if payload is None:
+            return None
+        return zlib.decompress(payload) if self.compressed else bytes(payload)
+
+    def ids(self) -> Iterator[str]:
+        """Record IDs in sorted order."""
+        for position in range(self._count):
+            yield self._key(position).rstrip(b"\0").decode("utf-8")
+
+    def iter_payloads(self) -> Iterator[Tuple[str, Union[bytes, memoryview]]]:
+        """Every (ID, JSON) in ID order: views into the mapping unless compressed."""
+        for position in range(self._count):
+            request_id = self._key(position).rstrip(b"\0").decode("utf-8")
+            offset, length = self._entry(position)
+            payload = self._view[offset:offset + length]
+            yield request_id, zlib.decompress(payload) if self.compressed else payload
@@ -0,0 +1,220 @@
+"""Per-request revision history stored as JSON-patch deltas."""
+import asyncio
+import copy
+import json
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import aiofiles
+from app.utils.json_patch import apply_patch, make_patch
+from app.utils.logger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = get_logger(__name__)
+
+# A full snapshot is stored every N revisions so rebuilding any revision
+# applies at most N - 1 patches
+CHECKPOINT_INTERVAL = 10
+
+# Parsed logs kept in memory, least recently used dropped first
+CACHED_LOGS = 256
+
+# Seconds between attempts to take a log's lock held by another worker
+_LOCK_RETRY = 0.002
+
+
+class _ParsedLog:
+    """A request's parsed revision entries, up to ``size`` bytes of its log."""
+
+    __slots__ = ("size", "entries", "document")
+
+    def __init__(self):
+        self.size = 0
+        self.entries: List[dict] = []
+        # Document as of the last entry
+        self.document: Optional[dict] = None
+
+
+class RevisionStorage:
+    """Append-only revision log per request (``revisions/<request_id>.jsonl``).
+
+    Each line is one revision: metadata plus either a ``checkpoint`` (full
+    document) or a ``patch`` against the previous revision.
+
+    Recording is serialized per request, within a worker by an asyncio lock
+    and between workers by an flock on the log, so revision numbers are
+    never reused. Parsed logs are cached; since they only grow, a changed
+    log is brought up to date by parsing just the appended lines.
+    """
+
+    def __init__(self, revisions_dir: Path):
+        self.revisions_dir = Path(revisions_dir)
+        self.revisions_dir.mkdir(parents=True, exist_ok=True)
+        self._logs: "OrderedDict[str, _ParsedLog]" = OrderedDict()
+        # Per-request locks with the number of coroutines holding or awaiting each
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    def _log_path(self, request_id: str) -> Path:
+        return self.revisions_dir / f"{request_id}.jsonl"
+
+    async def _read_log(self, request_id: str) -> _ParsedLog:
+        """A request's parsed log, reading only what was appended since it was cached."""
+        path = self._log_path(request_id)
+        log = self._logs.get(request_id)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            self._logs.pop(request_id, None)
+            return _ParsedLog()
+        if log is None or size < log.size:
+            log = _ParsedLog()
+        if size > log.size:
+            async with aiofiles.open(path, 'rb') as f:
+                await f.seek(log.size)
+                content = await f.read(size - log.size)
+            # A line still being appended by another worker is left for later
+            complete = content[:content.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    log.entries.append(entry)
+                    log.document = entry["checkpoint"] if "checkpoint" in entry else apply_patch(log.document, entry["patch"])
+            log.size += len(complete)
+        self._logs[request_id] = log
+        self._logs.move_to_end(request_id)
+        while len(self._logs) > CACHED_LOGS:
+            self._logs.popitem(last=False)
+        return log
+
+    async def _read_entries(self, request_id: str) -> List[dict]:
+        """Read all revision entries for a request, oldest first."""
+        return (await self._read_log(request_id)).entries
+
+    @asynccontextmanager
+    async def _locked(self, request_id: str) -> AsyncIterator[None]:
+        """Hold a request's log exclusively, against this worker's coroutines and other workers."""
+        lock, users = self._locks.get(request_id, (asyncio.Lock(), 0))
+        self._locks[request_id] = (lock, users + 1)
+        try:
+            async with lock:
+                fd = os.open(self._log_path(request_id), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    while fcntl is not None:
+                        try:
+                            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                            break
+                        except BlockingIOError:
+                            # Another worker is recording; don't block the event loop
+                            await asyncio.sleep(_LOCK_RETRY)
+                    yield
+                finally:
+                    os.close(fd)
+        finally:
+            lock, users = self._locks[request_id]
+            if users == 1:
+                del self._locks[request_id]
+            else:
+                self._locks[request_id] = (lock, users - 1)
+
+    async def _append(self, request_id: str, entries: List[dict]) -> None:
+        async with aiofiles.open(self._log_path(request_id), 'a') as f:
+            await f.write("".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries))
+
+    @staticmethod
+    def _entry(revision: int, action: str, author: Optional[str]) -> dict:
+        return {
+            "revision": revision,
+            "action": action,
+            "author": author,
+            "recorded_at": datetime.now(timezone.utc).isoformat()
+        }
+
+    async def record(
+        self,
+        request_id: str,
+        action: str,
+        author: Optional[str],
+        before: Optional[dict],
+        after: dict
+    ) -> Optional[int]:
+        """Record a mutation of a request. Returns the new revision number.
+
+        ``before`` is the document prior to the mutation (None on create). If a
+        request has no history yet, ``before`` is stored as a baseline first.
+        The patch is computed against the last recorded document rather than
+        ``before``, so replaying the log always rebuilds what was stored.
+        Failures are logged and return None: the mutation itself is already
+        saved and must not be failed by its history.
+        """
+        try:
+            async with self._locked(request_id):
+                log = await self._read_log(request_id)
+                last: Any = log.document
+                revision = log.entries[-1]["revision"] + 1 if log.entries else 0
+                new_entries = []
+
+                if not log.entries and before is not None:
+                    baseline = self._entry(0, "baseline", None)
+                    baseline["checkpoint"] = before
+                    new_entries.append(baseline)
+                    last, revision = before, 1
+
+                entry = self._entry(revision, action, author)
+                patch = make_patch(last, after) if last is not None else []
+                entry["changed_fields"] = sorted({op["path"].split("/")[1] for op in patch})
+                if before is None or last is None or revision % CHECKPOINT_INTERVAL == 0:
+                    entry["checkpoint"] = after
+                else:
+                    entry["patch"] = patch
+                new_entries.append(entry)
+
+                await self._append(request_id, new_entries)
+                return revision
+        except Exception as e:
+            logger.error(f"Failed to record revision for {request_id}: {e}")
+            return None
+
+    async def list_revisions(self, request_id: str) -> List[dict]:
+        """List revision metadata (without document bodies), oldest first."""
+        return [
+            {
+                "revision": entry["revision"],
+                "action": entry["action"],
+                "author": entry["author"],
+                "recorded_at": entry["recorded_at"],
+                "changed_fields": entry.get("changed_fields", [])
+            }
+            for entry in await self._read_entries(request_id)
+        ]
+
+    async def get_revision(self, request_id: str, revision: int) -> Optional[dict]:
+        """Rebuild a request document as of a revision, or None if it doesn't exist."""
+        log = await self._read_log(request_id)
+        entries = log.entries
+        if not 0 <= revision < len(entries) or entries[revision]["revision"] != revision:
+            return None
+
+        start = revision
+        while "checkpoint" not in entries[start]:
+            start -= 1
+
+        # Copied (apply_patch copies too), so callers can't change the cached log
+        doc = copy.deepcopy(entries[start]["checkpoint"])
+        for entry in entries[start + 1:revision + 1]:
+            doc = apply_patch(doc, entry["patch"])
+
+        entry = entries[revision]
+        return {
+            "revision": revision,
+            "action": entry["action"],
+            "author": entry["author"],
+            "recorded_at": entry["recorded_at"],
+            "request": doc
+        }
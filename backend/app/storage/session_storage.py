@@ -5,17 +5,24 @@ from pathlib import Path
 from typing import Optional, Dict
 from datetime import datetime, timezone
 from app.models.user import Session
+from app.storage.sharding import ShardedLayout
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
 class SessionStorage:
-    """Persistent session storage using JSON files."""
+    """Persistent session storage using JSON files.
+    
+    Session files are hash-sharded (see :class:`ShardedLayout`). Sessions
+    from the old flat layout are still read and cleaned up; they are never
+    rewritten, so they simply expire instead of being migrated.
+    """
     
     def __init__(self, storage_dir: str = "./data/sessions"):
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.layout = ShardedLayout(self.storage_dir)
         self.verifiers_file = self.storage_dir / "verifiers.json"
         
         # Initialize verifiers file if not exists
@@ -75,8 +82,9 @@ class SessionStorage:
     
     async def store_session(self, session_id: str, session: Session) -> None:
         """Store user session."""
-        session_file = self.storage_dir / f"{session_id}.json"
+        session_file = self.layout.path(session_id)
         try:
+            self.layout.ensure_parent(session_file)
             async with aiofiles.open(session_file, 'w') as f:
                 await f.write(session.model_dump_json(indent=2))
             
@@ -87,10 +95,12 @@ class SessionStorage:
     
     async def get_session(self, session_id: str) -> Optional[Session]:
         """Retrieve user session."""
-        session_file = self.storage_dir / f"{session_id}.json"
+        session_file = self.layout.path(session_id)
         
         if not session_file.exists():
-            return None
+            session_file = self.layout.legacy_path(session_id)
+            if not session_file.exists():
+                return None
         
         try:
             async with aiofiles.open(session_file, 'r') as f:
@@ -109,20 +119,19 @@ class SessionStorage:
     
     async def delete_session(self, session_id: str) -> None:
         """Delete user session."""
-        session_file = self.storage_dir / f"{session_id}.json"
-        
-        if session_file.exists():
-            try:
-                session_file.unlink()
-                logger.debug(f"Deleted session {session_id}")
-            except Exception as e:
-                logger.error(f"Failed to delete session: {e}")
+        for session_file in (self.layout.path(session_id), self.layout.legacy_path(session_id)):
+            if session_file.exists():
+                try:
+                    session_file.unlink()
+                    logger.debug(f"Deleted session {session_id}")
+                except Exception as e:
+                    logger.error(f"Failed to delete session: {e}")
     
     async def cleanup_expired(self) -> int:
         """Remove expired sessions. Returns count of deleted sessions."""
         count = 0
         try:
-            for session_file in self.storage_dir.glob("*.json"):
+            for session_file in self.layout.iter_paths():
                 if session_file.name == "verifiers.json":
                     continue
                 
@@ -0,0 +1,74 @@
+"""Hash-sharded file layout for large flat stores."""
+import os
+import zlib
+from pathlib import Path
+from typing import Iterator, Set
+
+# Two levels of one hex digit each: 256 leaf directories. Each stays under
+# ~1000 entries up to a quarter million files, without creating tens of
+# thousands of near-empty directories (which is slow on an SMB share too).
+SHARD_LEVELS = 2
+SHARD_WIDTH = 1
+
+
+def shard_prefix(key: str) -> str:
+    """Relative shard directory of a key, e.g. ``"a/3"``."""
+    digest = f"{zlib.crc32(key.encode('utf-8')):08x}"
+    return "/".join(
+        digest[level * SHARD_WIDTH:(level + 1) * SHARD_WIDTH] for level in range(SHARD_LEVELS)
+    )
+
+
+class ShardedLayout:
+    """Maps keys to ``<root>/<h>/<h>/<key><suffix>``, with the flat layout as fallback.
+
+    Files written before sharding live directly in ``root``. Readers look in
+    the shard first and fall back to the flat path; :meth:`migrate` moves one
+    flat file into its shard. A sharded copy always wins, so a stale flat file
+    left behind by a concurrent write is discarded, never moved over it.
+    """
+
+    def __init__(self, root: Path, suffix: str = ".json"):
+        self.root = root
+        self.suffix = suffix
+        self._created: Set[Path] = set()
+
+    def path(self, key: str) -> Path:
+        return self.root / shard_prefix(key) / f"{key}{self.suffix}"
+
+    def legacy_path(self, key: str) -> Path:
+        return self.root / f"{key}{self.suffix}"
+
+    def ensure_parent(self, path: Path) -> None:
+        """Create a shard directory once per process."""
+        if path.parent not in self._created:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._created.add(path.parent)
+
+    def migrate(self, key: str) -> bool:
+        """Move a key's flat file into its shard. Returns True if one was moved."""
+        legacy = self.legacy_path(key)
+        target = self.path(key)
+        try:
+            if target.exists():
+                legacy.unlink()
+                return False
+            self.ensure_parent(target)
+            os.replace(legacy, target)
+            return True
+        except FileNotFoundError:
+            # No flat file, or another worker migrated it first
+            return False
+
+    def legacy_keys(self) -> Iterator[str]:
+        """Keys still stored in the flat layout."""
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.name.endswith(self.suffix) and entry.is_file():
+                    yield entry.name[:-len(self.suffix)]
+
+    def iter_paths(self) -> Iterator[Path]:
+        """Every stored file, sharded and flat."""
+        pattern = "/".join(["*"] * SHARD_LEVELS) + f"/*{self.suffix}"
+        yield from self.root.glob(pattern)
+        yield from (self.legacy_path(key) for key in self.legacy_keys())
@@ -0,0 +1,168 @@
+"""Shared read snapshot of the hot requests, mapped by every worker on a machine."""
+import json
+import os
+import struct
+import uuid
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+from app.storage.packed_segment import PackedSegment, write_packed_segment
+from app.storage.summary import RequestSummary
+from app.utils.logger import get_logger
+from app.utils.serialization import Payload
+
+logger = get_logger(__name__)
+
+SNAPSHOT_SUFFIX = ".pack"
+
+# Largest snapshot published; /dev/shm is often small (64 MB in a container)
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Entry header: file version (st_mtime_ns, st_size), summary length
+_HEADER = struct.Struct(">qqI")
+
+
+def store_id(data_dir: Path) -> str:
+    """Random ID of a data dir, created on first use.
+
+    Snapshots are tagged with it, so a data dir that is wiped and recreated
+    (and whose generation count starts over) never matches old snapshots.
+    """
+    path = data_dir / "store_id"
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        return path.read_text().strip()
+    value = uuid.uuid4().hex[:16]
+    try:
+        os.write(fd, value.encode())
+    finally:
+        os.close(fd)
+    return value
+
+
+def default_snapshot_dir(data_dir: Path) -> Path:
+    """A directory per data dir in ``/dev/shm`` (RAM-backed) if there is one, else inside the data dir."""
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        digest = f"{zlib.crc32(str(data_dir.resolve()).encode('utf-8')):08x}"
+        return shm / f"evals-{digest}"
+    return data_dir / "snapshot"
+
+
+def encode_entry(version: Tuple[int, int], summary: RequestSummary, raw: Payload) -> bytes:
+    """Snapshot record: header, the summary's fields as JSON, then the request's canonical JSON."""
+    fields = json.dumps(summary.to_fields(), separators=(",", ":")).encode("utf-8")
+    return b"".join((_HEADER.pack(version[0], version[1], len(fields)), fields, raw))
+
+
+class SnapshotEntry(NamedTuple):
+    version: Tuple[int, int]
+    summary: RequestSummary
+    raw: memoryview
+
+
+class Snapshot:
+    """One mapped snapshot: every hot request as of one storage generation."""
+
+    def __init__(self, path: Path, generation: int):
+        self.path = path
+        self.generation = generation
+        self.segment = PackedSegment(path)
+
+    def __len__(self) -> int:
+        return len(self.segment)
+
+    def version(self, request_id: str) -> Optional[Tuple[int, int]]:
+        """File version a request had when the snapshot was taken, or None if it wasn't hot."""
+        payload = self.segment.raw(request_id)
+        if payload is None:
+            return None
+        mtime_ns, size, _ = _HEADER.unpack_from(payload)
+        return (mtime_ns, size)
+
+    def entry(self, request_id: str) -> Optional[SnapshotEntry]:
+        payload = self.segment.raw(request_id)
+        if payload is None:
+            return None
+        mtime_ns, size, fields_length = _HEADER.unpack_from(payload)
+        start = _HEADER.size + fields_length
+        fields = json.loads(bytes(payload[_HEADER.size:start]))
+        return SnapshotEntry((mtime_ns, size), RequestSummary.from_fields(request_id, fields), payload[start:])
+
+    def raw(self, request_id: str, version: Tuple[int, int]) -> Optional[memoryview]:
+        """A request's canonical JSON as a view into the mapping, if the snapshot has this version."""
+        payload = self.segment.raw(request_id)
+        if payload is None:
+            return None
+        mtime_ns, size, fields_length = _HEADER.unpack_from(payload)
+        if (mtime_ns, size) != version:
+            return None
+        return payload[_HEADER.size + fields_length:]
+
+    def iter_entries(self) -> Iterator[Tuple[str, memoryview]]:
+        """Every (request_id, encoded entry), for building the next snapshot."""
+        return self.segment.iter_payloads()
+
+
+class SnapshotStore:
+    """Snapshot files ``snapshot.<store id>.<generation>.pack`` in one directory.
+
+    Published with a rename, so readers only ever map complete files. Older
+    generations are removed on publish; workers still mapping one keep
+    reading it until they move on (on Windows, where mapped files can't be
+    removed, it is retried on a later publish). A snapshot over
+    ``max_bytes`` isn't published at all, and readers use the files.
+    """
+
+    def __init__(self, directory: Path, store_id: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.store_id = store_id
+        self.max_bytes = max_bytes
+
+    def path(self, generation: int) -> Path:
+        return self.directory / f"snapshot.{self.store_id}.{generation}{SNAPSHOT_SUFFIX}"
+
+    def open(self, generation: int) -> Optional[Snapshot]:
+        """Map the snapshot of a generation, or None if it hasn't been published."""
+        path = self.path(generation)
+        try:
+            return Snapshot(path, generation)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to map snapshot {path.name}: {e}")
+            return None
+
+    def publish(self, generation: int, entries: Dict[str, Payload]) -> Optional[Snapshot]:
+        """Write and map the snapshot of a generation, removing older ones.
+
+        Returns None, publishing nothing, if it would be over ``max_bytes``.
+        """
+        size = sum(len(payload) for payload in entries.values())
+        if size > self.max_bytes:
+            logger.warning(
+                f"Snapshot of {len(entries)} requests is {size} bytes, over the {self.max_bytes} byte limit; "
+                "reads use the request files"
+            )
+            self._remove_older(generation + 1)
+            return None
+        path = self.path(generation)
+        write_packed_segment(path, entries)
+        snapshot = Snapshot(path, generation)
+        self._remove_older(generation)
+        return snapshot
+
+    def _remove_older(self, generation: int) -> None:
+        """Remove snapshot files older than ``generation``, and other data dirs' ones."""
+        for other in self.directory.glob(f"snapshot.*{SNAPSHOT_SUFFIX}"):
+            if other != self.path(generation) and not self._is_newer(other, generation):
+                try:
+                    other.unlink()
+                except OSError:
+                    pass
+
+    def _is_newer(self, path: Path, generation: int) -> bool:
+        parts = path.name[:-len(SNAPSHOT_SUFFIX)].split(".")
+        return len(parts) == 3 and parts[1] == self.store_id and parts[2].isdigit() and int(parts[2]) > generation
@@ -0,0 +1,132 @@
+"""Compact per-request summaries for listing, sorting and filtering."""
+import sys
+from datetime import datetime
+from typing import Any, List, Optional, Tuple, Union
+from app.models.request import Priority, Request
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def search_text(request: Request) -> str:
+    """Lowercased searchable fields of a request, NUL-separated so matches can't span fields."""
+    searchable = [
+        request.purpose,
+        request.purpose_reason or "",
+        request.agent_type,
+        *request.agents,
+        request.submitter,
+        request.executor or "",
+        request.notes or ""
+    ]
+    return "\0".join(str(field).lower() for field in searchable)
+
+
+class RequestSummary:
+    """The fields the dashboard lists, sorts and filters on, without the rest of a request.
+
+    Slotted, with the low-cardinality strings (status, purpose, agent type,
+    agent and people names) interned so every summary shares one copy, and
+    priority kept as its enum member. Attribute names match :class:`Request`,
+    so the pending queue and executor load index accept either. Free text
+    is only kept lowercased for search (``search_text``); links and history
+    are only in the full model, built on demand.
+    """
+
+    __slots__ = (
+        "id", "status", "priority", "purpose", "agent_type", "agents",
+        "submitter", "executor", "assigned_to", "submitted_at", "started_at", "completed_at",
+        "search_text"
+    )
+
+    def __init__(
+        self,
+        id: str,
+        status: str,
+        priority: Priority,
+        purpose: str,
+        agent_type: str,
+        agents: Tuple[str, ...],
+        submitter: str,
+        executor: Optional[str],
+        assigned_to: Optional[str],
+        submitted_at: datetime,
+        started_at: Optional[datetime],
+        completed_at: Optional[datetime],
+        search_text: str
+    ):
+        self.id = id
+        self.status = sys.intern(status)
+        self.priority = priority
+        self.purpose = sys.intern(purpose)
+        self.agent_type = sys.intern(agent_type)
+        self.agents = tuple(sys.intern(agent) for agent in agents)
+        self.submitter = sys.intern(submitter)
+        self.executor = _intern(executor)
+        self.assigned_to = _intern(assigned_to)
+        self.submitted_at = submitted_at
+        self.started_at = started_at
+        self.completed_at = completed_at
+        self.search_text = search_text
+
+    @classmethod
+    def from_request(cls, request: Request) -> "RequestSummary":
+        return cls(
+            request.id,
+            request.status,
+            request.priority,
+            request.purpose,
+            request.agent_type,
+            request.agents,
+            request.submitter,
+            request.executor,
+            request.assigned_to,
+            request.submitted_at,
+            request.started_at,
+            request.completed_at,
+            search_text(request)
+        )
+
+    def to_fields(self) -> List[Any]:
+        """JSON-serializable fields (all but the ID), for the shared snapshot."""
+        return [
+            self.status, self.priority.value, self.purpose, self.agent_type, list(self.agents),
+            self.submitter, self.executor, self.assigned_to, _isoformat(self.submitted_at),
+            _isoformat(self.started_at), _isoformat(self.completed_at), self.search_text
+        ]
+
+    @classmethod
+    def from_fields(cls, request_id: str, fields: List[Any]) -> "RequestSummary":
+        """Inverse of :meth:`to_fields`."""
+        (status, priority, purpose, agent_type, agents, submitter, executor, assigned_to,
+         submitted_at, started_at, completed_at, text) = fields
+        return cls(
+            request_id, status, Priority(priority), purpose, agent_type, agents, submitter, executor,
+            assigned_to, _parse_datetime(submitted_at), _parse_datetime(started_at),
+            _parse_datetime(completed_at), text
+        )
+
+    def __repr__(self) -> str:
+        return f"RequestSummary(id={self.id!r}, status={self.status!r}, priority={self.priority.value!r})"
+
+
+# Anything the in-memory indexes can be built from
+RequestLike = Union[Request, RequestSummary]
+
+
+def summary_size(summary: RequestSummary) -> int:
+    """Bytes a summary holds on its own: shared interned strings are not counted."""
+    size = sum(sys.getsizeof(value) for value in (summary, summary.id, summary.agents, summary.search_text))
+    for value in (summary.submitted_at, summary.started_at, summary.completed_at):
+        if value is not None:
+            size += sys.getsizeof(value)
+    return size
@@ -0,0 +1,141 @@
+"""Filesystem-event invalidation of the storage caches."""
+import asyncio
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Set, Tuple
+from app.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from app.storage.json_storage import JSONStorage
+
+logger = get_logger(__name__)
+
+WATCH_MODES = ("auto", "events", "polling", "off")
+
+# Filesystems where inotify misses writes made by other machines
+NETWORK_FILESYSTEMS = {"cifs", "smb3", "smbfs", "nfs", "nfs4", "fuse.sshfs", "9p"}
+
+# Milliseconds to wait for a burst of changes to settle, and the quiet gap ending it
+DEBOUNCE_MS = 50
+STEP_MS = 5
+# Longest wait for a batch, after which an empty one is yielded
+SETTLE_MS = 50
+
+
+def is_network_filesystem(path: Path) -> bool:
+    """Whether a path is on a network mount, from the longest matching entry in /proc/mounts."""
+    try:
+        with open("/proc/mounts") as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return False
+    path = str(path.resolve())
+    best, fs_type = "", ""
+    for mount_point, mount_type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best):
+            best, fs_type = mount_point, mount_type
+    return fs_type in NETWORK_FILESYSTEMS
+
+
+class StorageWatcher:
+    """Pushes changes made by other workers into a :class:`JSONStorage`'s caches.
+
+    With filesystem events (inotify or the platform's equivalent), watches
+    the request files, the archive and snapshot directories and the
+    ``generation`` file in one stream; each change drops only what it
+    touched. Writers change files before bumping the generation, so a
+    reader that sees the new generation must already have dropped the
+    changed records: a changed generation is only taken one batch later
+    (see :meth:`JSONStorage.invalidate`), and batches come at least every
+    ``SETTLE_MS``.
+
+    On network filesystems, events from other machines never arrive, so it
+    polls the generation file instead (see :meth:`JSONStorage.poll`). It
+    does the same when events are unavailable: watchfiles missing, or out
+    of inotify watches.
+
+    Either way, once it runs storage trusts its caches and steady-state
+    reads make no syscalls.
+    """
+
+    def __init__(self, storage: "JSONStorage", mode: str = "auto", poll_delay_ms: int = 200):
+        if mode not in WATCH_MODES:
+            raise ValueError(f"Unknown storage watch mode '{mode}', expected one of {', '.join(WATCH_MODES)}")
+        self.storage = storage
+        self.mode = mode
+        self.poll_delay_ms = poll_delay_ms
+
+    def _paths(self) -> List[Path]:
+        storage = self.storage
+        # Rewritten in place, never replaced, so watching the file itself keeps working
+        fd = os.open(storage.generation_file, os.O_WRONLY | os.O_CREAT, 0o644)
+        os.close(fd)
+        paths = [storage.generation_file, storage.requests_dir, storage.archive.archive_dir]
+        if storage.snapshots is not None:
+            paths.append(storage.snapshots.directory)
+        return [path.resolve() for path in paths]
+
+    def _classify(self, changed: Set[str]) -> Tuple[Set[str], bool, bool, bool]:
+        """Changed paths -> (request IDs, generation changed, archive changed, snapshots changed)."""
+        storage = self.storage
+        generation_file = storage.generation_file.resolve()
+        requests_dir = storage.requests_dir.resolve()
+        archive_dir = storage.archive.archive_dir.resolve()
+        request_ids: Set[str] = set()
+        generation = archive = snapshots = False
+        for name in changed:
+            path = Path(name)
+            if path == generation_file:
+                generation = True
+            elif path.suffix == ".json" and requests_dir in path.parents:
+                request_ids.add(path.stem)
+            elif archive_dir in path.parents:
+                archive = True
+            elif path.suffix == ".pack":
+                snapshots = True
+        return request_ids, generation, archive, snapshots
+
+    async def run(self) -> None:
+        """Background task: watch until cancelled."""
+        if self.mode == "off":
+            return
+        polling = self.mode == "polling" or (self.mode == "auto" and is_network_filesystem(self.storage.data_dir))
+        try:
+            if not polling:
+                try:
+                    await self._watch_events()
+                    return
+                except (ImportError, OSError) as e:
+                    logger.warning(f"Filesystem events unavailable ({e}), polling storage instead")
+                    self.storage.set_watched(False)
+            await self._poll()
+        except Exception as e:
+            logger.error(f"Storage watcher stopped, caches revalidate on every read: {e}")
+        finally:
+            self.storage.set_watched(False)
+
+    async def _watch_events(self) -> None:
+        from watchfiles import awatch
+
+        # Yields an empty batch on timeout too, which tells us the watch is up
+        async for changes in awatch(
+            *self._paths(),
+            watch_filter=None,
+            debounce=DEBOUNCE_MS,
+            step=STEP_MS,
+            rust_timeout=SETTLE_MS,
+            yield_on_timeout=True
+        ):
+            request_ids, generation, archive, snapshots = self._classify({name for _, name in changes})
+            self.storage.invalidate(request_ids, generation=generation, archive=archive, snapshots=snapshots)
+            if not self.storage.watched:
+                self.storage.set_watched(True)
+                logger.info("Watching storage for changes")
+
+    async def _poll(self) -> None:
+        self.storage.set_watched(True)
+        logger.info(f"Polling storage for changes every {self.poll_delay_ms} ms")
+        while True:
+            await asyncio.sleep(self.poll_delay_ms / 1000)
+            self.storage.poll()
@@ -1,4 +1,5 @@
 """Package initialization for utils."""
 from app.utils.logger import get_logger
+from app.utils.serialization import iter_json_array, iter_ndjson, join_json_array, join_ndjson
 
-__all__ = ["get_logger"]
+__all__ = ["get_logger", "iter_json_array", "iter_ndjson", "join_json_array", "join_ndjson"]
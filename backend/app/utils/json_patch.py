@@ -0,0 +1,77 @@
+"""Minimal JSON Patch (RFC 6902) diff and apply for request documents."""
+import copy
+from typing import Any, Dict, List
+
+JSONPatch = List[Dict[str, Any]]
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> JSONPatch:
+    """Compute add/remove/replace operations that turn ``old`` into ``new``.
+
+    Objects are diffed key by key. Lists that only grew at the end (run links,
+    update history) become ``add`` operations on ``-``; lists of equal length
+    are diffed element-wise; anything else is replaced wholesale.
+    """
+    if old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: JSONPatch = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(make_patch(old[key], value, child))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        if len(new) > len(old) and new[:len(old)] == old:
+            return [{"op": "add", "path": f"{path}/-", "value": item} for item in new[len(old):]]
+        if len(new) == len(old):
+            ops = []
+            for i, (old_item, new_item) in enumerate(zip(old, new, strict=True)):
+                ops.extend(make_patch(old_item, new_item, f"{path}/{i}"))
+            return ops
+
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(doc: Any, patch: JSONPatch) -> Any:
+    """Apply a patch produced by :func:`make_patch`, returning a new document."""
+    doc = copy.deepcopy(doc)
+    for op in patch:
+        if op["path"] == "":
+            doc = copy.deepcopy(op["value"])
+            continue
+
+        *parents, last = [_unescape(token) for token in op["path"].split("/")[1:]]
+        target = doc
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+
+        if isinstance(target, list):
+            if op["op"] == "add":
+                index = len(target) if last == "-" else int(last)
+                target.insert(index, copy.deepcopy(op["value"]))
+            elif op["op"] == "remove":
+                del target[int(last)]
+            else:
+                target[int(last)] = copy.deepcopy(op["value"])
+        else:
+            if op["op"] == "remove":
+                del target[last]
+            else:
+                target[last] = copy.deepcopy(op["value"])
+    return doc
@@ -1,30 +1,149 @@
-"""Structured logging configuration."""
+"""Structured logging configuration.
+
+All application loggers share one ``QueueHandler``: callers only enqueue the
+record, and a background ``QueueListener`` thread does the formatting and the
+blocking write to stdout. Output is JSON (via structlog) by default, with the
+current request ID attached to every record.
+"""
+import atexit
+import copy
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+from contextvars import ContextVar
+from typing import Dict, Optional
+import structlog
 from app.config import settings
 
+# Request ID of the HTTP request being handled (set by middleware in app.main)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_queue_handler: Optional[logging.Handler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request ID to each record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of high-volume INFO/DEBUG records.
+
+    Rates are matched by logger-name prefix (longest wins), e.g.
+    ``{"app.access": 0.1}``. A record may override its rate with
+    ``extra={"sample_rate": 0.01}``. Warnings and errors are never dropped.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = dict(sorted(rates.items(), key=lambda item: len(item[0]), reverse=True))
+
+    def _rate_for(self, record: logging.LogRecord) -> float:
+        rate = getattr(record, "sample_rate", None)
+        if rate is not None:
+            return rate
+        for prefix, prefix_rate in self.rates.items():
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                return prefix_rate
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = self._rate_for(record)
+        return rate >= 1.0 or random.random() < rate
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps extras and exceptions as separate fields."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exception = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+            record.exc_text = None
+        return record
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse ``"logger=rate,logger=rate"`` into a dict."""
+    rates = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, rate = item.split("=", 1)
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+def _build_formatter() -> logging.Formatter:
+    if settings.log_format.lower() == "json":
+        return structlog.stdlib.ProcessorFormatter(
+            foreign_pre_chain=[
+                structlog.stdlib.add_log_level,
+                structlog.stdlib.add_logger_name,
+                structlog.processors.TimeStamper(fmt="iso", utc=True),
+                structlog.stdlib.ExtraAdder(),
+            ],
+            processors=[
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                structlog.processors.JSONRenderer(),
+            ],
+        )
+    return logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+
+def _get_queue_handler() -> logging.Handler:
+    """Create the shared queue handler and start its listener on first use."""
+    global _queue_handler, _listener
+
+    if _queue_handler is None:
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(_build_formatter())
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        handler = StructuredQueueHandler(log_queue)
+        handler.addFilter(RequestContextFilter())
+        handler.addFilter(SamplingFilter(parse_sample_rates(settings.log_sample_rates)))
+
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        _queue_handler = handler
+
+    return _queue_handler
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def get_logger(name: str) -> logging.Logger:
     """Get a configured logger instance."""
     logger = logging.getLogger(name)
-    
+
     if not logger.handlers:
         # Set log level from settings
         log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
         logger.setLevel(log_level)
-        
-        # Create console handler
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(log_level)
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        handler.setFormatter(formatter)
-        
-        # Add handler to logger
-        logger.addHandler(handler)
-    
+
+        # Hand records to the shared non-blocking pipeline
+        logger.addHandler(_get_queue_handler())
+
     return logger
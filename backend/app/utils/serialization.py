@@ -0,0 +1,54 @@
+"""Helpers for building JSON responses from pre-serialized records."""
+from typing import Iterable, Iterator, Union
+
+# Bytes-like JSON documents: cached bytes, or views into a mapped segment
+Payload = Union[bytes, memoryview]
+
+# Target size of the chunks written by the streaming helpers
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def join_json_array(payloads: Iterable[Payload]) -> bytes:
+    """Splice compact JSON documents into a single JSON array."""
+    return b"[" + b",".join(payloads) + b"]"
+
+
+def join_ndjson(payloads: Iterable[Payload]) -> bytes:
+    """Splice compact JSON documents into newline-delimited JSON."""
+    return b"".join(part for payload in payloads for part in (payload, b"\n"))
+
+
+def _chunked(parts: Iterable[Payload], chunk_size: int) -> Iterator[bytes]:
+    """Gather parts into chunks of about ``chunk_size`` bytes, copying each part once."""
+    batch = []
+    size = 0
+    for part in parts:
+        batch.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield b"".join(batch)
+            batch = []
+            size = 0
+    if batch:
+        yield b"".join(batch)
+
+
+def iter_json_array(payloads: Iterable[Payload], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Stream compact JSON documents as one JSON array, in bounded chunks."""
+    def parts() -> Iterator[Payload]:
+        yield b"["
+        for i, payload in enumerate(payloads):
+            if i:
+                yield b","
+            yield payload
+        yield b"]"
+    return _chunked(parts(), chunk_size)
+
+
+def iter_ndjson(payloads: Iterable[Payload], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Stream compact JSON documents as newline-delimited JSON, in bounded chunks."""
+    def parts() -> Iterator[Payload]:
+        for payload in payloads:
+            yield payload
+            yield b"\n"
+    return _chunked(parts(), chunk_size)
@@ -0,0 +1,97 @@
+"""JSON state files shared between workers."""
+import json
+import os
+import tempfile
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import ContextManager, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+@contextmanager
+def locked_directory(directory: Path, blocking: bool = True) -> Iterator[None]:
+    """Hold an exclusive lock on a directory between workers and threads.
+
+    A no-op where flock is unavailable. Locking the directory rather than a
+    file in it leaves no lock files next to the data, and the lock goes away
+    with a crashed holder. The lock is per open file, so it must not be
+    held across an await: another coroutine of the same worker taking it
+    would block the loop. Non-blocking, it raises BlockingIOError while
+    another holder has it, for callers that wait asynchronously.
+    """
+    if fcntl is None:
+        yield
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        yield
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    """Replace a file atomically, through a temp file unique to this writer."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(temp_path)
+        raise
+
+
+class StateFile:
+    """JSON state file shared between workers, reloaded when it changes.
+
+    Writers replace the file atomically from a temp file of their own, so a
+    changed inode, mtime or size tells a worker another one wrote it.
+    Read-modify-write sequences run under :meth:`locked` so concurrent
+    workers don't lose each other's updates.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.version: Optional[Tuple[int, int, int]] = None
+
+    def _current_version(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def exists(self) -> bool:
+        return self._current_version() is not None
+
+    def changed(self) -> bool:
+        """Check whether the file differs from what this worker last read or wrote."""
+        return self._current_version() != self.version
+
+    def locked(self) -> ContextManager[None]:
+        """Hold the lock on the file's directory (see :func:`locked_directory`)."""
+        return locked_directory(self.path.parent)
+
+    def read(self, default: Optional[dict] = None) -> dict:
+        """Read the file, returning ``default`` if it doesn't exist (when given)."""
+        version = self._current_version()
+        if version is None and default is not None:
+            self.version = None
+            return default
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        self.version = version
+        return data
+
+    def write(self, data: dict) -> None:
+        """Write atomically, through a temp file unique to this writer."""
+        write_atomic(self.path, json.dumps(data, separators=(",", ":")).encode())
+        self.version = self._current_version()
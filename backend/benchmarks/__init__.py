@@ -0,0 +1 @@
+"""Benchmarks for storage, services and API routes (not part of the test suite)."""
@@ -0,0 +1,95 @@
+"""Deterministic synthetic request corpus."""
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from app.api.config import CONFIG_DATA
+from app.models.request import Request, RunLink, UpdateEntry
+
+# Rough production mix; keys must exist in CONFIG_DATA
+PURPOSE_WEIGHTS = {"Flight review": 50, "RAI check": 25, "GPT-5 migration": 15, "Ad-hoc": 10}
+AGENT_TYPE_WEIGHTS = {"DA": 70, "FCC": 25, "OAI Apps SDK": 5}
+PRIORITY_WEIGHTS = {"Medium": 60, "High": 25, "Low": 15}
+STATUS_WEIGHTS = {"completed": 70, "in_progress": 15, "pending": 15}
+
+SUBMITTERS = [f"Submitter {i}" for i in range(40)]
+EXECUTORS = [f"Executor {i}" for i in range(6)]
+WORDS = (
+    "agent eval regression latency grounding citation prompt flight rollout "
+    "baseline treatment control metric coverage connector manifest plugin"
+).split()
+
+
+def _agents_for(agent_type: str) -> List[str]:
+    hierarchy = CONFIG_DATA["agent_hierarchy"][agent_type]
+    if isinstance(hierarchy, dict):
+        return [agent for agents in hierarchy.values() for agent in agents]
+    return list(hierarchy)
+
+
+def _pick(rng: random.Random, weights: dict) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def generate_request(rng: random.Random, index: int, now: datetime) -> Request:
+    """Build one realistic request; the same ``rng`` state gives the same request."""
+    agent_type = _pick(rng, AGENT_TYPE_WEIGHTS)
+    purpose = _pick(rng, PURPOSE_WEIGHTS)
+    status = _pick(rng, STATUS_WEIGHTS)
+    candidates = _agents_for(agent_type)
+    submitted_at = now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+
+    fields = {
+        "id": f"req_bench_{index:07d}",
+        "purpose": purpose,
+        "purpose_reason": _sentence(rng, 8) if purpose == "Ad-hoc" else None,
+        "agent_type": agent_type,
+        "agents": rng.sample(candidates, k=min(len(candidates), rng.randint(1, 3))),
+        "query_set": "Others" if rng.random() < 0.1 else "Default",
+        "control_config": rng.choice(CONFIG_DATA["configs"]["control"]),
+        "treatment_config": rng.choice(CONFIG_DATA["configs"]["treatment"]),
+        "notes": _sentence(rng, rng.randint(5, 40)) if rng.random() < 0.7 else None,
+        "priority": _pick(rng, PRIORITY_WEIGHTS),
+        "submitter": rng.choice(SUBMITTERS),
+        "submitted_at": submitted_at,
+        "status": status,
+    }
+    if fields["query_set"] == "Others":
+        fields["query_set_details"] = _sentence(rng, 6)
+
+    if status != "pending":
+        started_at = submitted_at + timedelta(hours=rng.expovariate(1 / 20))
+        fields["executor"] = rng.choice(EXECUTORS)
+        fields["started_at"] = started_at
+        links = [
+            RunLink(
+                url=f"https://evals.example.com/runs/{index}/{n}",
+                notes=_sentence(rng, 4) if rng.random() < 0.3 else None,
+                added_at=started_at
+            )
+            for n in range(rng.randint(1, 4))
+        ]
+        history = []
+        for _ in range(rng.randint(0, 3)):
+            history.append(UpdateEntry(
+                notes=_sentence(rng, 10),
+                updated_by=fields["executor"],
+                updated_at=started_at + timedelta(hours=rng.randint(1, 48)),
+                links_added=rng.randint(0, 1)
+            ))
+        fields["run_links"] = links
+        fields["update_history"] = history
+        if status == "completed":
+            fields["completed_at"] = started_at + timedelta(hours=rng.expovariate(1 / 30))
+
+    return Request(**fields)
+
+
+def generate_corpus(count: int, seed: int = 42, now: Optional[datetime] = None) -> List[Request]:
+    """Generate ``count`` requests; identical for the same seed and ``now``."""
+    rng = random.Random(seed)
+    now = now or datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [generate_request(rng, i, now) for i in range(count)]
@@ -0,0 +1,323 @@
+"""Closed-loop HTTP load test with per-route latency percentiles.
+
+Virtual users repeatedly run weighted portal scenarios (dashboard loads,
+search-as-you-type, modal opens, status transitions, admin exports) with no
+pause between them beyond ``--think-ms``. Usage (from backend/)::
+
+    # In-process ASGI app on a seeded temp data dir
+    python -m benchmarks.load --size 5000 --concurrency 20 --duration 30
+
+    # Real uvicorn workers on a local port
+    python -m benchmarks.load --spawn --workers 4 --concurrency 50
+
+    # An already running server in test-auth mode (TESTING=true), started
+    # from this directory so it shares ./data/sessions
+    python -m benchmarks.load --url http://127.0.0.1:8000
+
+Sessions are created directly in session storage, so the target must run in
+test-auth mode.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Load tests run in test-auth mode; real credentials are never needed
+for _name in ("AZURE_CLIENT_ID", "AZURE_CLIENT_SECRET", "AZURE_TENANT_ID", "SECRET_KEY"):
+    os.environ.setdefault(_name, "loadtest")
+os.environ.setdefault("TESTING", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.storage.json_storage import JSONStorage  # noqa: E402
+from benchmarks.corpus import generate_corpus  # noqa: E402
+
+USER = User(oid="load-user", name="Load User", email="load.user@example.com")
+ADMIN = User(oid="load-admin", name="Load Admin", email="load.admin@example.com", is_admin=True)
+SEARCH_TERMS = ["regression", "github", "flight", "notion", "grounding"]
+CREATE_PAYLOAD = {
+    "purpose": "Flight review",
+    "agent_type": "DA",
+    "agents": ["GitHub"],
+    "query_set": "Default",
+    "control_config": "Current Prod",
+    "treatment_config": "Current Prod",
+    "notes": "Load test request",
+    "priority": "Medium",
+}
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """The q-th quantile of sorted latencies in seconds, in milliseconds."""
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+
+class Recorder:
+    """Collects latency samples per route template.
+
+    Failed calls (transport errors, status >= 400) are counted but kept out
+    of the percentiles, so fast rejections don't make a route look quick.
+    """
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, route: str, seconds: float, ok: bool) -> None:
+        if ok:
+            self.samples[route].append(seconds)
+        else:
+            self.samples.setdefault(route, [])
+            self.errors[route] += 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        routes = {}
+        for route, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+            requests = len(ordered) + self.errors[route]
+            routes[route] = {
+                "requests": requests,
+                "errors": self.errors[route],
+                "rps": round(requests / elapsed, 2),
+                "p50_ms": percentile(ordered, 0.50) if ordered else None,
+                "p95_ms": percentile(ordered, 0.95) if ordered else None,
+                "p99_ms": percentile(ordered, 0.99) if ordered else None,
+            }
+        total = sum(stats["requests"] for stats in routes.values())
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "rps": round(total / elapsed, 2),
+            "routes": routes,
+        }
+
+
+class VirtualUser:
+    """One closed-loop client: runs a scenario, then immediately the next."""
+
+    def __init__(self, user: httpx.AsyncClient, admin: httpx.AsyncClient, ids: List[str],
+                 recorder: Recorder, rng: random.Random):
+        self.user = user
+        self.admin = admin
+        self.ids = ids
+        self.recorder = recorder
+        self.rng = rng
+
+    async def call(self, client: httpx.AsyncClient, method: str, url: str, route: str,
+                   **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(route, time.perf_counter() - start, ok=False)
+            return None
+        self.recorder.record(route, time.perf_counter() - start, ok=response.status_code < 400)
+        return response
+
+    async def dashboard(self) -> None:
+        await self.call(self.user, "GET", "/api/auth/me", "GET /api/auth/me")
+        await self.call(self.user, "GET", "/api/config", "GET /api/config")
+        await self.call(self.user, "GET", "/api/requests", "GET /api/requests")
+
+    async def search_typing(self) -> None:
+        # The dashboard searches on every keystroke from the third character
+        term = self.rng.choice(SEARCH_TERMS)
+        for end in range(3, len(term) + 1):
+            await self.call(self.user, "GET", f"/api/requests/search/{term[:end]}",
+                            "GET /api/requests/search/{query}")
+
+    async def open_modal(self) -> None:
+        request_id = self.rng.choice(self.ids)
+        await self.call(self.user, "GET", f"/api/requests/{request_id}", "GET /api/requests/{id}")
+        await self.call(self.user, "GET", f"/api/requests/{request_id}/revisions",
+                        "GET /api/requests/{id}/revisions")
+
+    async def transition(self) -> None:
+        response = await self.call(self.user, "POST", "/api/requests", "POST /api/requests",
+                                   json=CREATE_PAYLOAD)
+        if response is None or response.status_code >= 400:
+            return
+        request_id = response.json()["id"]
+        self.ids.append(request_id)
+        await self.call(self.user, "POST", f"/api/requests/{request_id}/start",
+                        "POST /api/requests/{id}/start",
+                        json={"run_links": [{"url": f"https://evals.example.com/runs/{request_id}"}]})
+        await self.call(self.user, "POST", f"/api/requests/{request_id}/complete",
+                        "POST /api/requests/{id}/complete")
+
+    async def export(self) -> None:
+        await self.call(self.admin, "GET", "/api/requests/export/json", "GET /api/requests/export/json")
+
+    def scenarios(self) -> List[Tuple[Callable[[], Awaitable[None]], int]]:
+        return [
+            (self.dashboard, 40),
+            (self.open_modal, 25),
+            (self.search_typing, 20),
+            (self.transition, 10),
+            (self.export, 5),
+        ]
+
+    async def run(self, deadline: float, think: float) -> None:
+        scenarios, weights = zip(*self.scenarios(), strict=True)
+        while time.perf_counter() < deadline:
+            await self.rng.choices(scenarios, weights=weights)[0]()
+            if think:
+                await asyncio.sleep(think)
+
+
+async def create_sessions() -> Dict[str, str]:
+    """Create user and admin sessions in (file-based) session storage."""
+    from app.services.auth_service import get_auth_service
+    sessions = {}
+    for role, user in (("user", USER), ("admin", ADMIN)):
+        session_id = f"load-{role}-{secrets.token_hex(8)}"
+        await get_auth_service().create_session(session_id, user)
+        sessions[role] = session_id
+    return sessions
+
+
+async def run_load(base_url: str, transport: Optional[httpx.AsyncBaseTransport],
+                   concurrency: int, duration: float, think_ms: float, seed: int) -> Dict[str, Any]:
+    sessions = await create_sessions()
+    limits = httpx.Limits(max_connections=concurrency * 2)
+    clients = {
+        role: httpx.AsyncClient(base_url=base_url, transport=transport, timeout=60, limits=limits,
+                                cookies={"session_id": session_id})
+        for role, session_id in sessions.items()
+    }
+    try:
+        response = await clients["user"].get("/api/requests")
+        response.raise_for_status()
+        ids = [request["id"] for request in response.json()] or ["req_missing"]
+
+        recorder = Recorder()
+        rng = random.Random(seed)
+        users = [
+            VirtualUser(clients["user"], clients["admin"], ids, recorder, random.Random(rng.random()))
+            for _ in range(concurrency)
+        ]
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(user.run(deadline, think_ms / 1000) for user in users))
+        return recorder.report(time.perf_counter() - start)
+    finally:
+        for client in clients.values():
+            await client.aclose()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_server(data_dir: Path, workers: int, port: int) -> subprocess.Popen:
+    """Start uvicorn workers on ``data_dir`` and wait until /health answers."""
+    # Every virtual user shares two sessions: measure the portal, not the rate limiter
+    env = {
+        **os.environ, "DATA_DIR": str(data_dir), "TESTING": "true", "RELOAD": "false", "ADMISSION_ENABLED": "false"
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server exited during startup")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not become healthy within 60s")
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{'route':<40}{'reqs':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}", file=sys.stderr)
+    for route, stats in report["routes"].items():
+        p50, p95, p99 = (stats[key] if stats[key] is not None else "-" for key in ("p50_ms", "p95_ms", "p99_ms"))
+        print(f"{route:<40}{stats['requests']:>8}{stats['errors']:>6}{stats['rps']:>9}"
+              f"{p50:>9}{p95:>9}{p99:>9}", file=sys.stderr)
+    print(f"total {report['requests']} requests, {report['errors']} errors, "
+          f"{report['rps']} req/s over {report['elapsed_s']}s", file=sys.stderr)
+
+
+async def _seed(data_dir: Path, size: int, seed: int) -> None:
+    corpus = generate_corpus(size, seed=seed)
+    await JSONStorage(data_dir=str(data_dir), backup_enabled=False).save_requests(corpus)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Target an already running server")
+    target.add_argument("--spawn", action="store_true", help="Start uvicorn on a local port")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --spawn")
+    parser.add_argument("--port", type=int, help="Port for --spawn (default: a free port)")
+    parser.add_argument("--size", type=int, default=1000, help="Seeded corpus size (in-process/--spawn)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of load")
+    parser.add_argument("--think-ms", type=float, default=0, help="Pause between scenarios per user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args()
+
+    config = {k: v for k, v in vars(args).items() if k != "output"}
+    with tempfile.TemporaryDirectory(prefix="loadtest_") as tmp:
+        data_dir = Path(tmp)
+        process = None
+        transport = None
+        if args.url:
+            base_url = args.url
+        else:
+            asyncio.run(_seed(data_dir, args.size, args.seed))
+            if args.spawn:
+                port = args.port or _free_port()
+                process = spawn_server(data_dir, args.workers, port)
+                base_url = f"http://127.0.0.1:{port}"
+            else:
+                from app.main import app
+                from app.services.request_service import RequestService, get_request_service
+                settings.data_dir = str(data_dir)
+                settings.admission_enabled = False
+                # Serve the seeded data dir
+                service = RequestService()
+                app.dependency_overrides[get_request_service] = lambda: service
+                transport = httpx.ASGITransport(app=app)
+                base_url = "http://loadtest"
+
+        try:
+            report = asyncio.run(run_load(
+                base_url, transport, args.concurrency, args.duration, args.think_ms, args.seed
+            ))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+
+    report = {"config": config, **report}
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""Storage, service and API benchmarks against a synthetic corpus.
+
+Usage (from backend/)::
+
+    python -m benchmarks.run --sizes 1000,10000 --output results.json
+    python -m benchmarks.run --compare baseline.json results.json
+
+Each size gets a fresh temp data dir seeded with the same deterministic
+corpus, so results from different commits can be compared directly.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+# Benchmarks run in test-auth mode; real credentials are never needed
+for _name in ("AZURE_CLIENT_ID", "AZURE_CLIENT_SECRET", "AZURE_TENANT_ID", "SECRET_KEY"):
+    os.environ.setdefault(_name, "benchmark")
+os.environ.setdefault("TESTING", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.models.request import RequestCreate, RequestUpdate  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.request_service import RequestService  # noqa: E402
+from app.storage.json_storage import JSONStorage  # noqa: E402
+from app.storage.sharding import ShardedLayout  # noqa: E402
+from benchmarks.corpus import generate_corpus, generate_request  # noqa: E402
+
+BENCH_USER = User(oid="bench-oid", name="Bench Admin", email="bench@example.com", is_admin=True)
+SEARCH_TERM = "regression"
+
+Benchmark = Callable[[], Awaitable[Any]]
+
+
+def _stats(samples: List[float]) -> Dict[str, float]:
+    samples_ms = sorted(s * 1000 for s in samples)
+    return {
+        "ops": len(samples_ms),
+        "min_ms": round(samples_ms[0], 3),
+        "median_ms": round(statistics.median(samples_ms), 3),
+        "p95_ms": round(samples_ms[min(len(samples_ms) - 1, int(0.95 * len(samples_ms)))], 3),
+        "mean_ms": round(statistics.fmean(samples_ms), 3),
+    }
+
+
+async def measure(fn: Benchmark, ops: int) -> Dict[str, float]:
+    """Time ``ops`` calls of ``fn`` after one untimed warm-up call."""
+    await fn()
+    samples = []
+    for _ in range(ops):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return _stats(samples)
+
+
+def _create_payload(rng: random.Random, index: int) -> Dict[str, Any]:
+    request = generate_request(rng, index, datetime.now(timezone.utc))
+    return RequestCreate(**request.model_dump(include=set(RequestCreate.model_fields))).model_dump(mode="json")
+
+
+def storage_benchmarks(data_dir: Path, ids: List[str], rng: random.Random) -> Dict[str, Benchmark]:
+    storage = JSONStorage(data_dir=str(data_dir), backup_enabled=False)
+    # As with a storage watcher running: caches are trusted without a stat per read
+    watched = JSONStorage(data_dir=str(data_dir), backup_enabled=False)
+    watched.set_watched(True)
+    counter = iter(range(10**9))
+
+    async def list_cold():
+        return await JSONStorage(data_dir=str(data_dir), backup_enabled=False).list_all_requests()
+
+    async def get():
+        return await storage.get_request(rng.choice(ids))
+
+    async def create():
+        await storage.save_request(generate_request(rng, 10**7 + next(counter), datetime.now(timezone.utc)))
+
+    async def update():
+        request = await storage.get_request(rng.choice(ids))
+        await storage.save_request(request.model_copy(update={"notes": f"bench {next(counter)}"}))
+
+    def concurrent_updates(durability: str) -> Benchmark:
+        """Twenty updates at once, as from concurrent API calls."""
+        writer = JSONStorage(data_dir=str(data_dir), backup_enabled=False, durability=durability)
+
+        async def run():
+            requests = [await writer.get_request(request_id) for request_id in rng.sample(ids, 20)]
+            await asyncio.gather(*(
+                writer.save_request(request.model_copy(update={"notes": f"bench {next(counter)}"}))
+                for request in requests
+            ))
+        return run
+
+    return {
+        "storage.list_all.cold": list_cold,
+        "storage.list_all.warm": storage.list_all_requests,
+        "storage.list_summaries.warm": storage.list_summaries,
+        "storage.list_summaries.watched": watched.list_summaries,
+        "storage.get": get,
+        "storage.get.watched": lambda: watched.get_request(rng.choice(ids)),
+        "storage.search": lambda: storage.search_requests(SEARCH_TERM),
+        "storage.save.create": create,
+        "storage.save.update": update,
+        **{
+            f"storage.save.concurrent.{durability}": concurrent_updates(durability)
+            for durability in ("none", "batched", "per-write")
+        },
+    }
+
+
+def layout_benchmarks(root: Path, size: int, rng: random.Random) -> Dict[str, Benchmark]:
+    """Directory-operation latency with ``size`` files in the flat vs. sharded layout.
+
+    Run against a data dir on the target filesystem (e.g. the SMB mount) to
+    see how stat/create/scan costs grow with the file count.
+    """
+    layouts = {}
+    for name in ("flat", "sharded"):
+        layout = ShardedLayout(root / f"layout_{name}")
+        layout.root.mkdir()
+        path = layout.legacy_path if name == "flat" else layout.path
+        for i in range(size):
+            file_path = path(f"req_{i:08d}")
+            layout.ensure_parent(file_path)
+            file_path.write_bytes(b"{}")
+        layouts[name] = (layout, path)
+
+    benchmarks: Dict[str, Benchmark] = {}
+    counter = iter(range(10**9))
+    for name, (layout, path) in layouts.items():
+        def make(layout=layout, path=path):
+            async def stat():
+                return path(f"req_{rng.randrange(size):08d}").stat()
+
+            async def create_delete():
+                file_path = path(f"new_{next(counter)}")
+                layout.ensure_parent(file_path)
+                file_path.write_bytes(b"{}")
+                file_path.unlink()
+
+            async def scan():
+                return sum(1 for _ in layout.iter_paths())
+
+            return {"stat": stat, "create_delete": create_delete, "scan": scan}
+
+        for op, fn in make().items():
+            benchmarks[f"layout.{name}.{op}"] = fn
+    return benchmarks
+
+
+async def memory_usage(data_dir: Path, size: int) -> List[Dict[str, Any]]:
+    """Heap held per request by a worker that has listed every request (tracemalloc).
+
+    ``memory.summaries`` is the storage cache as kept between requests
+    (summary plus compact JSON); ``memory.full_models`` adds a full model
+    per request on top, as held while all of them are in use.
+    ``memory.shared_snapshot`` is a worker reading through a shared snapshot
+    another worker published, whose JSON is mapped rather than on its heap.
+    """
+    results = []
+    snapshot_dir = data_dir / "snapshot"
+    publisher = JSONStorage(data_dir=str(data_dir), backup_enabled=False, snapshot_dir=str(snapshot_dir))
+    await publisher.list_summaries()
+    await publisher.flush()
+    for name in ("summaries", "full_models", "shared_snapshot"):
+        storage = JSONStorage(
+            data_dir=str(data_dir),
+            backup_enabled=False,
+            snapshot_dir=str(snapshot_dir) if name == "shared_snapshot" else None
+        )
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        held = await (storage.list_all_requests() if name == "full_models" else storage.list_summaries())
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        results.append({"size": size, "name": f"memory.{name}", "bytes_per_request": round(used / len(held))})
+        print(f"[{size}] memory.{name}: {results[-1]['bytes_per_request']} bytes/request", file=sys.stderr)
+        del held
+    return results
+
+
+def service_benchmarks(service: RequestService, ids: List[str], rng: random.Random) -> Dict[str, Benchmark]:
+    counter = iter(range(10**9))
+
+    async def create():
+        return await service.create_request(RequestCreate(**_create_payload(rng, next(counter))), BENCH_USER)
+
+    async def update():
+        return await service.update_request(
+            rng.choice(ids), RequestUpdate(notes=f"bench {next(counter)}"), BENCH_USER
+        )
+
+    return {
+        "service.list_requests": service.list_requests,
+        "service.list_requests.pending": lambda: service.list_requests(status="pending"),
+        "service.search": lambda: service.search_requests(SEARCH_TERM),
+        "service.create_request": create,
+        "service.update_request": update,
+    }
+
+
+def api_benchmarks(client: httpx.AsyncClient, ids: List[str], rng: random.Random) -> Dict[str, Benchmark]:
+    counter = iter(range(10**9))
+    import_batch = [
+        request.model_dump(mode="json") for request in generate_corpus(100, seed=rng.randint(0, 10**6))
+    ]
+
+    async def call(method: str, url: str, **kwargs):
+        response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    return {
+        "api.list": lambda: call("GET", "/api/requests"),
+        "api.get": lambda: call("GET", f"/api/requests/{rng.choice(ids)}"),
+        "api.search": lambda: call("GET", f"/api/requests/search/{SEARCH_TERM}"),
+        "api.create": lambda: call("POST", "/api/requests", json=_create_payload(rng, next(counter))),
+        "api.update": lambda: call(
+            "PUT", f"/api/requests/{rng.choice(ids)}", json={"notes": f"bench {next(counter)}"}
+        ),
+        "api.export_json": lambda: call("GET", "/api/requests/export/json"),
+        "api.import_json_100": lambda: call("POST", "/api/requests/import/json", json=import_batch),
+    }
+
+
+async def run_size(size: int, repeat: int, seed: int, groups: List[str]) -> List[Dict[str, Any]]:
+    """Seed a temp data dir with ``size`` requests and run the selected groups."""
+    results = []
+    with tempfile.TemporaryDirectory(prefix=f"bench_{size}_") as tmp:
+        data_dir = Path(tmp)
+        start = time.perf_counter()
+        corpus = generate_corpus(size, seed=seed)
+        await JSONStorage(data_dir=str(data_dir), backup_enabled=False).save_requests(corpus)
+        print(f"[{size}] seeded in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+        ids = [request.id for request in corpus]
+        rng = random.Random(seed)
+        settings.data_dir = str(data_dir)
+        settings.backup_enabled = False
+        # Measure the handlers, not the rate limiter
+        settings.admission_enabled = False
+
+        benchmarks: Dict[str, Benchmark] = {}
+        if "storage" in groups:
+            benchmarks.update(storage_benchmarks(data_dir, ids, rng))
+        if "service" in groups:
+            benchmarks.update(service_benchmarks(RequestService(), ids, rng))
+        if "layout" in groups:
+            benchmarks.update(layout_benchmarks(data_dir, size, rng))
+
+        client = None
+        if "api" in groups:
+            from app.main import app
+            from app.services.auth_service import get_auth_service
+            from app.services.request_service import get_request_service
+
+            # Serve this size's data dir
+            api_service = RequestService()
+            app.dependency_overrides[get_request_service] = lambda: api_service
+            await get_auth_service().create_session("bench-session", BENCH_USER)
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://bench",
+                cookies={"session_id": "bench-session"}
+            )
+            benchmarks.update(api_benchmarks(client, ids, rng))
+
+        if "memory" in groups:
+            results.extend(await memory_usage(data_dir, size))
+
+        try:
+            for name, fn in benchmarks.items():
+                # Full-corpus scans are timed fewer times than point operations
+                ops = repeat if any(k in name for k in ("list", "search", "export", "import", "scan")) else repeat * 20
+                result = {"size": size, "name": name, **await measure(fn, ops)}
+                print(f"[{size}] {name}: median {result['median_ms']} ms", file=sys.stderr)
+                results.append(result)
+        finally:
+            if client is not None:
+                await client.aclose()
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(baseline_path: str, current_path: str) -> None:
+    """Print median changes between two result files."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    current = json.loads(Path(current_path).read_text())
+    base = {(r["size"], r["name"]): r for r in baseline["results"]}
+
+    print(f"{'benchmark':<34}{'size':>8}{'base ms':>12}{'new ms':>12}{'change':>9}")
+    for result in current["results"]:
+        key = (result["size"], result["name"])
+        if key not in base or "median_ms" not in result:
+            continue
+        old, new = base[key]["median_ms"], result["median_ms"]
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"{result['name']:<34}{result['size']:>8}{old:>12.3f}{new:>12.3f}{change:>+8.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated corpus sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per full-scan benchmark")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--groups", default="storage,service,api,layout,memory", help="Subset of storage,service,api,layout,memory"
+    )
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="Compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    groups = [group.strip() for group in args.groups.split(",")]
+    results = []
+    for size in sizes:
+        results.extend(asyncio.run(run_size(size, args.repeat, args.seed, groups)))
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,36 @@
 import pytest
 import asyncio
 from fastapi.testclient import TestClient
+from app.config import settings
 from app.main import app
+from app.middleware import admission
+from app.services import config_service
 from app.services.auth_service import auth_service
 from app.models.user import User
 
 
+@pytest.fixture(autouse=True)
+def reset_admission_control():
+    """Give each test fresh rate-limit buckets (tests share session IDs)."""
+    admission._admission_controller = None
+    yield
+    admission._admission_controller = None
+
+
+@pytest.fixture(autouse=True)
+def reset_config_service():
+    """Load the portal config from each test's data dir."""
+    config_service._config_service = None
+    yield
+    config_service._config_service = None
+
+
+@pytest.fixture(autouse=True)
+def isolated_snapshot_dir(tmp_path, monkeypatch):
+    """Keep shared snapshots out of /dev/shm during tests."""
+    monkeypatch.setattr(settings, "snapshot_dir", str(tmp_path / "snapshot"))
+
+
 @pytest.fixture
 def client():
     """FastAPI test client."""
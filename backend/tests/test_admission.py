@@ -0,0 +1,82 @@
+"""Tests for admission control."""
+from app.middleware import admission
+from app.middleware.admission import (
+    AdmissionController, TokenBucket, classify, parse_concurrency, parse_rate_limits
+)
+
+
+def test_parse_limits():
+    assert parse_rate_limits("search=10/30, export=0.5") == {"search": (10.0, 30.0), "export": (0.5, 0.5)}
+    assert parse_concurrency("search=16,import=1,") == {"search": 16, "import": 1}
+
+
+def test_classify():
+    assert classify("GET", "/api/requests/search/git") == "search"
+    assert classify("GET", "/api/requests/export/ndjson") == "export"
+    assert classify("POST", "/api/requests/import/json") == "import"
+    assert classify("POST", "/api/requests") == "mutation"
+    assert classify("PUT", "/api/requests/req_1/priority") == "mutation"
+    assert classify("POST", "/api/scheduler/assign") == "mutation"
+    assert classify("GET", "/api/requests") is None
+    assert classify("GET", "/api/config") is None
+
+
+def test_token_bucket_refills():
+    bucket = TokenBucket(rate=2, capacity=2, now=0)
+    assert bucket.take(0) == 0
+    assert bucket.take(0) == 0
+    assert bucket.take(0) == 0.5
+    assert bucket.take(0.5) == 0
+    assert bucket.full(1.5)
+
+
+class TestAdmissionController:
+    """Test rate limiting and concurrency shedding."""
+
+    def test_rate_limit_is_per_caller(self):
+        controller = AdmissionController({"search": (1, 2)}, {})
+        assert controller.admit("search", "alice") == (None, 0.0)
+        assert controller.admit("search", "alice") == (None, 0.0)
+        status_code, retry_after = controller.admit("search", "alice")
+        assert status_code == 429
+        assert 0 < retry_after <= 1
+        # Another user has their own bucket
+        assert controller.admit("search", "bob") == (None, 0.0)
+
+    def test_concurrency_limit_sheds_until_released(self):
+        controller = AdmissionController({}, {"export": 1})
+        assert controller.admit("export", "alice") == (None, 0.0)
+        assert controller.admit("export", "bob") == (503, 1.0)
+        controller.release("export")
+        assert controller.admit("export", "bob") == (None, 0.0)
+
+    def test_metrics(self):
+        controller = AdmissionController({"import": (1, 1)}, {"import": 1})
+        controller.admit("import", "alice")
+        controller.admit("import", "bob")
+        controller.release("import")
+        controller.admit("import", "alice")
+        
+        metrics = controller.metrics()["classes"]["import"]
+        assert metrics["admitted"] == 1
+        assert metrics["shed"] == 1
+        assert metrics["rate_limited"] == 1
+        assert metrics["in_flight"] == 0
+        assert metrics["concurrency_limit"] == 1
+
+
+def test_rate_limit_keys_on_resolved_user(authenticated_client, mock_user):
+    admission._admission_controller = AdmissionController({"search": (0, 1)}, {})
+    assert authenticated_client.get("/api/requests/search/git").status_code == 200
+    assert authenticated_client.get("/api/requests/search/git").status_code == 429
+    assert ("search", f"user:{mock_user.oid}") in admission._admission_controller.buckets
+
+
+def test_made_up_session_cookie_shares_the_address_bucket(client):
+    admission._admission_controller = AdmissionController({"search": (0, 1)}, {})
+    client.cookies.set("session_id", "made-up-1")
+    client.get("/api/requests/search/git")
+    client.cookies.set("session_id", "made-up-2")
+    response = client.get("/api/requests/search/git")
+    assert response.status_code == 429
+    assert list(admission._admission_controller.buckets) == [("search", "ip:testclient")]
@@ -0,0 +1,244 @@
+"""Tests for incrementally maintained analytics."""
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.models.request import Priority
+from app.services.analytics_service import AnalyticsService
+from app.storage.json_storage import JSONStorage
+from app.utils.quantile_sketch import QuantileSketch
+from tests.test_storage import make_request
+
+
+class TestQuantileSketch:
+    """Test the streaming quantile sketch."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Estimates stay within the configured relative error of exact quantiles."""
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(8, 1.5) for _ in range(5000))
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+    def test_round_trip_and_merge(self):
+        """Serialized and merged sketches answer like one sketch over all values."""
+        a, b, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for i in range(100):
+            (a if i % 2 else b).add(i)
+            combined.add(i)
+
+        restored = QuantileSketch.from_dict(a.to_dict())
+        restored.merge(b)
+        assert restored.count == 100
+        assert restored.quantile(0.9) == combined.quantile(0.9)
+
+    def test_empty_sketch(self):
+        """An empty sketch has no quantiles."""
+        assert QuantileSketch().quantile(0.5) is None
+
+
+class TestTurnaroundAnalytics:
+    """Test turnaround sketches maintained from status transitions."""
+
+    @pytest.fixture
+    def analytics(self, tmp_path):
+        return AnalyticsService(JSONStorage(data_dir=str(tmp_path)), tmp_path / "analytics")
+
+    async def test_transitions_update_sketches(self, analytics):
+        """Starting and completing requests feeds wait and execution sketches."""
+        for i, hours in enumerate([1, 2, 4]):
+            pending = make_request(f"req_{i}")
+            started = pending.model_copy(update={
+                "status": "in_progress",
+                "executor": "Exec",
+                "started_at": pending.submitted_at + timedelta(hours=hours),
+            })
+            completed = started.model_copy(update={
+                "status": "completed",
+                "completed_at": started.started_at + timedelta(minutes=30),
+            })
+            await analytics.on_change(None, pending)
+            await analytics.on_change(pending, started)
+            await analytics.on_change(started, completed)
+
+        result = await analytics.get_turnaround()
+        assert result["wait"]["all"]["count"] == 3
+        assert result["wait"]["all"]["p50"] == pytest.approx(7200, rel=0.02)
+        assert result["execution"]["all"]["p99"] == pytest.approx(1800, rel=0.02)
+
+        by_executor = await analytics.get_turnaround("executor")
+        assert by_executor["wait"]["Exec"]["count"] == 3
+
+    async def test_requests_added_already_completed_are_observed(self, analytics):
+        """An imported request adds the intervals it already has, as a rebuild would."""
+        await analytics.get_turnaround()
+        request = make_request()
+        completed = request.model_copy(update={
+            "status": "completed",
+            "executor": "Exec",
+            "started_at": request.submitted_at + timedelta(hours=2),
+            "completed_at": request.submitted_at + timedelta(hours=3),
+        })
+        await analytics.on_change(None, completed)
+        await analytics.on_change(None, make_request("req_pending"))
+
+        result = await analytics.get_turnaround()
+        assert result["wait"]["all"]["count"] == 1
+        assert result["wait"]["all"]["p50"] == pytest.approx(7200, rel=0.02)
+        assert result["execution"]["all"]["p50"] == pytest.approx(3600, rel=0.02)
+
+    async def test_missing_state_is_rebuilt_from_storage(self, analytics):
+        """Without a state file, sketches are rebuilt once from stored requests."""
+        request = make_request()
+        await analytics.storage.save_request(request.model_copy(update={
+            "status": "in_progress",
+            "executor": "Exec",
+            "started_at": request.submitted_at + timedelta(hours=3),
+        }))
+
+        result = await analytics.get_turnaround("priority")
+        assert result["wait"]["Medium"]["count"] == 1
+        assert analytics.turnaround_file.exists()
+
+    async def test_invalid_dimension(self, analytics):
+        """Unknown group-by dimensions are rejected."""
+        with pytest.raises(ValueError):
+            await analytics.get_turnaround("submitter")
+
+
+class TestAggregateCounters:
+    """Test materialized counters maintained on every mutation."""
+
+    @pytest.fixture
+    def analytics(self, tmp_path):
+        return AnalyticsService(JSONStorage(data_dir=str(tmp_path)), tmp_path / "analytics")
+
+    async def test_counts_follow_mutations(self, analytics):
+        """Create, status change, priority change and delete adjust the counters."""
+        first = make_request("req_1", agents=["GitHub", "KYC"])
+        second = make_request("req_2", agents=["GitHub"], priority="High")
+        await analytics.on_change(None, first)
+        await analytics.on_change(None, second)
+
+        started = first.model_copy(update={"status": "in_progress"})
+        await analytics.on_change(first, started)
+        reprioritized = second.model_copy(update={"priority": Priority.LOW})
+        await analytics.on_change(second, reprioritized)
+
+        by_status = await analytics.get_counts(["status"])
+        assert {g["status"]: g["count"] for g in by_status["groups"]} == {"pending": 1, "in_progress": 1}
+        assert by_status["total"] == 2
+
+        by_agent = await analytics.get_counts(["agent"], {"status": "pending"})
+        assert by_agent["groups"] == [{"agent": "GitHub", "count": 1}]
+
+        await analytics.on_change(reprioritized, None)
+        by_priority = await analytics.get_counts(["priority", "status"])
+        assert by_priority["groups"] == [{"priority": "Medium", "status": "in_progress", "count": 1}]
+
+    async def test_rebuild_recovers_from_drift(self, analytics):
+        """A rebuild replaces drifted counters with values derived from storage."""
+        await analytics.storage.save_request(make_request("req_1"))
+        await analytics.get_counts()
+        await analytics.on_change(None, make_request("req_ghost"))
+        assert (await analytics.get_counts())["total"] == 2
+
+        await analytics.rebuild()
+        assert (await analytics.get_counts())["total"] == 1
+
+    async def test_counts_reload_after_other_worker_writes(self, analytics, tmp_path):
+        """Counters written by another worker are picked up on the next query."""
+        await analytics.get_counts()
+        other_worker = AnalyticsService(analytics.storage, tmp_path / "analytics")
+        await other_worker.on_change(None, make_request("req_1"))
+
+        assert (await analytics.get_counts())["total"] == 1
+
+    def test_concurrent_workers_keep_every_update(self, tmp_path):
+        """Workers applying changes at the same time don't overwrite each other's counts."""
+        storage = JSONStorage(data_dir=str(tmp_path))
+
+        def worker(n: int) -> None:
+            service = AnalyticsService(storage, tmp_path / "analytics")
+
+            async def apply() -> None:
+                for i in range(25):
+                    await service.on_change(None, make_request(f"req_{n}_{i}"))
+            asyncio.run(apply())
+
+        asyncio.run(AnalyticsService(storage, tmp_path / "analytics").get_counts())
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(worker, range(4)))
+
+        result = asyncio.run(AnalyticsService(storage, tmp_path / "analytics").get_counts())
+        assert result["total"] == 100
+        assert not list((tmp_path / "analytics").glob("*.tmp"))
+
+
+class TestDailyRollups:
+    """Test per-day throughput rollups."""
+
+    @pytest.fixture
+    def analytics(self, tmp_path):
+        return AnalyticsService(JSONStorage(data_dir=str(tmp_path)), tmp_path / "analytics")
+
+    async def test_lifecycle_events_roll_up_per_day(self, analytics):
+        """Created/started/completed land on their own days and months."""
+        submitted = datetime(2025, 10, 30, 9, 0, tzinfo=timezone.utc)
+        pending = make_request("req_1", submitted_at=submitted, purpose="RAI check")
+        started = pending.model_copy(update={
+            "status": "in_progress",
+            "started_at": submitted + timedelta(days=3),
+        })
+        other = make_request("req_2", submitted_at=submitted, agent_type="FCC")
+        for before, after in ((None, pending), (pending, started), (None, other)):
+            await analytics.storage.save_request(after)
+            await analytics.on_change(before, after)
+
+        created = await analytics.get_timeseries(
+            "created", start=date(2025, 10, 29), end=date(2025, 10, 31)
+        )
+        assert [p["count"] for p in created["points"]] == [0, 2, 0]
+
+        started_series = await analytics.get_timeseries(
+            "started", start=date(2025, 11, 1), end=date(2025, 11, 3), purpose="RAI check"
+        )
+        assert [p["count"] for p in started_series["points"]] == [0, 1, 0]
+        assert sorted(f.name for f in analytics.rollups_dir.iterdir()) == ["2025-10.json", "2025-11.json"]
+
+        weekly = await analytics.get_timeseries(
+            "created", bucket="week", start=date(2025, 10, 27), end=date(2025, 11, 9), agent_type="FCC"
+        )
+        assert weekly["points"] == [
+            {"bucket_start": "2025-10-27", "count": 1},
+            {"bucket_start": "2025-11-03", "count": 0},
+        ]
+
+    async def test_rebuild_matches_incremental(self, analytics):
+        """Rebuilding from storage reproduces incrementally maintained rollups."""
+        submitted = datetime(2025, 11, 3, tzinfo=timezone.utc)
+        request = make_request("req_1", submitted_at=submitted)
+        await analytics.storage.save_request(request)
+        await analytics.on_change(None, request)
+        window = {"start": date(2025, 11, 1), "end": date(2025, 11, 7)}
+        incremental = await analytics.get_timeseries("created", **window)
+
+        await analytics.rebuild_rollups()
+        assert await analytics.get_timeseries("created", **window) == incremental
+
+    async def test_long_ranges_are_rejected(self, analytics):
+        """Ranges past the cap are refused, and empty months aren't cached."""
+        with pytest.raises(ValueError, match="at most"):
+            await analytics.get_timeseries("created", start=date(1, 1, 1), end=date(2025, 11, 1))
+
+        series = await analytics.get_timeseries("created", start=date(2020, 1, 1), end=date(2022, 12, 31))
+        assert len(series["points"]) == 1096
+        assert analytics._rollup_months == {}
@@ -0,0 +1,36 @@
+"""Tests for admission control on API routes."""
+from app.config import settings
+
+
+def test_search_rate_limited_with_retry_after(authenticated_client, monkeypatch):
+    """Test that a search burst beyond the bucket gets 429 with Retry-After."""
+    monkeypatch.setattr(settings, "admission_rate_limits", "search=0.5/2")
+    
+    statuses = [authenticated_client.get("/api/requests/search/git").status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    
+    response = authenticated_client.get("/api/requests/search/gith")
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["Retry-After"]) <= 2
+    
+    # Unclassified routes are not limited
+    assert authenticated_client.get("/api/requests").status_code == 200
+
+
+def test_admission_disabled(authenticated_client, monkeypatch):
+    """Test that nothing is limited when admission control is off."""
+    monkeypatch.setattr(settings, "admission_enabled", False)
+    monkeypatch.setattr(settings, "admission_rate_limits", "search=0.5/1")
+    
+    statuses = [authenticated_client.get("/api/requests/search/git").status_code for _ in range(3)]
+    assert statuses == [200, 200, 200]
+
+
+def test_metrics_report_admission(authenticated_client):
+    """Test that /metrics exports admission counters."""
+    authenticated_client.get("/api/requests/search/git")
+    
+    admission = authenticated_client.get("/metrics").json()["admission"]
+    assert admission["enabled"] is True
+    assert admission["classes"]["search"]["admitted"] == 1
+    assert admission["classes"]["search"]["in_flight"] == 0
@@ -0,0 +1,107 @@
+"""Tests for analytics API endpoints."""
+
+
+def test_turnaround_requires_auth(client):
+    """Test that analytics endpoints require authentication."""
+    response = client.get("/api/analytics/turnaround")
+    assert response.status_code == 401
+
+
+def test_turnaround_after_transitions(authenticated_client, sample_request_data):
+    """Test that started and completed requests show up in turnaround percentiles."""
+    before = authenticated_client.get("/api/analytics/turnaround").json()
+    completed_before = before["execution"].get("all", {}).get("count", 0)
+    
+    request_id = authenticated_client.post("/api/requests", json=sample_request_data).json()["id"]
+    authenticated_client.post(
+        f"/api/requests/{request_id}/start",
+        json={"run_links": [{"url": "https://example.com/run1"}]}
+    )
+    authenticated_client.post(f"/api/requests/{request_id}/complete")
+    
+    response = authenticated_client.get("/api/analytics/turnaround?group_by=priority")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["unit"] == "seconds"
+    assert data["group_by"] == "priority"
+    assert data["wait"]["Medium"]["count"] >= 1
+    
+    overall = authenticated_client.get("/api/analytics/turnaround").json()
+    assert overall["execution"]["all"]["count"] == completed_before + 1
+
+
+def test_turnaround_rejects_unknown_dimension(authenticated_client):
+    """Test that unsupported group-by dimensions are rejected."""
+    response = authenticated_client.get("/api/analytics/turnaround?group_by=submitter")
+    assert response.status_code == 422
+
+
+def test_counts_group_by(authenticated_client, sample_request_data):
+    """Test grouped counts reflect newly created requests."""
+    def pending_count():
+        data = authenticated_client.get("/api/analytics/counts?group_by=status").json()
+        return {g["status"]: g["count"] for g in data["groups"]}.get("pending", 0)
+    
+    before = pending_count()
+    authenticated_client.post("/api/requests", json=sample_request_data)
+    assert pending_count() == before + 1
+    
+    response = authenticated_client.get(
+        "/api/analytics/counts?group_by=agent&group_by=priority&status=pending&agent_type=DA"
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["group_by"] == ["agent", "priority"]
+    assert data["filters"] == {"status": "pending", "agent_type": "DA"}
+    assert any(g["agent"] == "GitHub Mock" and g["priority"] == "Medium" for g in data["groups"])
+
+
+def test_imported_requests_are_counted(admin_client, sample_request_data):
+    """Test that imported requests reach the counters and revision history."""
+    created = admin_client.post("/api/requests", json=sample_request_data).json()
+    total = admin_client.get("/api/analytics/counts").json()["total"]
+    imported = {**created, "id": f"{created['id']}_imported"}
+    
+    response = admin_client.post("/api/requests/import/json", json=[created, imported])
+    assert response.json()["imported"] == 2
+    assert admin_client.get("/api/analytics/counts").json()["total"] == total + 1
+    revisions = admin_client.get(f"/api/requests/{imported['id']}/revisions").json()
+    assert [r["action"] for r in revisions] == ["import"]
+
+
+def test_rebuild_requires_admin(authenticated_client):
+    """Test that rebuilding analytics is admin only."""
+    response = authenticated_client.post("/api/analytics/rebuild")
+    assert response.status_code == 403
+
+
+def test_rebuild_as_admin(admin_client):
+    """Test that admins can rebuild analytics."""
+    response = admin_client.post("/api/analytics/rebuild")
+    assert response.status_code == 200
+
+
+def test_timeseries_counts_created_requests(authenticated_client, sample_request_data):
+    """Test that today's created bucket grows when a request is submitted."""
+    def today_count():
+        data = authenticated_client.get("/api/analytics/timeseries?metric=created").json()
+        return data["points"][-1]["count"]
+    
+    before = today_count()
+    authenticated_client.post("/api/requests", json=sample_request_data)
+    assert today_count() == before + 1
+
+
+def test_timeseries_validates_range(authenticated_client):
+    """Test that inverted ranges and unknown metrics are rejected."""
+    response = authenticated_client.get(
+        "/api/analytics/timeseries?metric=created&start=2025-02-01&end=2025-01-01"
+    )
+    assert response.status_code == 422
+    assert authenticated_client.get("/api/analytics/timeseries?metric=bogus").status_code == 422
+
+
+def test_timeseries_range_is_capped(authenticated_client):
+    """Test that an unbounded time-series range is rejected."""
+    response = authenticated_client.get("/api/analytics/timeseries?metric=created&start=0001-01-01")
+    assert response.status_code == 422
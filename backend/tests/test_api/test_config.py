@@ -0,0 +1,39 @@
+"""Tests for configuration API endpoints."""
+
+
+def test_config_served_with_etag(client):
+    """Test that config responses carry an ETag and revalidate to 304."""
+    response = client.get("/api/config")
+    assert response.status_code == 200
+    assert "agent_hierarchy" in response.json()
+    assert response.headers["Cache-Control"] == "no-cache"
+    etag = response.headers["ETag"]
+    
+    revalidated = client.get("/api/config", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.content == b""
+    
+    assert client.get("/api/config", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_config_section(client):
+    """Test that sections have their own ETag."""
+    response = client.get("/api/config/purposes")
+    assert "Flight review" in response.json()
+    assert response.headers["ETag"] != client.get("/api/config").headers["ETag"]
+    
+    weak = f'W/{response.headers["ETag"]}'
+    assert client.get("/api/config/purposes", headers={"If-None-Match": weak}).status_code == 304
+
+
+def test_list_filtered_by_agent_category(authenticated_client, sample_request_data):
+    """Test filtering requests by agent category."""
+    request_id = authenticated_client.post("/api/requests", json=sample_request_data).json()["id"]
+    
+    ids = [r["id"] for r in authenticated_client.get("/api/requests?agent_category=OpenAPI").json()]
+    assert request_id in ids
+    ids = [r["id"] for r in authenticated_client.get("/api/requests?agent_category=Remote MCP").json()]
+    assert request_id not in ids
+    
+    assert authenticated_client.get("/api/requests?agent_category=Nope").status_code == 422
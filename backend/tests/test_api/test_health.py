@@ -0,0 +1,39 @@
+"""Tests for health and readiness endpoints."""
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import warmup_service
+
+
+def test_health(client):
+    """Test that /health answers regardless of warm-up."""
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+
+def test_not_ready_before_warm_up(client, monkeypatch):
+    """Test that /ready is 503 while warm-up hasn't run."""
+    monkeypatch.setattr(warmup_service, "_warmup_service", None)
+    
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "pending"
+
+
+def test_ready_after_startup_warm_up(monkeypatch):
+    """Test that /ready turns 200 once startup warm-up finishes."""
+    monkeypatch.setattr(warmup_service, "_warmup_service", None)
+    
+    with TestClient(app) as client:
+        deadline = time.time() + 10
+        response = client.get("/ready")
+        while response.status_code == 503 and time.time() < deadline:
+            assert response.json()["status"] in ("pending", "warming")
+            time.sleep(0.05)
+            response = client.get("/ready")
+        
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
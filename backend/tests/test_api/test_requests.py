@@ -310,3 +310,100 @@ def test_update_with_notes_and_links(authenticated_client, sample_request_data):
     assert data["update_history"][0]["notes"] == "Added two more test runs with updated configuration"
     assert data["update_history"][0]["links_added"] == 2
     assert data["update_history"][0]["updated_by"] == "Test User"
+
+
+def test_list_requests_matches_model_serialization(authenticated_client, sample_request_data):
+    """Test that the spliced list response is a valid array of full requests."""
+    create_response = authenticated_client.post("/api/requests", json=sample_request_data)
+    created = create_response.json()
+    
+    response = authenticated_client.get("/api/requests")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    
+    listed = {req["id"]: req for req in response.json()}
+    assert listed[created["id"]] == created
+
+
+def test_request_revisions(authenticated_client, sample_request_data):
+    """Test that mutations are recorded and earlier revisions can be rebuilt."""
+    create_response = authenticated_client.post("/api/requests", json=sample_request_data)
+    request_id = create_response.json()["id"]
+    
+    start_data = {"run_links": [{"url": "https://example.com/run1"}]}
+    authenticated_client.post(f"/api/requests/{request_id}/start", json=start_data)
+    authenticated_client.post(f"/api/requests/{request_id}/complete")
+    
+    response = authenticated_client.get(f"/api/requests/{request_id}/revisions")
+    assert response.status_code == 200
+    revisions = response.json()
+    assert [r["action"] for r in revisions] == ["create", "start", "complete"]
+    assert "status" in revisions[1]["changed_fields"]
+    
+    response = authenticated_client.get(f"/api/requests/{request_id}/revisions/0")
+    assert response.status_code == 200
+    assert response.json()["request"]["status"] == "pending"
+    assert response.json()["request"]["run_links"] == []
+    
+    response = authenticated_client.get(f"/api/requests/{request_id}/revisions/1")
+    assert response.json()["request"]["status"] == "in_progress"
+    
+    assert authenticated_client.get(f"/api/requests/{request_id}/revisions/9").status_code == 404
+    assert authenticated_client.get("/api/requests/nonexistent-id/revisions").status_code == 404
+
+
+def test_queue_position(authenticated_client, sample_request_data):
+    """Test queue position for pending and non-pending requests."""
+    request_id = authenticated_client.post("/api/requests", json=sample_request_data).json()["id"]
+    
+    response = authenticated_client.get(f"/api/requests/{request_id}/queue-position")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["request_id"] == request_id
+    assert 1 <= data["position"] <= data["pending_total"]
+    
+    authenticated_client.post(
+        f"/api/requests/{request_id}/start",
+        json={"run_links": [{"url": "https://example.com/run/1"}]}
+    )
+    assert authenticated_client.get(f"/api/requests/{request_id}/queue-position").status_code == 422
+    assert authenticated_client.get("/api/requests/req_missing/queue-position").status_code == 404
+
+
+def test_scheduler_requires_admin(authenticated_client):
+    """Test that non-admins cannot use the scheduler."""
+    assert authenticated_client.get("/api/scheduler/load").status_code == 403
+    assert authenticated_client.post("/api/scheduler/assign").status_code == 403
+
+
+def test_scheduler_dry_run_and_simulation(admin_client):
+    """Test scheduler dry run and simulation endpoints."""
+    response = admin_client.post("/api/scheduler/assign")
+    assert response.status_code == 200
+    assert response.json()["dry_run"] is True
+    
+    response = admin_client.get("/api/scheduler/simulate?capacity=2")
+    assert response.status_code == 200
+    assert response.json()["capacity"] == 2
+
+
+def test_archived_requests_leave_list_but_stay_exported(admin_client, sample_request_data):
+    """Test that archived requests are still served by ID, search and export."""
+    import asyncio
+    from datetime import datetime, timedelta, timezone
+    from app.services.request_service import get_request_service
+    
+    sample_request_data["notes"] = "Archive me please"
+    request_id = admin_client.post("/api/requests", json=sample_request_data).json()["id"]
+    admin_client.post(f"/api/requests/{request_id}/start", json={"run_links": [{"url": "https://example.com/run"}]})
+    admin_client.post(f"/api/requests/{request_id}/complete")
+    
+    cutoff = datetime.now(timezone.utc) + timedelta(minutes=1)
+    assert asyncio.run(get_request_service().storage.archive_completed(cutoff)) >= 1
+    
+    assert request_id not in [r["id"] for r in admin_client.get("/api/requests").json()]
+    listed = admin_client.get("/api/requests?status_filter=completed&include_archived=true").json()
+    assert request_id in [r["id"] for r in listed]
+    assert admin_client.get(f"/api/requests/{request_id}").json()["status"] == "completed"
+    assert request_id in [r["id"] for r in admin_client.get("/api/requests/search/archive me").json()]
+    assert request_id in [r["id"] for r in admin_client.get("/api/requests/export/json").json()]
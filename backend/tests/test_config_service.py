@@ -0,0 +1,138 @@
+"""Tests for the hot-reloadable portal config."""
+import json
+import os
+
+import pytest
+
+from app.config import settings
+from app.models.request import RequestCreate, RequestUpdate
+from app.models.user import User
+from app.services.config_service import DEFAULT_CONFIG, ConfigService, PortalConfig
+from app.services.request_service import RequestService
+from tests.test_storage import make_request
+
+
+def write_config(path, version, **overrides):
+    path.write_text(json.dumps({"version": version, **DEFAULT_CONFIG, **overrides}))
+    # Make sure the mtime moves even on coarse-grained filesystems
+    os.utime(path, ns=(version * 10**9, version * 10**9))
+
+
+@pytest.fixture
+def no_throttle(monkeypatch):
+    monkeypatch.setattr(settings, "config_check_interval_seconds", 0)
+
+
+def test_lookup_sets():
+    config = PortalConfig(DEFAULT_CONFIG)
+    assert config.agent_types == {"DA", "FCC", "OAI Apps SDK"}
+    assert "GitHub" in config.agents_by_type["DA"]
+    assert config.agents_by_category["Remote MCP"] == {"Monday.com", "Connect", "Sales UAT"}
+    assert config.is_known_agent("FCC", "Notion")
+    assert not config.is_known_agent("FCC", "GitHub")
+
+
+def test_missing_keys_rejected():
+    with pytest.raises(ValueError, match="purposes"):
+        PortalConfig({key: value for key, value in DEFAULT_CONFIG.items() if key != "purposes"})
+
+
+class TestConfigService:
+    """Test seeding and hot reload."""
+
+    def test_defaults_until_file_exists(self, tmp_path, no_throttle):
+        service = ConfigService(str(tmp_path))
+        assert service.get().version == 0
+        
+        service.ensure_file()
+        assert json.loads((tmp_path / "config.json").read_text())["version"] == 1
+        assert service.get().version == 1
+
+    def test_reloads_on_change_and_keeps_last_good(self, tmp_path, no_throttle):
+        path = tmp_path / "config.json"
+        write_config(path, 2)
+        service = ConfigService(str(tmp_path))
+        first = service.get()
+        assert first.version == 2
+        assert service.get() is first  # Unchanged file is not re-parsed
+
+        write_config(path, 3, purposes=["Flight review", "Perf check"])
+        reloaded = service.get()
+        assert reloaded.version == 3
+        assert "Perf check" in reloaded.purposes
+        assert reloaded.etag != first.etag
+
+        path.write_text("{not json")
+        os.utime(path, ns=(4 * 10**9, 4 * 10**9))
+        assert service.get() is reloaded
+
+    @pytest.mark.parametrize("content", [[DEFAULT_CONFIG], {**DEFAULT_CONFIG, "agent_hierarchy": ["GitHub"]}])
+    def test_wrong_shape_keeps_last_good(self, tmp_path, no_throttle, content):
+        path = tmp_path / "config.json"
+        write_config(path, 2)
+        service = ConfigService(str(tmp_path))
+        assert service.get().version == 2
+
+        path.write_text(json.dumps(content))
+        os.utime(path, ns=(3 * 10**9, 3 * 10**9))
+        assert service.get().version == 2
+
+    def test_checks_are_throttled(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "config_check_interval_seconds", 3600)
+        service = ConfigService(str(tmp_path))
+        service.get()
+        write_config(tmp_path / "config.json", 2)
+        assert service.get().version == 0
+
+
+class TestValidationAndFiltering:
+    """Test lookup sets used by RequestService."""
+
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch, no_throttle):
+        monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+        return RequestService()
+
+    async def test_agent_type_must_be_offered(self, service, tmp_path):
+        user = User(oid="oid", name="Config Tester", email="c@example.com")
+        data = RequestCreate(
+            purpose="Flight review", agent_type="OAI Apps SDK", agents=["Others"],
+            query_set="Default", control_config="Current Prod", treatment_config="Current Prod"
+        )
+        request = await service.create_request(data.model_copy(update={"agent_type": "FCC"}), user)
+
+        agent_types = [item for item in DEFAULT_CONFIG["agent_types"] if item["value"] != "OAI Apps SDK"]
+        write_config(tmp_path / "config.json", 2, agent_types=agent_types)
+        with pytest.raises(ValueError, match="not currently offered"):
+            await service.create_request(data, user)
+        with pytest.raises(ValueError, match="not currently offered"):
+            await service.update_request(request.id, RequestUpdate(agent_type="OAI Apps SDK"), user)
+        # Other edits don't re-check the agent type
+        assert await service.update_request(request.id, RequestUpdate(agent_type="FCC", notes="ok"), user)
+
+    async def test_added_values_are_accepted_without_a_restart(self, service, tmp_path):
+        """Purposes and agent types added to the config file are offered on the next check."""
+        user = User(oid="oid", name="Config Tester", email="c@example.com")
+        data = RequestCreate(
+            purpose="Perf check", agent_type="Copilot Studio", agents=["Custom"],
+            query_set="Default", control_config="Current Prod", treatment_config="Current Prod"
+        )
+        with pytest.raises(ValueError, match="Purpose 'Perf check' is not currently offered"):
+            await service.create_request(data, user)
+
+        write_config(
+            tmp_path / "config.json", 2,
+            purposes=[*DEFAULT_CONFIG["purposes"], "Perf check"],
+            agent_types=[*DEFAULT_CONFIG["agent_types"], {"value": "Copilot Studio", "label": "Copilot Studio"}]
+        )
+        request = await service.create_request(data, user)
+        assert (request.purpose, request.agent_type) == ("Perf check", "Copilot Studio")
+
+    def test_filter_by_agent_category(self, service):
+        requests = [
+            make_request("req_openapi", agents=["GitHub", "Custom"]),
+            make_request("req_mcp", agents=["Connect"]),
+        ]
+        assert [r.id for r in service.filter_by_agent_category(requests, "OpenAPI")] == ["req_openapi"]
+        with pytest.raises(ValueError):
+            service.filter_by_agent_category(requests, "Nope")
@@ -0,0 +1,138 @@
+"""Tests for group commit of request writes."""
+import asyncio
+import os
+import threading
+
+import pytest
+
+from app.storage.group_commit import GroupCommitter
+from app.storage.json_storage import JSONStorage
+from tests.test_storage import make_request
+
+
+# Wide enough that every save in a test joins one batch
+WINDOW_MS = 50
+
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    """Count fsync calls."""
+    calls = []
+    real_fsync = os.fsync
+
+    def fsync(fd):
+        calls.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    return calls
+
+
+class TestGroupCommit:
+    """Test batching and durability of concurrent saves."""
+
+    async def test_concurrent_saves_share_one_batch(self, tmp_path, monkeypatch):
+        storage = JSONStorage(data_dir=str(tmp_path), commit_window_ms=WINDOW_MS)
+        index_writes = []
+        write_index = storage._write_index
+        monkeypatch.setattr(storage, "_write_index", lambda data: index_writes.append(data) or write_index(data))
+        generation = storage.generation()
+
+        await asyncio.gather(*(storage.save_request(make_request(f"req_{i}")) for i in range(10)))
+
+        assert storage.commits.batches == 1
+        assert len(index_writes) == 1
+        assert sorted(storage.list_request_ids()) == sorted(f"req_{i}" for i in range(10))
+        assert storage.generation() == generation + 10
+        assert not list(storage.requests_dir.rglob("*.tmp"))
+
+    async def test_two_versions_in_one_batch_stay_consistent(self, tmp_path):
+        storage = JSONStorage(data_dir=str(tmp_path), commit_window_ms=WINDOW_MS)
+        await asyncio.gather(
+            storage.save_request(make_request("req_a", notes="first")),
+            storage.save_request(make_request("req_a", notes="second"))
+        )
+
+        assert storage.commits.batches == 1
+        assert storage.list_request_ids() == ["req_a"]
+        on_disk = await JSONStorage(data_dir=str(tmp_path)).get_request("req_a")
+        assert (await storage.get_request("req_a")).notes == on_disk.notes
+        assert not list(storage.requests_dir.rglob("*.tmp"))
+
+    async def test_per_write_durability_commits_one_by_one(self, tmp_path, fsyncs):
+        storage = JSONStorage(data_dir=str(tmp_path), durability="per-write")
+        fsyncs.clear()
+        await asyncio.gather(*(storage.save_request(make_request(f"req_{i}")) for i in range(3)))
+
+        assert storage.commits.batches == 3
+        assert fsyncs
+
+    async def test_batched_durability_syncs_before_acknowledging(self, tmp_path, fsyncs):
+        storage = JSONStorage(data_dir=str(tmp_path), durability="batched", commit_window_ms=WINDOW_MS)
+        fsyncs.clear()
+        await asyncio.gather(*(storage.save_request(make_request(f"req_{i}")) for i in range(3)))
+
+        # Three record files, the index, and the data and shard directories
+        assert len(fsyncs) >= 5
+
+    async def test_syncs_run_off_the_event_loop(self, tmp_path, monkeypatch):
+        storage = JSONStorage(data_dir=str(tmp_path), durability="batched", commit_window_ms=WINDOW_MS)
+        threads = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: threads.append(threading.current_thread()) or real_fsync(fd))
+
+        await asyncio.gather(*(storage.save_request(make_request(f"req_{i}")) for i in range(3)))
+        assert await storage.delete_request("req_0")
+
+        assert threads
+        assert threading.current_thread() not in threads
+
+    async def test_no_durability_never_syncs(self, tmp_path, fsyncs):
+        storage = JSONStorage(data_dir=str(tmp_path), durability="none")
+        await storage.save_requests([make_request("req_a"), make_request("req_b")])
+        assert fsyncs == []
+
+    def test_unknown_durability_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            JSONStorage(data_dir=str(tmp_path), durability="sometimes")
+
+
+class TestGroupCommitter:
+    """Test the batching primitive on its own."""
+
+    async def test_errors_reach_only_their_submitters(self):
+        async def flush(items):
+            return [ValueError(item) if item == "bad" else None for item in items]
+
+        committer = GroupCommitter(flush)
+        results = await asyncio.gather(
+            committer.submit("good"), committer.submit("bad"), return_exceptions=True
+        )
+        assert results[0] is None
+        assert isinstance(results[1], ValueError)
+
+    async def test_drain_waits_for_queued_items(self):
+        flushed = []
+
+        async def flush(items):
+            await asyncio.sleep(0.01)
+            flushed.extend(items)
+            return [None] * len(items)
+
+        committer = GroupCommitter(flush, window_ms=5)
+        task = asyncio.create_task(committer.submit("a"))
+        await asyncio.sleep(0)
+        await committer.drain()
+
+        assert flushed == ["a"]
+        await task
+
+    async def test_short_result_list_fails_the_whole_batch(self):
+        async def flush(items):
+            return [None]
+
+        committer = GroupCommitter(flush)
+        results = await asyncio.wait_for(asyncio.gather(
+            committer.submit("a"), committer.submit("b"), return_exceptions=True
+        ), timeout=1)
+        assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,46 @@
+"""Import-time budget for the application module.
+
+Every worker and test process imports ``app.main``; it must not build
+services, touch the data dir or pull in msal.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Generous to stay stable on slow CI machines; eager imports of heavy stacks
+# or service construction at import time blow well past it
+IMPORT_BUDGET_SECONDS = 1.5
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print("IMPORT_REPORT " + json.dumps({"seconds": elapsed, "msal": "msal" in sys.modules}))
+"""
+
+
+def test_import_is_cheap_and_side_effect_free(tmp_path):
+    """Importing app.main (outside test mode) stays within budget without side effects."""
+    env = {k: v for k, v in os.environ.items() if k not in ("TESTING", "PYTEST_CURRENT_TEST")}
+    env.update({
+        "AZURE_CLIENT_ID": "x",
+        "AZURE_CLIENT_SECRET": "x",
+        "AZURE_TENANT_ID": "x",
+        "SECRET_KEY": "x",
+        "DATA_DIR": str(tmp_path / "data"),
+        "PYTHONPATH": str(BACKEND_DIR),
+    })
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=tmp_path, env=env, capture_output=True, text=True, check=True
+    )
+    line = next(line for line in result.stdout.splitlines() if line.startswith("IMPORT_REPORT "))
+    report = json.loads(line[len("IMPORT_REPORT "):])
+
+    assert not report["msal"]
+    assert not (tmp_path / "data").exists()
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,71 @@
+"""Tests for the queue-based structured logging pipeline."""
+import json
+import logging
+import random
+
+from app.utils.logger import (
+    RequestContextFilter,
+    SamplingFilter,
+    StructuredQueueHandler,
+    _build_formatter,
+    parse_sample_rates,
+    request_id_var,
+)
+
+
+def make_record(name: str = "app.storage", level: int = logging.INFO, **extra) -> logging.LogRecord:
+    """Build a log record as a logger call would."""
+    record = logging.LogRecord(name, level, __file__, 1, "saved %s", ("req_1",), None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestSamplingFilter:
+    """Test sampling of high-volume records."""
+
+    def test_longest_prefix_wins(self):
+        """The most specific configured prefix decides the rate."""
+        sampler = SamplingFilter({"app": 1.0, "app.access": 0.0})
+        assert sampler.filter(make_record("app.storage"))
+        assert not sampler.filter(make_record("app.access"))
+
+    def test_warnings_are_never_sampled(self):
+        """Records above INFO always pass."""
+        sampler = SamplingFilter({"app": 0.0})
+        assert sampler.filter(make_record(level=logging.WARNING))
+
+    def test_per_record_rate_override(self):
+        """A record's own sample_rate overrides the configured one."""
+        random.seed(1)
+        sampler = SamplingFilter({})
+        kept = sum(sampler.filter(make_record(sample_rate=0.25)) for _ in range(2000))
+        assert 350 < kept < 650
+
+    def test_parse_sample_rates(self):
+        """Settings strings are parsed into prefix/rate pairs."""
+        assert parse_sample_rates("app.access=0.1, app.storage=0.5") == {
+            "app.access": 0.1,
+            "app.storage": 0.5,
+        }
+        assert parse_sample_rates("") == {}
+
+
+class TestStructuredOutput:
+    """Test JSON rendering of queued records."""
+
+    def test_json_record_includes_context_and_extras(self):
+        """Request IDs and extra fields become top-level JSON keys."""
+        token = request_id_var.set("abc123")
+        try:
+            record = make_record(latency_ms=12.5)
+            RequestContextFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+
+        prepared = StructuredQueueHandler(None).prepare(record)
+        output = json.loads(_build_formatter().format(prepared))
+
+        assert output["event"] == "saved req_1"
+        assert output["level"] == "info"
+        assert output["request_id"] == "abc123"
+        assert output["latency_ms"] == 12.5
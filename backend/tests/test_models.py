@@ -202,7 +202,8 @@ class TestExistingDataCompatibility:
         if not data_dir.exists():
             pytest.skip("No data/requests directory found")
         
-        json_files = list(data_dir.glob("*.json"))
+        # Sharded (requests/<h>/<h>/) and not-yet-migrated flat files
+        json_files = list(data_dir.rglob("*.json"))
         
         if not json_files:
             pytest.skip("No existing JSON files to test")
@@ -0,0 +1,77 @@
+"""Tests for the packed segment file format."""
+import pytest
+
+from app.storage.packed_segment import PackedSegment, write_packed_segment
+from app.utils.serialization import iter_json_array, iter_ndjson
+
+
+RECORDS = {f"req_{i:03d}": f'{{"id":"req_{i:03d}","n":{i}}}'.encode() for i in range(50)}
+RECORDS["a-much-longer-request-id"] = b'{"id":"a-much-longer-request-id"}'
+
+
+class TestPackedSegment:
+    """Test lookups, iteration and validation of packed segments."""
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_lookup_by_id(self, tmp_path, compress):
+        path = tmp_path / "2025-10.1.pack"
+        write_packed_segment(path, RECORDS, compress=compress)
+        segment = PackedSegment(path)
+
+        assert len(segment) == len(RECORDS)
+        assert segment.compressed is compress
+        for request_id, payload in RECORDS.items():
+            assert segment.read(request_id) == payload
+        assert segment.read("req_") is None
+        assert segment.read("req_999") is None
+        assert segment.read("a-much-longer-request-id-that-is-wider-than-any-key") is None
+        assert list(segment.ids()) == sorted(RECORDS)
+
+    def test_uncompressed_payloads_are_views(self, tmp_path):
+        path = tmp_path / "2025-10.1.pack"
+        write_packed_segment(path, RECORDS)
+        segment = PackedSegment(path)
+
+        payloads = dict(segment.iter_payloads())
+        assert all(isinstance(payload, memoryview) for payload in payloads.values())
+        assert {request_id: bytes(payload) for request_id, payload in payloads.items()} == RECORDS
+        assert bytes(segment.raw("req_007")) == RECORDS["req_007"]
+
+    def test_views_outlive_the_file(self, tmp_path):
+        path = tmp_path / "2025-10.1.pack"
+        write_packed_segment(path, {"req_a": b'{"id":"req_a"}'})
+        view = PackedSegment(path).raw("req_a")
+        path.unlink()
+        assert bytes(view) == b'{"id":"req_a"}'
+
+    def test_empty_segment(self, tmp_path):
+        path = tmp_path / "2025-10.1.pack"
+        write_packed_segment(path, {})
+        segment = PackedSegment(path)
+        assert len(segment) == 0
+        assert segment.read("req_a") is None
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "2025-10.1.pack"
+        write_packed_segment(path, RECORDS)
+        truncated = tmp_path / "truncated.pack"
+        truncated.write_bytes(path.read_bytes()[:-1])
+        with pytest.raises(ValueError):
+            PackedSegment(truncated)
+        garbage = tmp_path / "garbage.pack"
+        garbage.write_bytes(b"x" * 100)
+        with pytest.raises(ValueError):
+            PackedSegment(garbage)
+
+
+def test_streaming_helpers_chunk_views(tmp_path):
+    """Streamed exports match the joined forms, whatever the chunk size."""
+    path = tmp_path / "2025-10.1.pack"
+    write_packed_segment(path, RECORDS)
+    payloads = [payload for _, payload in PackedSegment(path).iter_payloads()]
+    expected = b"[" + b",".join(bytes(p) for p in payloads) + b"]"
+
+    for chunk_size in (1, 100, 1 << 20):
+        assert b"".join(iter_json_array(payloads, chunk_size)) == expected
+        assert b"".join(iter_ndjson(payloads, chunk_size)) == b"".join(bytes(p) + b"\n" for p in payloads)
+    assert b"".join(iter_json_array([])) == b"[]"
@@ -0,0 +1,121 @@
+"""Tests for the pending request queue."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.models.request import Priority, RequestCreate, RunLink, StartEvaluation
+from app.models.user import User
+from app.services.pending_queue import PendingQueue, dashboard_key, queue_key
+from app.services.request_service import RequestService
+from tests.test_storage import make_request
+
+
+def make_pending(request_id: str, priority: str, minutes: int):
+    submitted = datetime(2025, 11, 21, tzinfo=timezone.utc) + timedelta(minutes=minutes)
+    return make_request(request_id, priority=priority, submitted_at=submitted)
+
+
+class TestPendingQueue:
+    """Test ordering and incremental maintenance."""
+
+    def test_matches_full_sort_through_updates(self):
+        """Incremental updates keep the same order as sorting from scratch."""
+        requests = {
+            "a": make_pending("a", "Low", 1),
+            "b": make_pending("b", "High", 2),
+            "c": make_pending("c", "Medium", 3),
+            "d": make_pending("d", "High", 4),
+        }
+        queue = PendingQueue()
+        queue.rebuild(requests.values())
+        assert queue.ids() == ["b", "d", "c", "a"]
+
+        requests["a"] = requests["a"].model_copy(update={"priority": Priority.HIGH})
+        requests["d"] = requests["d"].model_copy(update={"status": "in_progress"})
+        requests["e"] = make_pending("e", "Medium", 5)
+        for request in (requests["a"], requests["d"], requests["e"]):
+            queue.update(request)
+
+        expected = sorted((r for r in requests.values() if r.status == "pending"), key=queue_key)
+        assert queue.ids() == [r.id for r in expected]
+        assert [queue.position(r.id) for r in expected] == [1, 2, 3, 4]
+        assert queue.position("d") is None
+        dashboard = sorted((r for r in requests.values() if r.status == "pending"), key=dashboard_key)
+        assert queue.dashboard_ids() == [r.id for r in dashboard]
+
+    def test_newer_requests_queue_behind_older_ones(self):
+        """A new submission doesn't push back requests already waiting at its priority."""
+        queue = PendingQueue()
+        queue.rebuild([make_pending("old", "Medium", 1)])
+        queue.update(make_pending("new", "Medium", 2))
+        queue.update(make_pending("urgent", "High", 3))
+
+        assert [queue.position(request_id) for request_id in ("urgent", "old", "new")] == [1, 2, 3]
+        assert queue.dashboard_ids() == ["urgent", "new", "old"]
+
+
+class TestQueueService:
+    """Test the queue as maintained by RequestService."""
+
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+        return RequestService()
+
+    @pytest.fixture
+    def user(self):
+        return User(oid="oid", name="Queue Tester", email="q@example.com")
+
+    async def create(self, service, user, priority="Medium"):
+        data = RequestCreate(
+            purpose="Flight review",
+            agent_type="DA",
+            agents=["GitHub"],
+            query_set="Default",
+            control_config="Current Prod",
+            treatment_config="Current Prod",
+            priority=priority,
+        )
+        return await service.create_request(data, user)
+
+    async def test_position_and_eta(self, service, user):
+        """Position follows priority changes; ETA needs recent starts."""
+        medium = await self.create(service, user, "Medium")
+        high = await self.create(service, user, "High")
+
+        position = await service.get_queue_position(medium.id)
+        assert (position.position, position.pending_total) == (2, 2)
+        assert position.estimated_start_at is None
+
+        await service.update_priority(high.id, Priority.LOW, user)
+        assert (await service.get_queue_position(medium.id)).position == 1
+
+        await service.start_evaluation(high.id, StartEvaluation(run_links=[RunLink(url="https://example.com/run/1")]), user)
+        position = await service.get_queue_position(medium.id)
+        assert (position.position, position.pending_total) == (1, 1)
+        assert position.throughput_per_day > 0
+        assert position.estimated_start_at > datetime.now(timezone.utc)
+
+        with pytest.raises(ValueError):
+            await service.get_queue_position(high.id)
+
+    async def test_rebuilds_after_write_by_another_worker(self, service, user):
+        """Writes made through another service instance are picked up."""
+        first = await self.create(service, user)
+        assert (await service.get_queue_position(first.id)).pending_total == 1
+
+        other_worker = RequestService()
+        second = await self.create(other_worker, user, "High")
+
+        assert [r.id for r in await service.list_requests(status="pending")] == [second.id, first.id]
+
+    async def test_concurrent_creates_share_a_commit(self, service, user):
+        """Creates committed in one batch all reach the queue."""
+        service.storage.commits.window_ms = 50
+        await service.get_pending_queue()
+        created = await asyncio.gather(*(self.create(service, user) for _ in range(3)))
+
+        assert service.storage.commits.batches == 1
+        assert sorted((await service.get_pending_queue()).ids()) == sorted(r.id for r in created)
@@ -0,0 +1,88 @@
+"""Tests for delta-encoded request revision history."""
+import asyncio
+
+import pytest
+
+from app.storage import revision_storage
+from app.storage.revision_storage import RevisionStorage
+from app.utils.json_patch import apply_patch, make_patch
+
+
+class TestJSONPatch:
+    """Test JSON patch diff/apply round trips."""
+
+    @pytest.mark.parametrize("old,new", [
+        ({"a": 1, "b": [1, 2]}, {"a": 2, "b": [1, 2, 3], "c": None}),
+        ({"links": [{"url": "x"}]}, {"links": [{"url": "y", "notes": "n"}]}),
+        ({"a/b": {"~k": 1}}, {"a/b": {}}),
+        ({"list": [1, 2, 3]}, {"list": [3]}),
+    ])
+    def test_round_trip(self, old, new):
+        """Applying the computed patch reproduces the new document."""
+        assert apply_patch(old, make_patch(old, new)) == new
+
+    def test_append_is_encoded_as_add(self):
+        """Appending to a list doesn't resend the existing items."""
+        patch = make_patch({"run_links": [1, 2]}, {"run_links": [1, 2, 3]})
+        assert patch == [{"op": "add", "path": "/run_links/-", "value": 3}]
+
+
+class TestRevisionStorage:
+    """Test revision recording and reconstruction."""
+
+    async def test_rebuild_every_revision_across_checkpoints(self, tmp_path, monkeypatch):
+        """Every revision can be rebuilt, including ones past a checkpoint."""
+        monkeypatch.setattr(revision_storage, "CHECKPOINT_INTERVAL", 3)
+        storage = RevisionStorage(tmp_path)
+
+        docs = [{"status": "pending", "notes": None, "run_links": []}]
+        await storage.record("req_1", "create", "Alice", None, docs[0])
+        for i in range(1, 8):
+            doc = {**docs[-1], "notes": f"edit {i}", "run_links": docs[-1]["run_links"] + [i]}
+            await storage.record("req_1", "update", "Bob", docs[-1], doc)
+            docs.append(doc)
+
+        for i, doc in enumerate(docs):
+            rebuilt = await storage.get_revision("req_1", i)
+            assert rebuilt["request"] == doc
+        assert await storage.get_revision("req_1", len(docs)) is None
+
+        summaries = await storage.list_revisions("req_1")
+        assert [s["action"] for s in summaries] == ["create"] + ["update"] * 7
+        assert summaries[3]["changed_fields"] == ["notes", "run_links"]
+
+    async def test_first_mutation_records_baseline(self, tmp_path):
+        """Requests created before history existed keep their prior state."""
+        storage = RevisionStorage(tmp_path)
+
+        await storage.record("req_1", "priority", "Admin", {"priority": "Low"}, {"priority": "High"})
+
+        assert (await storage.get_revision("req_1", 0))["request"] == {"priority": "Low"}
+        assert (await storage.get_revision("req_1", 1))["request"] == {"priority": "High"}
+
+    async def test_concurrent_records_get_distinct_revisions(self, tmp_path):
+        """Interleaved mutations from two workers never reuse a revision number."""
+        workers = [RevisionStorage(tmp_path), RevisionStorage(tmp_path)]
+        await workers[0].record("req_1", "create", "Alice", None, {"notes": None})
+
+        await asyncio.gather(*(
+            workers[i % 2].record("req_1", "update", "Bob", {"notes": None}, {"notes": f"edit {i}"})
+            for i in range(12)
+        ))
+
+        summaries = await workers[1].list_revisions("req_1")
+        assert [s["revision"] for s in summaries] == list(range(13))
+        for i in range(13):
+            assert await workers[0].get_revision("req_1", i) is not None
+
+    async def test_patches_follow_recorded_state(self, tmp_path):
+        """A stale ``before`` still yields a log that replays to the stored documents."""
+        storage = RevisionStorage(tmp_path)
+        await storage.record("req_1", "create", "Alice", None, {"status": "pending", "notes": None})
+        await storage.record("req_1", "update", "Bob", {"status": "pending", "notes": None},
+                             {"status": "pending", "notes": "hi"})
+        await storage.record("req_1", "start", "Carol", {"status": "pending", "notes": None},
+                             {"status": "in_progress", "notes": "hi"})
+
+        assert (await storage.get_revision("req_1", 2))["request"] == {"status": "in_progress", "notes": "hi"}
+        assert (await storage.list_revisions("req_1"))[2]["changed_fields"] == ["status"]
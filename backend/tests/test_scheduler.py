@@ -0,0 +1,89 @@
+"""Tests for the capacity-aware scheduler."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.services.request_service import RequestService
+from app.services.scheduler_service import SchedulerService, parse_capacities
+from tests.test_storage import make_request
+
+BASE = datetime(2025, 11, 3, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def scheduler(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "scheduler_capacities", "Alice=2,Bob=1")
+    return SchedulerService(RequestService())
+
+
+async def save(scheduler, request_id, hours=0, **fields):
+    request = make_request(request_id, submitted_at=BASE + timedelta(hours=hours), **fields)
+    await scheduler.requests.storage.save_request(request)
+    return request
+
+
+def test_parse_capacities():
+    assert parse_capacities("Jane Doe=3, John=1,") == {"Jane Doe": 3, "John": 1}
+
+
+class TestAssignment:
+    """Test proposals and assignments."""
+
+    async def test_fills_capacity_by_priority_then_age(self, scheduler):
+        """Highest priority goes first, then oldest; capacity is respected."""
+        await save(scheduler, "busy", status="in_progress", executor="Alice", started_at=BASE)
+        await save(scheduler, "old_low", hours=0, priority="Low")
+        await save(scheduler, "old_medium", hours=1)
+        await save(scheduler, "new_medium", hours=2)
+        await save(scheduler, "high", hours=3, priority="High")
+
+        result = await scheduler.assign(dry_run=True)
+        assert [(p["request_id"], p["executor"]) for p in result["proposals"]] == [
+            ("high", "Alice"), ("old_medium", "Bob")
+        ]
+        assert result["assigned"] == []
+        assert (await scheduler.requests.get_request("high")).assigned_to is None
+
+        await scheduler.assign(dry_run=False)
+        assert (await scheduler.requests.get_request("high")).assigned_to == "Alice"
+        load = {row["executor"]: row for row in await scheduler.get_load()}
+        assert (load["Alice"]["in_progress"], load["Alice"]["assigned"], load["Alice"]["available"]) == (1, 1, 0)
+        assert load["Bob"]["available"] == 0
+        assert (await scheduler.assign(dry_run=True))["proposals"] == []
+
+
+class TestSimulation:
+    """Test the historical replay."""
+
+    async def test_replay_reports_wait_times(self, scheduler):
+        """Requests that idled in the queue start immediately when capacity is free."""
+        for i in range(4):
+            submitted = i * 10
+            await save(
+                scheduler, f"req_{i}", hours=submitted,
+                status="completed", executor="Alice",
+                started_at=BASE + timedelta(hours=submitted + 5),
+                completed_at=BASE + timedelta(hours=submitted + 7),
+            )
+
+        result = await scheduler.simulate(capacity=1)
+        assert result["requests"] == 4
+        assert result["executors"] == ["Alice"]
+        assert result["actual"]["mean_hours"] == 5
+        assert result["simulated"]["mean_hours"] == 0
+        assert result["mean_wait_improvement_pct"] == 100
+
+    async def test_replay_queues_when_slots_are_busy(self, scheduler):
+        """With one slot, a simultaneous arrival waits for the first to finish."""
+        for request_id, priority in (("low", "Low"), ("high", "High")):
+            await save(
+                scheduler, request_id, priority=priority,
+                status="completed", executor="Alice",
+                started_at=BASE, completed_at=BASE + timedelta(hours=2),
+            )
+
+        result = await scheduler.simulate(capacity=1)
+        assert result["simulated"]["mean_hours"] == 1
+        assert result["simulated"]["p90_hours"] == 2
@@ -0,0 +1,81 @@
+"""Tests for the search result cache."""
+import pytest
+
+from app.config import settings
+from app.services.request_service import RequestService
+from app.services.search_cache import SearchCache
+from tests.test_storage import make_request
+
+
+class TestSearchCache:
+    """Test LRU eviction, invalidation and prefix lookup."""
+
+    def test_lru_eviction(self):
+        cache = SearchCache(max_entries=2)
+        cache.get("a", 1)
+        cache.put("a", 1, [])
+        cache.put("b", 1, [])
+        assert cache.get("a", 1) == []
+        cache.put("c", 1, [])  # Evicts "b", the least recently used
+        assert cache.get("b", 1) is None
+        assert cache.get("a", 1) == []
+        assert cache.stats()["entries"] == 2
+
+    def test_generation_change_clears(self):
+        cache = SearchCache()
+        cache.get("git", 1)
+        cache.put("git", 1, [])
+        assert cache.get("git", 2) is None
+        # Results computed for an older generation are not cached
+        cache.put("git", 1, [])
+        assert cache.stats()["entries"] == 0
+
+    def test_narrowing_base_uses_longest_prefix(self):
+        cache = SearchCache()
+        git, gith = [make_request("req_git")], [make_request("req_gith")]
+        cache.get("git", 1)
+        cache.put("git", 1, git)
+        cache.put("gith", 1, gith)
+        assert cache.narrowing_base("github", 1) is gith
+        assert cache.narrowing_base("notion", 1) is None
+
+        stats = cache.stats()
+        assert stats["prefix_hits"] == 1
+        assert stats["misses"] == 1
+
+
+class TestServiceSearchCache:
+    """Test search through RequestService."""
+
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+        return RequestService()
+
+    async def test_prefix_narrowing_and_invalidation(self, service, monkeypatch):
+        await service.storage.save_requests([
+            make_request("req_1", agents=["GitHub"]),
+            make_request("req_2", agents=["GitLab"]),
+            make_request("req_3", agents=["Notion"]),
+        ])
+        scans = 0
+        search = service.storage.search_requests
+
+        async def counting_search(query):
+            nonlocal scans
+            scans += 1
+            return await search(query)
+
+        monkeypatch.setattr(service.storage, "search_requests", counting_search)
+
+        assert {r.id for r in await service.search_requests("git")} == {"req_1", "req_2"}
+        assert [r.id for r in await service.search_requests("GitH")] == ["req_1"]
+        assert [r.id for r in await service.search_requests("gith")] == ["req_1"]
+        assert scans == 1
+        assert service.search_cache.stats()["hits"] == 1
+        assert service.search_cache.stats()["prefix_hits"] == 1
+
+        # A write invalidates cached results
+        await service.storage.save_request(make_request("req_4", agents=["GitHub Mock"]))
+        assert {r.id for r in await service.search_requests("github")} == {"req_1", "req_4"}
+        assert scans == 2
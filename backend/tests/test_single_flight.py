@@ -0,0 +1,89 @@
+"""Tests for single-flight read coalescing."""
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services.request_service import RequestService
+from app.services.single_flight import SingleFlight
+from tests.test_storage import make_request
+
+
+class TestSingleFlight:
+    """Test sharing of in-flight calls."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(flight.do("k", compute) for _ in range(5)))
+        assert results == [1] * 5
+        assert flight.stats() == {"in_flight": 0, "executed": 1, "shared": 4}
+
+        # Finished calls are not cached
+        assert await flight.do("k", compute) == 2
+
+    async def test_exception_reaches_every_caller(self):
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+        assert [type(result) for result in results] == [ValueError, ValueError]
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.create_task(flight.do("k", compute))
+        second = asyncio.create_task(flight.do("k", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "done"
+
+
+class TestServiceCoalescing:
+    """Test that concurrent identical service reads scan storage once."""
+
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+        return RequestService()
+
+    async def test_list_and_search_coalesce_per_generation(self, service, monkeypatch):
+        await service.storage.save_requests([make_request("req_a"), make_request("req_b")])
+        scans = 0
+        list_summaries = service.storage.list_summaries
+
+        async def counting_list_summaries(**kwargs):
+            nonlocal scans
+            scans += 1
+            await asyncio.sleep(0.01)
+            return await list_summaries(**kwargs)
+
+        monkeypatch.setattr(service.storage, "list_summaries", counting_list_summaries)
+
+        results = await asyncio.gather(*(service.list_requests() for _ in range(5)))
+        assert scans == 1
+        assert all([r.id for r in result] == [r.id for r in results[0]] for result in results)
+        # Each caller gets its own list
+        assert results[0] is not results[1]
+
+        await asyncio.gather(service.search_requests("Flight"), service.search_requests("flight"))
+        assert scans == 2
+
+        # A write moves the generation, so later reads start a fresh scan
+        await service.storage.save_request(make_request("req_c"))
+        assert len(await service.list_requests()) == 3
+        assert scans == 3
@@ -0,0 +1,123 @@
+"""Tests for the shared read snapshot."""
+import json
+
+import pytest
+
+from app.storage.json_storage import JSONStorage
+from tests.test_storage import make_request
+
+
+def make_storage(tmp_path) -> JSONStorage:
+    """A worker's storage: every worker on the data dir shares one snapshot dir."""
+    return JSONStorage(data_dir=str(tmp_path / "data"), snapshot_dir=str(tmp_path / "snapshot"))
+
+
+@pytest.fixture
+async def workers(tmp_path):
+    """Two workers on one data dir, with a snapshot published by a first listing."""
+    first, second = make_storage(tmp_path), make_storage(tmp_path)
+    await first.save_requests([make_request("req_a"), make_request("req_b")])
+    await first.list_summaries()
+    await first.flush()
+    return first, second
+
+
+def snapshot_files(tmp_path):
+    return sorted(path.name for path in (tmp_path / "snapshot").glob("snapshot.*.pack"))
+
+
+class TestSharedSnapshot:
+    """Test publishing, patching and reading the shared snapshot."""
+
+    async def test_listing_publishes_snapshot(self, workers, tmp_path):
+        first, _ = workers
+        generation = first.generation()
+        assert snapshot_files(tmp_path) == [f"snapshot.{first.snapshots.store_id}.{generation}.pack"]
+        assert first.memory_stats()["snapshot"]["records"] == 2
+
+    async def test_other_worker_reads_json_from_mapping(self, workers):
+        _, second = workers
+        summaries = await second.list_summaries()
+
+        assert sorted(summary.id for summary in summaries) == ["req_a", "req_b"]
+        assert all(record.raw is None for record in second._records.values())
+        payload = second.serialize(summaries[0])
+        assert isinstance(payload, memoryview)
+        assert json.loads(bytes(payload))["id"] == summaries[0].id
+        request = await second.get_request("req_a")
+        assert request.purpose == "Flight review"
+
+    async def test_write_patches_snapshot_for_other_workers(self, workers, tmp_path):
+        first, second = workers
+        await first.save_request(make_request("req_a", purpose="Ad-hoc"))
+        await first.save_request(make_request("req_c"))
+        assert await first.delete_request("req_b")
+        await first.flush()
+
+        assert len(snapshot_files(tmp_path)) == 1
+        assert second._current_snapshot(second.generation()) is not None
+        summaries = {summary.id: summary for summary in await second.list_summaries()}
+        assert sorted(summaries) == ["req_a", "req_c"]
+        assert summaries["req_a"].purpose == "Ad-hoc"
+        assert (await second.get_request("req_a")).purpose == "Ad-hoc"
+        assert await second.get_request("req_b") is None
+
+    async def test_stale_snapshot_falls_back_to_files(self, workers, tmp_path):
+        first, second = workers
+        # A write whose snapshot never got published (e.g. the worker died)
+        first.snapshots = None
+        await first.save_request(make_request("req_a", purpose="Ad-hoc"))
+
+        assert second._current_snapshot(second.generation()) is None
+        assert (await second.get_request("req_a")).purpose == "Ad-hoc"
+        await second.list_summaries()
+        await second.flush()
+        assert second._current_snapshot(second.generation()) is not None
+        assert len(snapshot_files(tmp_path)) == 1
+
+    async def test_recreated_data_dir_ignores_old_snapshots(self, workers, tmp_path):
+        first, _ = workers
+        old_store_id = first.snapshots.store_id
+        (tmp_path / "data" / "store_id").unlink()
+
+        fresh = make_storage(tmp_path)
+        assert fresh.snapshots.store_id != old_store_id
+        assert fresh._current_snapshot(fresh.generation()) is None
+        await fresh.list_summaries()
+        await fresh.flush()
+        assert snapshot_files(tmp_path) == [f"snapshot.{fresh.snapshots.store_id}.{fresh.generation()}.pack"]
+
+    async def test_burst_of_writes_publishes_once(self, workers, tmp_path, monkeypatch):
+        first, second = workers
+        published = []
+        publish = first.snapshots.publish
+
+        def counting_publish(generation, entries):
+            published.append(generation)
+            return publish(generation, entries)
+
+        monkeypatch.setattr(first.snapshots, "publish", counting_publish)
+
+        for i in range(5):
+            await first.save_request(make_request(f"req_{i}"))
+        assert await first.delete_request("req_a")
+        await first.flush()
+
+        assert published == [first.generation()]
+        assert snapshot_files(tmp_path) == [f"snapshot.{first.snapshots.store_id}.{first.generation()}.pack"]
+        summaries = await second.list_summaries()
+        assert sorted(summary.id for summary in summaries) == ["req_0", "req_1", "req_2", "req_3", "req_4", "req_b"]
+
+    async def test_snapshot_over_size_limit_is_not_published(self, workers, tmp_path):
+        first, second = workers
+        first.snapshots.max_bytes = 1
+        await first.save_request(make_request("req_c"))
+        await first.flush()
+
+        assert snapshot_files(tmp_path) == []
+        assert first._snapshot is None
+        assert (await first.get_request("req_a")).purpose == "Flight review"
+        # Not rebuilt on every listing while it wouldn't fit
+        await first.list_summaries()
+        assert first._snapshot_plan is None
+        assert sorted(summary.id for summary in await second.list_summaries()) == ["req_a", "req_b", "req_c"]
@@ -0,0 +1,459 @@
+"""Tests for the JSON file storage layer."""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.models.request import Priority, Request, RunLink, UpdateEntry
+from app.models.user import Session, User
+from app.storage.json_storage import STORAGE_SCHEMA_VERSION, JSONStorage
+from app.storage.session_storage import SessionStorage
+from app.storage.sharding import shard_prefix
+
+
+def make_request(request_id: str = "req_storage_001", **overrides) -> Request:
+    """Build a minimal valid request for storage tests."""
+    data = {
+        "id": request_id,
+        "purpose": "Flight review",
+        "agent_type": "DA",
+        "agents": ["GitHub"],
+        "query_set": "Default",
+        "control_config": "Current Prod",
+        "treatment_config": "Current Prod",
+        "submitter": "Storage Tester",
+        "submitted_at": datetime(2025, 11, 21, 10, 0, tzinfo=timezone.utc),
+        "status": "pending",
+    }
+    data.update(overrides)
+    return Request(**data)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Storage instance backed by a temporary data directory."""
+    return JSONStorage(data_dir=str(tmp_path))
+
+
+class TestSerializedCache:
+    """Test the per-request canonical bytes cache."""
+
+    async def test_serialize_matches_model_dump(self, storage):
+        """Cached bytes decode to the same document as model_dump(mode='json')."""
+        request = make_request(run_links=[RunLink(url="https://example.com/run")])
+        await storage.save_request(request)
+
+        loaded = await storage.get_request(request.id)
+        assert json.loads(storage.serialize(loaded)) == request.model_dump(mode="json")
+
+    async def test_serialize_reuses_cached_bytes(self, storage):
+        """Repeated serialization of a cached request returns the same bytes object."""
+        await storage.save_request(make_request())
+
+        loaded = await storage.get_request("req_storage_001")
+        assert storage.serialize(loaded) is storage.serialize(loaded)
+
+    async def test_cache_revalidates_on_external_write(self, storage):
+        """A file rewritten by another worker is re-read instead of served stale."""
+        await storage.save_request(make_request())
+        await storage.get_request("req_storage_001")
+
+        file_path = storage.layout.path("req_storage_001")
+        data = json.loads(file_path.read_text())
+        data["notes"] = "Changed elsewhere"
+        file_path.write_text(json.dumps(data))
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        loaded = await storage.get_request("req_storage_001")
+        assert loaded.notes == "Changed elsewhere"
+        assert json.loads(storage.serialize(loaded))["notes"] == "Changed elsewhere"
+
+    async def test_delete_drops_cache_entry(self, storage):
+        """Deleted requests are no longer served from the cache."""
+        await storage.save_request(make_request())
+        await storage.get_request("req_storage_001")
+
+        assert await storage.delete_request("req_storage_001")
+        assert await storage.get_request("req_storage_001") is None
+
+
+
+class TestSummaries:
+    """Test the compact summaries kept in place of full models."""
+
+    async def test_summaries_match_requests(self, storage):
+        """Summaries carry the listed fields with shared strings; no model stays alive."""
+        await storage.save_requests([
+            make_request("req_a", agents=["GitHub"], notes="Check Grounding"),
+            make_request("req_b", agents=["GitHub"], priority=Priority.HIGH),
+        ])
+        reloaded = JSONStorage(data_dir=str(storage.data_dir))
+
+        summaries = await reloaded.list_summaries()
+
+        assert [s.id for s in summaries] == ["req_a", "req_b"]
+        assert summaries[1].priority is Priority.HIGH
+        assert summaries[0].agents[0] is summaries[1].agents[0]
+        assert summaries[0].status is summaries[1].status
+        assert "check grounding" in summaries[0].search_text
+        assert not hasattr(summaries[0], "__dict__")
+        assert len(reloaded._models) == 0
+
+        stats = reloaded.memory_stats()
+        assert stats["records"] == 2
+        assert stats["bytes_per_request"] == round((stats["summary_bytes"] + stats["raw_bytes"]) / 2)
+
+    async def test_full_models_built_on_demand(self, storage):
+        """A model is rebuilt from the cached bytes once dropped, and reused while held."""
+        request = make_request(run_links=[RunLink(url="https://example.com/run")])
+        await storage.save_request(request)
+        del request
+
+        loaded = await storage.get_request("req_storage_001")
+        assert await storage.get_request("req_storage_001") is loaded
+        assert loaded.run_links[0].url == "https://example.com/run"
+        assert storage.serialize(loaded) is storage.serialize((await storage.list_summaries())[0])
+
+    async def test_search_matches_fields_not_json(self, storage):
+        """Search matches field values, not the JSON around them."""
+        await storage.save_requests([
+            make_request("req_a", notes="Needs the grounding run"),
+            make_request("req_b"),
+        ])
+
+        assert [s.id for s in await storage.search_requests("GROUNDING")] == ["req_a"]
+        assert await storage.search_requests("notes") == []
+        assert await storage.search_requests('"') == []
+
+
+class TestBulkSave:
+    """Test saving many requests at once."""
+
+    async def test_save_requests_updates_index_once(self, storage):
+        """Bulk saves are listed like individual saves and advance the generation by one per write."""
+        await storage.save_request(make_request("req_a"))
+        generation = storage.generation()
+
+        await storage.save_requests([make_request("req_a", notes="Updated"), make_request("req_b")])
+
+        assert storage._read_index()["request_ids"] == ["req_a", "req_b"]
+        assert storage.generation() == generation + 2
+        assert [r.notes for r in await storage.list_all_requests()] == ["Updated", None]
+
+    async def test_generation_file_stays_fixed_size(self, storage):
+        """The generation is a counter rewritten in place, converted from the older append-only file."""
+        storage.generation_file.write_bytes(b"." * 3)
+        assert storage.generation() == 3
+
+        for i in range(20):
+            await storage.save_request(make_request(f"req_{i}"))
+
+        assert storage.generation() == 23
+        assert storage.generation_file.stat().st_size == 8
+
+
+class TestShardedLayout:
+    """Test the hash-sharded layout and migration from the flat layout."""
+
+    async def test_files_are_sharded(self, storage):
+        """Request files live two hash-prefix levels below requests/."""
+        await storage.save_request(make_request())
+
+        path = storage.layout.path("req_storage_001")
+        assert path.exists()
+        assert path.parent.relative_to(storage.requests_dir).as_posix() == shard_prefix("req_storage_001")
+        assert len(shard_prefix("req_storage_001").split("/")) == 2
+        assert not (storage.requests_dir / "req_storage_001.json").exists()
+
+    async def test_flat_files_are_read_then_migrated(self, storage):
+        """Flat-layout files stay readable until the background migration moves them."""
+        flat = [make_request("req_flat_1"), make_request("req_flat_2", notes="Flat")]
+        for request in flat:
+            (storage.requests_dir / f"{request.id}.json").write_text(request.model_dump_json())
+        await storage._update_index_add("req_flat_1")
+        await storage._update_index_add("req_flat_2")
+
+        assert [r.id for r in await storage.list_all_requests()] == ["req_flat_1", "req_flat_2"]
+
+        # A write moves the file into its shard before replacing it
+        await storage.save_request(flat[0].model_copy(update={"notes": "Sharded"}))
+        assert not (storage.requests_dir / "req_flat_1.json").exists()
+
+        assert await storage.migrate_flat_layout() == 1
+        assert list(storage.layout.legacy_keys()) == []
+        assert [r.notes for r in await storage.list_all_requests()] == ["Sharded", "Flat"]
+
+        assert await storage.delete_request("req_flat_2")
+        assert await storage.get_request("req_flat_2") is None
+
+    def test_stale_flat_copy_never_overwrites_shard(self, storage, tmp_path):
+        """If both layouts hold a file, the sharded one is kept."""
+        sharded = storage.layout.path("req_x")
+        sharded.parent.mkdir(parents=True)
+        sharded.write_text("new")
+        storage.layout.legacy_path("req_x").write_text("old")
+
+        assert not storage.layout.migrate("req_x")
+        assert sharded.read_text() == "new"
+        assert not storage.layout.legacy_path("req_x").exists()
+
+    async def test_sessions_sharded_with_flat_fallback(self, tmp_path):
+        """Sessions are written sharded; flat ones are still served and cleaned up."""
+        sessions = SessionStorage(str(tmp_path / "sessions"))
+        user = User(oid="oid", name="Session Tester", email="s@example.com")
+        now = datetime.now(timezone.utc)
+        live = Session(session_id="live", user=user, created_at=now, expires_at=now + timedelta(hours=1))
+        expired = Session(session_id="old", user=user, created_at=now, expires_at=now - timedelta(hours=1))
+
+        await sessions.store_session("live", live)
+        assert sessions.layout.path("live").exists()
+        sessions.layout.legacy_path("flat").write_text(live.model_dump_json())
+        sessions.layout.legacy_path("old").write_text(expired.model_dump_json())
+
+        assert (await sessions.get_session("flat")).user.name == "Session Tester"
+        assert await sessions.cleanup_expired() == 1
+        await sessions.delete_session("flat")
+        assert await sessions.get_session("flat") is None
+        assert await sessions.get_session("live") is not None
+
+
+class TestArchive:
+    """Test the archive tier for long-completed requests."""
+
+    @staticmethod
+    def completed(request_id, completed_at, **overrides):
+        return make_request(
+            request_id,
+            status="completed",
+            executor="Executor",
+            started_at=completed_at - timedelta(hours=1),
+            completed_at=completed_at,
+            **overrides
+        )
+
+    async def test_archives_old_completed_into_monthly_segments(self, storage):
+        """Old completed requests leave the hot tier but stay readable and searchable."""
+        old_oct = self.completed("req_oct", datetime(2025, 10, 5, tzinfo=timezone.utc), notes="Archived grounding")
+        old_nov = self.completed("req_nov", datetime(2025, 11, 2, tzinfo=timezone.utc))
+        recent = self.completed("req_recent", datetime(2025, 12, 20, tzinfo=timezone.utc))
+        await storage.save_requests([old_oct, old_nov, recent, make_request("req_pending")])
+        generation = storage.generation()
+
+        assert await storage.archive_completed(datetime(2025, 12, 1, tzinfo=timezone.utc)) == 2
+
+        assert storage.generation() == generation + 1
+        assert sorted(p.name for p in storage.archive.archive_dir.glob("*.pack")) == ["2025-10.1.pack", "2025-11.1.pack"]
+        assert not storage.layout.path("req_oct").exists()
+        assert storage.list_request_ids() == ["req_recent", "req_pending"]
+        assert [r.id for r in await storage.list_all_requests()] == ["req_recent", "req_pending"]
+        assert {r.id for r in await storage.list_all_requests(include_archived=True)} == {
+            "req_oct", "req_nov", "req_recent", "req_pending"
+        }
+
+        # Readable by ID (also from a fresh worker) and through search
+        assert await storage.get_request("req_oct") == old_oct
+        other_worker = JSONStorage(data_dir=str(storage.data_dir))
+        assert await other_worker.get_request("req_nov") == old_nov
+        assert [r.id for r in await storage.search_requests("grounding")] == ["req_oct"]
+        assert storage.serialize(await storage.get_request("req_oct")) == old_oct.model_dump_json().encode()
+
+    async def test_saving_archived_request_moves_it_back(self, storage):
+        """Updating an archived request makes it hot again."""
+        request = self.completed("req_old", datetime(2025, 10, 5, tzinfo=timezone.utc))
+        await storage.save_request(request)
+        await storage.archive_completed(datetime(2025, 12, 1, tzinfo=timezone.utc))
+
+        await storage.save_request(request.model_copy(update={"notes": "Reopened"}))
+
+        assert "req_old" not in storage.archive
+        assert list(storage.archive.archive_dir.glob("*.pack")) == []
+        assert (await storage.get_request("req_old")).notes == "Reopened"
+        assert len(await storage.list_all_requests(include_archived=True)) == 1
+
+    async def test_delete_archived_request(self, storage):
+        """Archived requests can be deleted."""
+        await storage.save_requests([
+            self.completed("req_a", datetime(2025, 10, 5, tzinfo=timezone.utc)),
+            self.completed("req_b", datetime(2025, 10, 6, tzinfo=timezone.utc)),
+        ])
+        await storage.archive_completed(datetime(2025, 12, 1, tzinfo=timezone.utc))
+
+        assert await storage.delete_request("req_a")
+        assert await storage.get_request("req_a") is None
+        assert [r.id for r in await storage.list_all_requests(include_archived=True)] == ["req_b"]
+        assert not await storage.delete_request("req_a")
+        # The month was rewritten to a new file and the old one removed
+        assert [p.name for p in storage.archive.archive_dir.glob("*.pack")] == ["2025-10.2.pack"]
+
+    async def test_naive_completion_times_are_taken_as_utc(self, storage):
+        """Records stored without a timezone compare against an aware cutoff."""
+        await storage.save_requests([
+            self.completed("req_naive", datetime(2025, 10, 5)),
+            self.completed("req_recent", datetime(2025, 12, 20)),
+        ])
+
+        assert await storage.archive_completed(datetime(2025, 12, 1, tzinfo=timezone.utc)) == 1
+        assert "req_naive" in storage.archive
+
+    async def test_unreadable_records_are_skipped(self, storage, monkeypatch):
+        """Records that can't be read stay hot, and archiving nothing writes nothing."""
+        cutoff = datetime(2025, 12, 1, tzinfo=timezone.utc)
+        await storage.save_requests([
+            self.completed("req_a", datetime(2025, 10, 5, tzinfo=timezone.utc)),
+            self.completed("req_b", datetime(2025, 10, 6, tzinfo=timezone.utc)),
+        ])
+        raw = storage._raw
+        monkeypatch.setattr(storage, "_raw", lambda rid, record: None if rid == "req_a" else raw(rid, record))
+
+        assert await storage.archive_completed(cutoff) == 1
+        assert storage.layout.path("req_a").exists()
+        assert "req_b" in storage.archive
+
+        generation = storage.generation()
+        assert await storage.archive_completed(cutoff) == 0
+        assert storage.generation() == generation
+
+    async def test_lock_excludes_other_workers_and_leaves_no_file(self, storage):
+        """The archive lock is a directory lock: exclusive across workers, nothing left behind."""
+        other_worker = JSONStorage(data_dir=str(storage.data_dir))
+        async with storage.archive.lock():
+            with pytest.raises(TimeoutError):
+                async with other_worker.archive.lock(timeout=0.1):
+                    pass
+        async with other_worker.archive.lock(timeout=0.1):
+            pass
+        assert list(storage.archive.archive_dir.iterdir()) == []
+
+    async def test_export_streams_archived_records_as_stored(self, storage):
+        """Exports pass archived records through as views of the mapped segment."""
+        archived = self.completed("req_old", datetime(2025, 10, 5, tzinfo=timezone.utc))
+        await storage.save_requests([archived, make_request("req_hot")])
+        await storage.archive_completed(datetime(2025, 12, 1, tzinfo=timezone.utc))
+
+        hot_payload, archived_payload = await storage.export_payloads()
+
+        assert json.loads(hot_payload)["id"] == "req_hot"
+        assert isinstance(archived_payload, memoryview)
+        assert bytes(archived_payload) == archived.model_dump_json().encode()
+
+
+class TestTrustedFastLoad:
+    """Test schema-version stamping and the validation-free load path."""
+
+    async def test_saved_records_are_stamped(self, storage):
+        """Records written by storage carry the current schema version."""
+        await storage.save_request(make_request())
+
+        data = json.loads(storage.layout.path("req_storage_001").read_text())
+        assert data["schema_version"] == STORAGE_SCHEMA_VERSION
+
+    async def test_trusted_load_matches_validated_load(self, storage):
+        """The fast path yields the same model as full validation."""
+        request = make_request(
+            status="in_progress",
+            executor="Executor",
+            started_at=datetime(2025, 11, 21, 11, 0, tzinfo=timezone.utc),
+            run_links=[RunLink(url="https://example.com/run", notes="Baseline")],
+            update_history=[UpdateEntry(notes="Rerun", updated_by="Executor", links_added=1)],
+            priority=Priority.HIGH,
+        )
+        await storage.save_request(request)
+
+        content = storage.layout.path(request.id).read_text()
+        trusted = JSONStorage._load_record(content)
+        assert trusted == Request(**json.loads(content))
+        assert trusted.priority is Priority.HIGH
+        assert trusted.run_links[0].added_at.tzinfo is not None
+
+    async def test_trusted_load_skips_field_validators(self, storage):
+        """Stamped records are not re-checked by the Python field validators."""
+        await storage.save_request(make_request(run_links=[RunLink(url="https://example.com/run")]))
+
+        file_path = storage.layout.path("req_storage_001")
+        file_path.write_text(file_path.read_text().replace("https://example.com/run", "legacy-run"))
+
+        loaded = await storage.get_request("req_storage_001")
+        assert loaded.run_links[0].url == "legacy-run"
+
+    async def test_unstamped_records_are_validated(self, storage):
+        """Legacy records without a stamp still run the model validators."""
+        legacy = make_request().model_dump(mode="json")
+        legacy["run_links"] = [{"url": "not-a-url", "added_at": "2025-11-21T10:00:00Z"}]
+        (storage.requests_dir / "req_storage_001.json").write_text(json.dumps(legacy))
+
+        assert await storage.get_request("req_storage_001") is None
+
+
+class TestBackupStore:
+    """Test content-addressed backups and retention."""
+
+    async def test_unchanged_content_is_not_backed_up_again(self, storage):
+        """Saving identical content records a single version."""
+        request = make_request()
+        await storage.save_request(request)
+        await storage.save_request(request.model_copy())
+
+        versions = storage.backups.list_versions(request.id)
+        assert len(versions) == 1
+
+    async def test_versions_share_deduplicated_blobs(self, storage):
+        """Each distinct content is stored once and can be read back."""
+        request = make_request()
+        await storage.save_request(request)
+        await storage.save_request(request.model_copy(update={"notes": "Edited"}))
+        await storage.save_request(request)
+
+        versions = storage.backups.list_versions(request.id)
+        assert len(versions) == 3
+        assert versions[0]["hash"] == versions[2]["hash"]
+        assert len(list(storage.backups.blobs_dir.glob("*/*.json.gz"))) == 2
+
+        restored = json.loads(storage.backups.read_version(versions[1]["hash"]))
+        assert restored["notes"] == "Edited"
+
+    async def test_legacy_file_is_seeded_before_first_save(self, storage):
+        """Records written before the backup store keep their pre-update content."""
+        legacy = make_request(notes="Original")
+        (storage.requests_dir / f"{legacy.id}.json").write_text(legacy.model_dump_json())
+
+        await storage.save_request(legacy.model_copy(update={"notes": "Updated"}))
+
+        versions = storage.backups.list_versions(legacy.id)
+        contents = [json.loads(storage.backups.read_version(v["hash"]))["notes"] for v in versions]
+        assert contents == ["Original", "Updated"]
+
+    async def test_reused_blob_is_refreshed(self, storage):
+        """Recording a version that reuses an old blob keeps it out of orphan pruning."""
+        store = storage.backups
+        store.backup("req_storage_001", b'{"notes":"A"}')
+        store.backup("req_storage_001", b'{"notes":"B"}')
+        blob = store._blob_path(store.content_hash(b'{"notes":"A"}'))
+        os.utime(blob, (0, 0))
+
+        store.backup("req_storage_001", b'{"notes":"A"}')
+
+        assert blob.stat().st_mtime > 0
+        assert len(store.list_versions("req_storage_001")) == 3
+        assert not list(store.manifests_dir.glob("*.tmp"))
+
+    async def test_prune_enforces_retention(self, storage):
+        """Old versions expire but the latest version of a live request is kept."""
+        request = make_request()
+        await storage.save_request(request)
+        await storage.save_request(request.model_copy(update={"notes": "Edited"}))
+        deleted = make_request("req_storage_002")
+        await storage.save_request(deleted)
+        await storage.delete_request(deleted.id)
+
+        future = datetime.now(timezone.utc) + timedelta(days=storage.backups.retention_days + 1)
+        with patch("app.storage.backup_store.ORPHAN_GRACE_SECONDS", -1):
+            storage.backups.prune(now=future)
+
+        versions = storage.backups.list_versions(request.id)
+        assert len(versions) == 1
+        assert json.loads(storage.backups.read_version(versions[0]["hash"]))["notes"] == "Edited"
+        assert storage.backups.list_versions(deleted.id) == []
+        assert len(list(storage.backups.blobs_dir.glob("*/*.json.gz"))) == 1
@@ -0,0 +1,57 @@
+"""Tests for startup warm-up."""
+import pytest
+
+from app.config import settings
+from app.services.request_service import RequestService
+from app.services.warmup_service import WARMUP_PHASES, WarmupService
+from tests.test_storage import make_request
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+    return RequestService()
+
+
+async def test_warm_up_fills_caches_and_becomes_ready(service, monkeypatch):
+    """All phases run; records, bytes and indexes are cached afterwards."""
+    await service.storage.save_requests([make_request("req_a"), make_request("req_b")])
+
+    # A fresh service on the same data dir, as after a restart
+    cold = RequestService()
+    warmup = WarmupService()
+    assert not warmup.ready
+    live_models = []
+    serialize_requests = cold.serialize_requests
+
+    def counting_serialize(requests):
+        live_models.append(cold.storage.memory_stats()["live_models"])
+        return serialize_requests(requests)
+
+    monkeypatch.setattr(cold, "serialize_requests", counting_serialize)
+
+    await warmup.run(cold)
+
+    status = warmup.status()
+    assert status["status"] == "ready"
+    assert status["phases"] == {phase: "done" for phase in WARMUP_PHASES}
+    assert status["records"] == {"loaded": 2, "total": 2}
+    # JSON is cached in the worker or served from the shared snapshot
+    assert all(cold.storage._raw(request_id, record) is not None for request_id, record in cold.storage._records.items())
+    # Summaries and bytes are warmed without holding full models
+    assert live_models == [0]
+    assert len(cold.pending) == 2
+
+
+async def test_failed_warm_up_still_ends_ready(service, monkeypatch):
+    """A failing phase is reported, but traffic is not held forever."""
+    async def broken():
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(service.analytics, "warm_up", broken)
+    warmup = WarmupService()
+    await warmup.run(service)
+
+    assert warmup.ready
+    assert warmup.phases["analytics"] == "failed"
+    assert "disk on fire" in warmup.status()["error"]
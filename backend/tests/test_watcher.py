@@ -0,0 +1,92 @@
+"""Tests for filesystem-event cache invalidation."""
+import asyncio
+
+import pytest
+
+from app.storage.json_storage import JSONStorage
+from tests.test_storage import make_request
+
+pytest.importorskip("watchfiles")
+
+
+async def wait_for(condition, timeout: float = 5.0) -> None:
+    """Poll a condition until it holds or the timeout passes."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+@pytest.fixture
+async def watched(tmp_path, request):
+    """A worker's storage with its watcher running, and a second worker writing to the same data dir."""
+    storage = JSONStorage(data_dir=str(tmp_path))
+    other = JSONStorage(data_dir=str(tmp_path))
+    await other.save_requests([make_request("req_a"), make_request("req_b")])
+    await storage.list_summaries()
+
+    task = asyncio.create_task(storage.run_watcher(request.param, poll_delay_ms=50))
+    await wait_for(lambda: storage.watched)
+    yield storage, other
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    assert not storage.watched
+
+
+def no_io(*args, **kwargs):
+    raise AssertionError("storage touched the filesystem")
+
+
+@pytest.mark.parametrize("watched", ["events", "polling"], indirect=True)
+class TestStorageWatcher:
+    """Test that watched storage serves from memory and still sees other workers' writes."""
+
+    async def test_steady_state_reads_skip_the_filesystem(self, watched, monkeypatch):
+        storage, _ = watched
+        generation = storage.generation()
+        await storage.list_summaries()
+        monkeypatch.setattr(storage, "_locate", no_io)
+        monkeypatch.setattr(storage, "_read_generation", no_io)
+        monkeypatch.setattr(storage, "_read_index", no_io)
+
+        assert storage.generation() == generation
+        assert (await storage.get_request("req_a")).id == "req_a"
+        assert sorted(summary.id for summary in await storage.list_summaries()) == ["req_a", "req_b"]
+
+    async def test_other_workers_writes_are_picked_up(self, watched):
+        storage, other = watched
+        generation = storage.generation()
+        await other.save_request(make_request("req_a", purpose="Ad-hoc"))
+        await other.save_request(make_request("req_c"))
+        assert await other.delete_request("req_b")
+
+        await wait_for(lambda: storage.generation() == generation + 3)
+        assert (await storage.get_request("req_a")).purpose == "Ad-hoc"
+        assert await storage.get_request("req_b") is None
+        assert sorted(summary.id for summary in await storage.list_summaries()) == ["req_a", "req_c"]
+
+    async def test_own_writes_are_visible_immediately(self, watched):
+        storage, _ = watched
+        generation = storage.generation()
+        await storage.save_request(make_request("req_a", purpose="Ad-hoc"))
+
+        assert storage.generation() == generation + 1
+        assert (await storage.get_request("req_a")).purpose == "Ad-hoc"
+
+
+async def test_concurrent_commit_revalidates_records(tmp_path):
+    """A commit that finds others' bumps doesn't trust records their events haven't reached yet."""
+    storage = JSONStorage(data_dir=str(tmp_path))
+    other = JSONStorage(data_dir=str(tmp_path))
+    await storage.save_requests([make_request("req_a"), make_request("req_b")])
+    await storage.list_summaries()
+    storage.set_watched(True)
+    await storage.list_summaries()
+
+    # No watcher running, so no events arrive
+    await other.save_request(make_request("req_a", purpose="Ad-hoc"))
+    assert (await storage.get_request("req_a")).purpose == "Flight review"
+    await storage.save_request(make_request("req_b", purpose="RAI check"))
+
+    assert storage.generation() == other.generation()
+    assert (await storage.get_request("req_a")).purpose == "Ad-hoc"